@@ -0,0 +1,316 @@
+"""Offline benchmarks of the fetch-transform-publish path.
+
+Runs without network access: search_articles and paging through all the results
+with iter_articles are timed against a local stub HTTP server serving synthetic
+pages, put_records against moto, and the consumer Lambda on synthetic Kinesis
+events built from the writer's own records, plain and KPL-aggregated. Each benchmark
+reports latency percentiles and throughput, and the results can be saved as JSON
+and compared with a previous run, e.g. of another commit:
+
+    python benchmarks/bench_hot_path.py --page-size 200 --pages 5 --output before.json
+    python benchmarks/bench_hot_path.py --page-size 200 --pages 5 --compare before.json
+
+Requires the dev dependencies (moto).
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from newslaunch.guardian_api import GuardianAPI
+from newslaunch.kpl import aggregate_records
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+SAMPLE_FILE = os.path.join(ROOT, "tests", "test_data", "full_guardian_response.json")
+CONSUMER_PATH = os.path.join(ROOT, "newspad", "lambda", "consumer.py")
+STREAM_NAME = "bench-stream"
+
+
+def make_page(page_size: int) -> list[dict]:
+    """Return a synthetic page of full articles, cycling through the sample response."""
+    with open(SAMPLE_FILE) as f:
+        sample = json.load(f)["response"]["results"]
+    page = []
+    for i in range(page_size):
+        article = dict(sample[i % len(sample)])
+        article["id"] = f"{article['id']}-{i}"
+        page.append(article)
+    return page
+
+
+class StubGuardianServer:
+    """Local HTTP server answering /search requests with `pages` pages of results.
+
+    Every page holds the same articles; the requested page number is read from
+    the query string, so paging through the results is exercised.
+    """
+
+    def __init__(self, page: list[dict], pages: int = 1):
+        bodies = {
+            number: json.dumps(
+                {
+                    "response": {
+                        "status": "ok",
+                        "total": len(page) * pages,
+                        "pages": pages,
+                        "currentPage": number,
+                        "results": page,
+                    }
+                }
+            ).encode("utf-8")
+            for number in range(1, pages + 1)
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                query = parse_qs(urlparse(self.path).query)
+                body = bodies.get(int(query.get("page", ["1"])[0]))
+                if body is None:
+                    self.send_error(400)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> StubGuardianServer:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def load_consumer():
+    # The consumer Lambda is a standalone module, not part of the package.
+    spec = importlib.util.spec_from_file_location("consumer", CONSUMER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def kinesis_event(records: list[dict]) -> dict:
+    """Return a Kinesis event as received by the consumer Lambda."""
+    return {
+        "Records": [
+            {
+                "kinesis": {
+                    "sequenceNumber": str(i),
+                    "partitionKey": record["PartitionKey"],
+                    "data": base64.b64encode(record["Data"]).decode("ascii"),
+                }
+            }
+            for i, record in enumerate(records)
+        ]
+    }
+
+
+def measure(func: Callable[[], object], items: int, repeat: int, warmup: int) -> dict:
+    """Time func `repeat` times and return its latency percentiles and throughput."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+
+    def percentile(p: float) -> float:
+        return timings[min(len(timings) - 1, round(p / 100 * (len(timings) - 1)))]
+
+    median = statistics.median(timings)
+    return {
+        "items": items,
+        "repeat": repeat,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "p50_ms": median * 1000,
+        "p90_ms": percentile(90) * 1000,
+        "p99_ms": percentile(99) * 1000,
+        "max_ms": timings[-1] * 1000,
+        "items_per_second": items / median if median > 0 else 0.0,
+    }
+
+
+def run_benchmarks(
+    page_size: int, pages: int, repeat: int, warmup: int, only: set[str]
+) -> dict:
+    # moto is imported here so that --help works without the dev dependencies.
+    import boto3
+    from moto import mock_aws
+
+    from newslaunch.kinesis_writer import KinesisWriter
+
+    page = make_page(page_size)
+    results = {}
+
+    def bench(name: str, func: Callable[[], object], items: int = page_size) -> None:
+        if only and name not in only:
+            return
+        results[name] = measure(func, items, repeat, warmup)
+        result = results[name]
+        print(
+            f"{name:>24}: p50 {result['p50_ms']:8.3f} ms  p90 {result['p90_ms']:8.3f} ms  "
+            f"p99 {result['p99_ms']:8.3f} ms  {result['items_per_second']:>12,.0f} items/s"
+        )
+
+    with StubGuardianServer(page, pages) as server, GuardianAPI(api_key="bench") as api:
+        api.API_URL = server.url
+        bench(
+            "search_articles",
+            lambda: api.search_articles("bench", page_size=page_size),
+        )
+        bench(
+            "search_articles_full",
+            lambda: api.search_articles(
+                "bench", page_size=page_size, filter_response=False
+            ),
+        )
+        bench(
+            "iter_articles_all_pages",
+            lambda: sum(1 for _ in api.iter_articles("bench", page_size=page_size)),
+            items=page_size * pages,
+        )
+
+    # The preview extraction applied to each page when filter_response=True.
+    bench("process_results", lambda: api._process_results(page, True))
+
+    previews = api._process_results(page, True)
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-2")
+    with mock_aws():
+        boto3.client("kinesis").create_stream(StreamName=STREAM_NAME, ShardCount=4)
+        writer = KinesisWriter(STREAM_NAME)
+        bench("build_records", lambda: writer._build_records(previews, None))
+        bench(
+            "put_records",
+            lambda: writer.send_to_stream(previews, record_per_entry=True),
+        )
+
+        # Records are aggregated per shard in put_records, as KinesisWriter does
+        # with aggregate=True.
+        aggregating_writer = KinesisWriter(STREAM_NAME, aggregate=True)
+
+        def build_aggregated_records() -> list[dict]:
+            return aggregate_records(
+                aggregating_writer._build_records(previews, None),
+                aggregating_writer.aggregate_max_size,
+                aggregating_writer._shard_of,
+            )
+
+        bench("build_records_aggregated", build_aggregated_records)
+        bench(
+            "put_records_aggregated",
+            lambda: aggregating_writer.send_to_stream(previews, record_per_entry=True),
+        )
+        aggregated_records = build_aggregated_records()
+
+    consumer = load_consumer()
+    consumer.log.disabled = True
+    plain_event = kinesis_event(writer._build_records(previews, None))
+    aggregated_event = kinesis_event(aggregated_records)
+    bench("consumer", lambda: consumer.lambda_handler(plain_event, None))
+    bench(
+        "consumer_aggregated",
+        lambda: consumer.lambda_handler(aggregated_event, None),
+    )
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the change of the median latency of each benchmark against a baseline."""
+    print(f"\nchange of p50 against {baseline['meta'].get('commit') or 'baseline'}:")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1
+        print(
+            f"{name:>24}: {before['p50_ms']:8.3f} -> {result['p50_ms']:8.3f} ms ({change:+.1%})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument(
+        "--pages", type=int, default=5, help="Number of result pages served."
+    )
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        help="Run only the named benchmark (repeatable).",
+    )
+    parser.add_argument("--output", help="Save the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with the results of this JSON file.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.page_size, args.pages, args.repeat, args.warmup, set(args.only)
+    )
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "page_size": args.page_size,
+            "pages": args.pages,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nresults saved to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Cold import time of the newslaunch package and CLI.
+
+Each module is imported in a fresh interpreter, so nothing is cached between
+runs. With --budget, exits with an error if the best time of a module exceeds
+the budget (in seconds), e.g. to catch an eager import of boto3 in the CLI:
+
+    python benchmarks/bench_import_time.py --repeat 5 --budget 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+MODULES = ["newslaunch", "newslaunch.cli"]
+
+CODE = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def import_time(module: str) -> float:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", CODE.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=None)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        timings = sorted(import_time(module) for _ in range(args.repeat))
+        best, median = timings[0], timings[len(timings) // 2]
+        print(
+            f"{module:>24}: best {best * 1000:8.1f} ms  median {median * 1000:8.1f} ms"
+        )
+        if args.budget is not None and best > args.budget:
+            over_budget.append(module)
+
+    if over_budget:
+        sys.exit(f"Over the {args.budget}s import budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
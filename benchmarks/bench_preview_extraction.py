@@ -0,0 +1,61 @@
+"""Micro-benchmark of the preview extraction used when filter_response=True.
+
+Compares building one GuardianArticlePreview model per article and dumping it
+against the plain-dict extraction path, on a synthetic page of full articles.
+
+    python benchmarks/bench_preview_extraction.py --page-size 200 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import timeit
+
+from newslaunch.guardian_api import GuardianArticlePreview, _extract_preview
+
+SAMPLE_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "test_data", "full_guardian_response.json"
+)
+
+
+def make_page(page_size: int) -> list[dict]:
+    with open(SAMPLE_FILE) as f:
+        sample = json.load(f)["response"]["results"]
+    return [sample[i % len(sample)] for i in range(page_size)]
+
+
+def model_path(articles: list[dict]) -> list[dict]:
+    return [
+        GuardianArticlePreview(**article).model_dump(by_alias=True)
+        for article in articles
+    ]
+
+
+def extract_path(articles: list[dict]) -> list[dict]:
+    return [_extract_preview(article) for article in articles]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    page = make_page(args.page_size)
+    assert model_path(page) == extract_path(page)
+
+    results = {}
+    for name, func in (("model", model_path), ("extract", extract_path)):
+        best = min(timeit.repeat(lambda f=func: f(page), number=1, repeat=args.repeat))
+        results[name] = best
+        print(
+            f"{name:>8}: {best * 1000:8.3f} ms/page "
+            f"({args.page_size / best:,.0f} articles/s)"
+        )
+    print(f" speedup: {results['model'] / results['extract']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,40 @@
-from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
-from newslaunch.kinesis_writer import KinesisWriter, KinesisWriterError
+from __future__ import annotations
 
-__all__ = ["GuardianAPI", "KinesisWriter", "GuardianAPIError", "KinesisWriterError"]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from newslaunch.async_guardian_api import AsyncGuardianAPI
+    from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+    from newslaunch.kinesis_writer import KinesisWriter, KinesisWriterError
+
+__all__ = [
+    "AsyncGuardianAPI",
+    "GuardianAPI",
+    "KinesisWriter",
+    "GuardianAPIError",
+    "KinesisWriterError",
+]
+
+# The public classes are imported on first access, so `import newslaunch` does not
+# pull in aiohttp, requests, pydantic or boto3 until the class needing them is used.
+_LAZY_ATTRIBUTES = {
+    "AsyncGuardianAPI": "newslaunch.async_guardian_api",
+    "GuardianAPI": "newslaunch.guardian_api",
+    "GuardianAPIError": "newslaunch.guardian_api",
+    "KinesisWriter": "newslaunch.kinesis_writer",
+    "KinesisWriterError": "newslaunch.kinesis_writer",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from collections.abc import AsyncIterator
+
+from newslaunch.guardian_api import GuardianAPIError, _BaseGuardianAPI
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncGuardianAPI(_BaseGuardianAPI):
+    """Asyncio wrapper class for interacting with Guardian API.
+
+    Mirrors GuardianAPI with `async` methods. Requests share a keep-alive aiohttp
+    session and are bounded by a semaphore, so at most `max_concurrency` requests are
+    in flight across all calls made on the instance. Connection errors and 429/5xx
+    responses are retried with jittered exponential backoff. Call close() or use the
+    instance as an async context manager to release the session.
+
+    Requires the optional `aiohttp` dependency (`pip install newslaunch[async]`).
+
+    Args:
+        api_key (str, optional): API access key. Reads from env if not provided.
+        request_timeout (int, optional): HTTP request timeout. Defaults to 20s.
+        max_concurrency (int, optional): Maximum number of concurrent requests. Defaults to 10.
+        max_retries (int, optional): Maximum number of retries per request. Defaults to 3.
+        backoff_factor (float, optional): Base of the exponential backoff between retries in seconds. Defaults to 0.5.
+
+    Raises:
+        GuardianAPIError:
+            If GUARDIAN_API_KEY is not provided.
+            If aiohttp is not installed.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        request_timeout: int = 20,
+        max_concurrency: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+    ):
+        if aiohttp is None:
+            raise GuardianAPIError(
+                "AsyncGuardianAPI requires aiohttp. Install it with 'pip install newslaunch[async]'."
+            )
+        super().__init__(api_key, request_timeout)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> AsyncGuardianAPI:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def search_articles(
+        self,
+        search_term: str,
+        page_size: int | None = 10,
+        from_date: str | None = None,
+        filter_response: bool | None = True,
+        order_by: str | None = None,
+        show_fields: str | list[str] | None = None,
+    ) -> list[dict] | None:
+        """Search for Guardian articles.
+
+        Args:
+            search_term (str): The search query for articles.
+            page_size (int, optional): The number of items displayed per page (up to 200). Defaults to 10.
+            from_date (str, optional): The earliest publication date (YYYY-MM-DD format). Defaults to None.
+            filter_response (bool, optional): Returns a filtered response if True, else returns the full response. Defaults to True.
+            order_by (str, optional): The order to sort the articles by. Must be one of 'newest', 'oldest', 'relevance'. Defaults to 'relevance'.
+            show_fields (str | list[str], optional): The article fields to request, e.g. ['headline', 'wordcount'] or 'all'. Defaults to only 'bodyText' (always included) if filter_response is True, else 'all'.
+
+        Returns:
+            (list[dict] | None): A list of articles if found, None otherwise.
+
+        Raises:
+            GuardianAPIError:
+                If any of the search parameters are invalid.
+                If an error occurs while fetching articles from the Guardian API.
+        """
+        req_params = self._build_request_params(
+            search_term, page_size, from_date, order_by, filter_response, show_fields
+        )
+        data = await self._fetch_page(req_params)
+        results = data.get("results")
+
+        if not results:
+            return None
+
+        return self._process_results(results, filter_response)
+
+    async def iter_articles(
+        self,
+        search_term: str,
+        page_size: int | None = 10,
+        from_date: str | None = None,
+        filter_response: bool | None = True,
+        order_by: str | None = None,
+        show_fields: str | list[str] | None = None,
+        max_results: int | None = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[dict]:
+        """Lazily iterate over all Guardian articles matching the search, page by page.
+
+        With a concurrency above 1, the pages after the first are prefetched as
+        tasks, with at most `concurrency` pages in flight (further bounded by the
+        instance-wide max_concurrency).
+
+        Args:
+            search_term (str): The search query for articles.
+            page_size (int, optional): The number of items requested per page (up to 200). Defaults to 10.
+            from_date (str, optional): The earliest publication date (YYYY-MM-DD format). Defaults to None.
+            filter_response (bool, optional): Yields filtered articles if True, else yields the full articles. Defaults to True.
+            order_by (str, optional): The order to sort the articles by. Must be one of 'newest', 'oldest', 'relevance'. Defaults to 'relevance'.
+            show_fields (str | list[str], optional): The article fields to request, e.g. ['headline', 'wordcount'] or 'all'. Defaults to only 'bodyText' (always included) if filter_response is True, else 'all'.
+            max_results (int, optional): The maximum number of articles to yield. Defaults to None (all pages).
+            concurrency (int, optional): The maximum number of pages fetched in parallel. Defaults to 1.
+            ordered (bool, optional): Yields pages in page order if True, else in the order they complete. Defaults to True.
+
+        Yields:
+            (dict): A single article.
+
+        Raises:
+            GuardianAPIError:
+                If any of the search or paging parameters are invalid.
+                If an error occurs while fetching articles from the Guardian API.
+        """
+        self._validate_paging_params(max_results, concurrency)
+        req_params = self._build_request_params(
+            search_term, page_size, from_date, order_by, filter_response, show_fields
+        )
+
+        yielded = 0
+        async for results in self._iter_pages(
+            req_params, max_results, concurrency, ordered
+        ):
+            for article in self._process_results(results, filter_response):
+                yield article
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+
+    async def _iter_pages(
+        self,
+        req_params: dict,
+        max_results: int | None,
+        concurrency: int,
+        ordered: bool,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield the results of each page, prefetching pages 2..n concurrently if
+        concurrency > 1."""
+        data = await self._fetch_page(req_params)
+        results = data.get("results")
+        if not results:
+            return
+        yield results
+
+        pages = iter(range(2, self._last_page(data, max_results) + 1))
+        pending: deque[asyncio.Future] = deque()
+
+        def submit_next() -> None:
+            page = next(pages, None)
+            if page is not None:
+                pending.append(
+                    asyncio.ensure_future(self._fetch_page(req_params, page))
+                )
+
+        try:
+            for _ in range(concurrency):
+                submit_next()
+
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    done = [future for future in pending if future in finished]
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    results = (await future).get("results")
+                    submit_next()
+                    if results:
+                        yield results
+        finally:
+            for future in pending:
+                future.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _fetch_page(self, req_params: dict, page: int | None = None) -> dict:
+        """Fetch a single page of search results, retrying transient failures.
+
+        Args:
+            req_params (dict): The /search query parameters.
+            page (int, optional): The page number to request. Defaults to the first page.
+
+        Returns:
+            (dict): The "response" object of the API response.
+
+        Raises:
+            GuardianAPIError: If an error occurs while fetching articles from the Guardian API.
+        """
+        params = {k: v for k, v in req_params.items() if v is not None}
+        if page is not None and page > 1:
+            params["page"] = page
+
+        session = self._get_session()
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore, session.get(
+                    f"{self.API_URL}/search", params=params
+                ) as response:
+                    if (
+                        response.status in self.RETRY_STATUS_CODES
+                        and attempt < self.max_retries
+                    ):
+                        retry_after = response.headers.get("Retry-After")
+                    else:
+                        response.raise_for_status()
+                        data = await response.json()
+                        return data.get("response", {})
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:  # noqa: UP041
+                if isinstance(e, aiohttp.ClientResponseError) or (
+                    attempt >= self.max_retries
+                ):
+                    raise GuardianAPIError(f"Error fetching Guardian articles: {e}")
+                retry_after = None
+
+            attempt += 1
+            await asyncio.sleep(self._backoff_time(attempt, retry_after))
+
+    def _backoff_time(self, attempt: int, retry_after: str | None) -> float:
+        """Return the jittered exponential backoff, honouring Retry-After if set."""
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        backoff = self.backoff_factor * (2 ** (attempt - 1))
+        return backoff / 2 + random.uniform(0, backoff / 2)  # noqa: S311
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session and semaphore on first use, inside the running loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
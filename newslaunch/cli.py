@@ -5,9 +5,14 @@ from pathlib import Path
 
 import click
 
-from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+from newslaunch.serializers import get_serializer
+
+# The API clients (and requests, pydantic and boto3 with them) are imported by the
+# commands that use them, so `--version`, `set-key` and `--help` start quickly.
 
 CONFIG_FILE = Path(click.get_app_dir("newslaunch")) / "newslaunch.json"
+CACHE_FILE = Path(click.get_app_dir("newslaunch")) / "cache.sqlite"
+SYNC_STATE_FILE = Path(click.get_app_dir("newslaunch")) / "sync_state.json"
 
 
 def save_api_key(source: str, api_key: str) -> None:
@@ -25,6 +30,21 @@ def save_api_key(source: str, api_key: str) -> None:
         json.dump(config, file)
 
 
+def format_articles(articles: list[dict], output_format: str) -> str:
+    """Return the articles as an indented ("pretty") or single-line ("compact") JSON
+    document, or as one JSON line per article ("ndjson")."""
+    if output_format == "ndjson":
+        return "\n".join(format_article_line(article) for article in articles)
+    if output_format == "compact":
+        return get_serializer("auto").dumps(articles).decode("utf-8")
+    return json.dumps(articles, indent=4, ensure_ascii=False)
+
+
+def format_article_line(article: dict) -> str:
+    """Return the article as a single JSON line."""
+    return get_serializer("auto").dumps(article).decode("utf-8")
+
+
 def load_api_key(source: str) -> str | None:
     """Load the API key from the config file."""
     if CONFIG_FILE.exists():
@@ -80,15 +100,59 @@ def set_key(guardian: str) -> None:
     "--full-response",
     is_flag=True,
     default=True,
+    flag_value=False,
     type=bool,
     help="Returns a full API response if set, else returns only a subset of fields (webPublicationDate, webTitle, webUrl, contentPreview).",
 )
+@click.option(
+    "--fields",
+    default=None,
+    type=str,
+    help="Comma-separated article fields to request with the full response, e.g. 'headline,wordcount'. Defaults to all fields.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    help="Cache API responses on disk and reuse them for repeated queries.",
+)
+@click.option(
+    "--cache-ttl",
+    default=3600,
+    type=int,
+    help="How long cached responses stay valid, in seconds. Defaults to 3600.",
+)
+@click.option(
+    "--all-pages",
+    is_flag=True,
+    default=False,
+    help="Fetch all result pages instead of only the first one.",
+)
+@click.option(
+    "-m",
+    "--max-results",
+    default=None,
+    type=int,
+    help="The maximum number of articles to fetch, across pages.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="pretty",
+    type=click.Choice(["pretty", "compact", "ndjson"]),
+    help="Output indented JSON ('pretty'), single-line JSON ('compact', faster for large outputs) or one JSON line per article ('ndjson', streamed as pages arrive). Defaults to 'pretty'.",
+)
 def guardian(
     search_term: str,
     from_date: str | None,
     page_size: int,
     order_by: str | None,
     full_response: bool,
+    fields: str | None,
+    cache: bool,
+    cache_ttl: int,
+    all_pages: bool,
+    max_results: int | None,
+    output_format: str,
 ) -> None:
     """Search and fetch articles from the Guardian API."""
     api_key = load_api_key("guardian")
@@ -97,18 +161,307 @@ def guardian(
             "Guardian API key not found. Please add it using 'newslaunch set-key --guardian <API_KEY>'."
         )
 
+    from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+    from newslaunch.response_cache import ResponseCache
+
+    response_cache = ResponseCache(CACHE_FILE, ttl=cache_ttl) if cache else None
     try:
+        guardian_api = GuardianAPI(api_key=api_key, cache=response_cache)
+        search_params = {
+            "from_date": from_date,
+            "page_size": page_size,
+            "order_by": order_by,
+            "filter_response": full_response,
+            "show_fields": fields,
+        }
+        if all_pages or max_results is not None:
+            # Pages are fetched lazily, as the articles are output.
+            articles = guardian_api.iter_articles(
+                search_term, max_results=max_results, **search_params
+            )
+        else:
+            articles = guardian_api.search_articles(search_term, **search_params) or []
+
+        found = False
+        if output_format == "ndjson":
+            for article in articles:
+                click.echo(format_article_line(article))
+                found = True
+        else:
+            articles = list(articles)
+            if articles:
+                click.echo(format_articles(articles, output_format))
+                found = True
+        if not found:
+            # Status messages go to stderr, so ndjson output stays valid JSON lines.
+            click.secho("No articles found.", fg="red", err=output_format == "ndjson")
+    except GuardianAPIError as ge:
+        raise click.ClickException(f"{ge}")
+    finally:
+        if response_cache is not None:
+            response_cache.close()
+
+
+@cli.command()
+@click.argument("search_term", required=True, type=str)
+@click.option(
+    "-s",
+    "--state-file",
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="The file storing the per-query watermarks. Defaults to the newslaunch app directory.",
+)
+@click.option(
+    "-fd",
+    "--from-date",
+    default=None,
+    type=str,
+    help="The earliest publication date (YYYY-MM-DD format) for the first sync of a query.",
+)
+@click.option(
+    "-ps",
+    "--page-size",
+    default=200,
+    type=int,
+    help="The number of items requested per page (1-200).",
+)
+@click.option(
+    "-m",
+    "--max-results",
+    default=None,
+    type=int,
+    help="Stop after this many new articles, and the rest published at the same time.",
+)
+@click.option(
+    "-f",
+    "--full-response",
+    is_flag=True,
+    default=True,
+    flag_value=False,
+    type=bool,
+    help="Returns a full API response if set, else returns only a subset of fields (webPublicationDate, webTitle, webUrl, contentPreview).",
+)
+@click.option(
+    "--fields",
+    default=None,
+    type=str,
+    help="Comma-separated article fields to request with the full response, e.g. 'headline,wordcount'. Defaults to all fields.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="pretty",
+    type=click.Choice(["pretty", "compact", "ndjson"]),
+    help="Output indented JSON ('pretty'), single-line JSON ('compact', faster for large outputs) or one JSON line per article ('ndjson'). The articles are printed once all pages have been fetched. Defaults to 'pretty'.",
+)
+def sync(
+    search_term: str,
+    state_file: Path | None,
+    from_date: str | None,
+    page_size: int,
+    max_results: int | None,
+    full_response: bool,
+    fields: str | None,
+    output_format: str,
+) -> None:
+    """Fetch only the Guardian articles published since the last sync of a query."""
+    api_key = load_api_key("guardian")
+    if not api_key:
+        raise click.ClickException(
+            "Guardian API key not found. Please add it using 'newslaunch set-key --guardian <API_KEY>'."
+        )
+
+    from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+    from newslaunch.sync_state import SyncState
+
+    try:
+        state = SyncState(state_file or SYNC_STATE_FILE)
         guardian_api = GuardianAPI(api_key=api_key)
-        articles = guardian_api.search_articles(
-            search_term=search_term,
+        articles = guardian_api.sync_articles(
+            search_term,
+            state,
             from_date=from_date,
             page_size=page_size,
-            order_by=order_by,
             filter_response=full_response,
+            show_fields=fields,
+            max_results=max_results,
         )
         if articles:
-            click.echo(json.dumps(articles, indent=4, ensure_ascii=False))
+            click.echo(format_articles(articles, output_format))
         else:
-            click.secho("No articles found.", fg="red")
+            click.secho("No new articles.", fg="red", err=output_format == "ndjson")
     except GuardianAPIError as ge:
         raise click.ClickException(f"{ge}")
+
+
+@cli.command()
+@click.argument("search_term", required=True, type=str)
+@click.option(
+    "-s",
+    "--stream-name",
+    required=True,
+    type=str,
+    help="The name of the Kinesis stream to publish to.",
+)
+@click.option(
+    "-r",
+    "--region",
+    default=None,
+    type=str,
+    help="The AWS region of the stream. Defaults to the boto3 default region.",
+)
+@click.option(
+    "-fd",
+    "--from-date",
+    default=None,
+    type=str,
+    help="The earliest publication date (YYYY-MM-DD format).",
+)
+@click.option(
+    "-ps",
+    "--page-size",
+    default=200,
+    type=int,
+    help="The number of items requested per page (1-200).",
+)
+@click.option(
+    "-o",
+    "--order-by",
+    default=None,
+    type=click.Choice(["newest", "oldest", "relevance"]),
+    help="The order to sort the articles by. Defaults to 'relevance'.",
+)
+@click.option(
+    "-m",
+    "--max-results",
+    default=None,
+    type=int,
+    help="The maximum number of articles to publish. Defaults to all results.",
+)
+@click.option(
+    "-f",
+    "--full-response",
+    is_flag=True,
+    default=True,
+    flag_value=False,
+    type=bool,
+    help="Publishes full articles if set, else only a subset of fields (webPublicationDate, webTitle, webUrl, contentPreview).",
+)
+@click.option(
+    "--fields",
+    default=None,
+    type=str,
+    help="Comma-separated article fields to request with the full response, e.g. 'headline,wordcount'. Defaults to all fields.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    default=200,
+    type=int,
+    help="The number of articles per put_records call. Defaults to 200.",
+)
+@click.option(
+    "-q",
+    "--queue-size",
+    default=4,
+    type=int,
+    help="The maximum number of fetched batches waiting to be published. Defaults to 4.",
+)
+@click.option(
+    "--partitioner",
+    default="random",
+    type=click.Choice(["random", "article_id", "round_robin"]),
+    help="How records are assigned to shards. Defaults to 'random'.",
+)
+@click.option(
+    "--compression",
+    default=None,
+    type=click.Choice(["gzip", "zstd"]),
+    help="Compress each record. Defaults to no compression.",
+)
+@click.option(
+    "--aggregate",
+    is_flag=True,
+    default=False,
+    help="Pack the records into KPL aggregated records.",
+)
+@click.option(
+    "--stats-interval",
+    default=1.0,
+    type=float,
+    help="Seconds between live progress lines. Defaults to 1.",
+)
+def publish(
+    search_term: str,
+    stream_name: str,
+    region: str | None,
+    from_date: str | None,
+    page_size: int,
+    order_by: str | None,
+    max_results: int | None,
+    full_response: bool,
+    fields: str | None,
+    batch_size: int,
+    queue_size: int,
+    partitioner: str,
+    compression: str | None,
+    aggregate: bool,
+    stats_interval: float,
+) -> None:
+    """Fetch Guardian articles and publish them to a Kinesis stream."""
+    api_key = load_api_key("guardian")
+    if not api_key:
+        raise click.ClickException(
+            "Guardian API key not found. Please add it using 'newslaunch set-key --guardian <API_KEY>'."
+        )
+
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+    from newslaunch.kinesis_writer import KinesisWriter, KinesisWriterError
+    from newslaunch.pipeline import PublishPipeline
+
+    def show_progress(stats: dict) -> None:
+        click.echo(
+            f"{stats['articles']} articles, {stats['articles_per_second']} articles/s, "
+            f"{stats['bytes_per_second'] / 1024:.1f} KiB/s, {stats['api_calls']} API calls",
+            err=True,
+        )
+
+    try:
+        with GuardianAPI(api_key=api_key) as guardian_api:
+            writer = KinesisWriter(
+                stream_name,
+                region_name=region,
+                partitioner=partitioner,
+                compression=compression,
+                aggregate=aggregate,
+            )
+            pipeline = PublishPipeline(
+                guardian_api, writer, batch_size=batch_size, queue_size=queue_size
+            )
+            stats = pipeline.run(
+                search_term,
+                progress=show_progress,
+                progress_interval=stats_interval,
+                from_date=from_date,
+                page_size=page_size,
+                order_by=order_by,
+                max_results=max_results,
+                filter_response=full_response,
+                show_fields=fields,
+            )
+    except (GuardianAPIError, KinesisWriterError, ClientError, BotoCoreError) as e:
+        raise click.ClickException(f"{e}")
+    except ValueError as e:
+        raise click.BadParameter(f"{e}")
+
+    click.secho(
+        f"Published {stats['articles']} articles to {stream_name} "
+        f"({stats['failed']} failed) in {stats['elapsed']:.1f}s: "
+        f"{stats['articles_per_second']} articles/s, "
+        f"{stats['bytes_per_second'] / 1024:.1f} KiB/s, "
+        f"{stats['api_calls']} API calls ({stats['api_retries']} retries), "
+        f"{stats['put_calls']} put calls ({stats['put_retries']} records retried).",
+        fg="green" if not stats["failed"] else "yellow",
+    )
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import sqlite3
+from pathlib import Path
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set of strings.
+
+    Membership tests never give false negatives and give false positives with a
+    probability of about `error_rate` once `capacity` keys have been added.
+
+    Args:
+        capacity (int, optional): The expected number of keys. Defaults to 100000.
+        error_rate (float, optional): The target false positive rate. Defaults to 0.001.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError(
+                "Capacity must be positive and error_rate must be between 0 and 1."
+            )
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        """Return the bit positions of a key using double hashing."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class ArticleDeduplicator:
+    """Drops articles that have already been published.
+
+    Articles are keyed by their Guardian `id`, or by a hash of their content when the
+    id is not available (e.g. filtered previews). Keys are tracked in an in-memory
+    Bloom filter and, if `db_path` is given, in a persistent SQLite set that is used
+    to confirm Bloom filter hits exactly and to restore the filter between runs.
+    Without a persistent set, a Bloom filter false positive drops a new article.
+
+    Args:
+        capacity (int, optional): The expected number of published articles. Defaults to 100000.
+        error_rate (float, optional): The Bloom filter false positive rate. Defaults to 0.001.
+        db_path (str | Path, optional): Path of the SQLite database of published keys. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        db_path: str | Path | None = None,
+    ):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self._conn = None
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS published (key TEXT PRIMARY KEY)"
+            )
+            self._conn.commit()
+            for (key,) in self._conn.execute("SELECT key FROM published"):
+                self.bloom.add(key)
+
+    def __enter__(self) -> ArticleDeduplicator:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def article_key(article: dict) -> str:
+        """Return the de-duplication key of an article."""
+        article_id = article.get("id")
+        if article_id:
+            return article_id
+        content = json.dumps(article, sort_keys=True, ensure_ascii=False)
+        return "sha256:" + hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def is_published(self, key: str) -> bool:
+        """Return True if the key has (probably, without a persistent set) been published."""
+        if key not in self.bloom:
+            return False
+        if self._conn is None:
+            return True
+        row = self._conn.execute(
+            "SELECT 1 FROM published WHERE key = ?", (key,)
+        ).fetchone()
+        return row is not None
+
+    def filter_new(self, articles: list[dict]) -> list[dict]:
+        """Return the articles that have not been published yet, without duplicates.
+
+        The articles are not marked as published; call mark_published once they
+        have been sent successfully.
+        """
+        seen = set()
+        new_articles = []
+        for article in articles:
+            key = self.article_key(article)
+            if key in seen or self.is_published(key):
+                continue
+            seen.add(key)
+            new_articles.append(article)
+        return new_articles
+
+    def mark_published(self, articles: list[dict]) -> None:
+        """Record the articles as published."""
+        keys = [self.article_key(article) for article in articles]
+        for key in keys:
+            self.bloom.add(key)
+        if self._conn is not None:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO published VALUES (?)", [(key,) for key in keys]
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the persistent set, if any."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
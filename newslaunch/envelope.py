@@ -0,0 +1,131 @@
+"""Self-describing envelope for compressed or tagged record payloads.
+
+An enveloped payload is a header followed by the (compressed) record data:
+
+    version 1: b"NLE" | 1 | codec (1 byte) | compressed JSON data
+    version 2: b"NLE" | 2 | codec (1 byte) | format (1 byte) | data
+
+Version 2 records the serialization format of the data and allows uncompressed
+data (codec 0), so non-JSON records can be tagged. Version 1 payloads are still
+read. Payloads without the header are plain record data, so consumers can decode
+enveloped and plain records alike with `open_envelope` or `unwrap`.
+"""
+
+from __future__ import annotations
+
+import gzip
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+ENVELOPE_MAGIC = b"NLE"
+ENVELOPE_VERSION = 2
+HEADER_SIZE = len(ENVELOPE_MAGIC) + 3
+_V1_HEADER_SIZE = len(ENVELOPE_MAGIC) + 2
+
+CODECS = {"none": 0, "gzip": 1, "zstd": 2}
+_CODEC_NAMES = {codec_id: name for name, codec_id in CODECS.items()}
+
+FORMATS = {"json": 0, "msgpack": 1}
+_FORMAT_NAMES = {format_id: name for name, format_id in FORMATS.items()}
+
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def codec_available(codec: str) -> bool:
+    """Return True if the codec is known and its library is installed."""
+    if codec == "zstd":
+        return zstandard is not None
+    return codec in CODECS
+
+
+def wrap(
+    data: bytes,
+    codec: str | None = None,
+    fmt: str = "json",
+    level: int | None = None,
+) -> bytes:
+    """Wrap the data in an envelope, compressing it with the codec if given.
+
+    Args:
+        data (bytes): The record data.
+        codec (str, optional): "gzip", "zstd" (requires the zstandard package) or None. Defaults to None.
+        fmt (str, optional): The serialization format of the data, "json" or "msgpack". Defaults to "json".
+        level (int, optional): The compression level. Defaults to 6 for gzip and 3 for zstd.
+
+    Returns:
+        (bytes): The enveloped payload.
+
+    Raises:
+        ValueError: If the codec is unknown or not installed, or the format is unknown.
+    """
+    codec = codec or "none"
+    if not codec_available(codec):
+        raise ValueError(
+            f"Unsupported compression codec '{codec}'. "
+            f"Available codecs: {', '.join(c for c in CODECS if codec_available(c))}."
+        )
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported envelope format '{fmt}'.")
+    if level is None:
+        level = DEFAULT_LEVELS.get(codec)
+
+    if codec == "gzip":
+        data = gzip.compress(data, compresslevel=level, mtime=0)
+    elif codec == "zstd":
+        data = zstandard.ZstdCompressor(level=level).compress(data)
+    header = bytes((ENVELOPE_VERSION, CODECS[codec], FORMATS[fmt]))
+    return ENVELOPE_MAGIC + header + data
+
+
+def compress(data: bytes, codec: str = "gzip", level: int | None = None) -> bytes:
+    """Compress JSON data and wrap it in an envelope. See wrap()."""
+    return wrap(data, codec, level=level)
+
+
+def is_enveloped(data: bytes) -> bool:
+    """Return True if the payload starts with an envelope header."""
+    return len(data) >= _V1_HEADER_SIZE and data.startswith(ENVELOPE_MAGIC)
+
+
+def unwrap(data: bytes) -> tuple[bytes, str]:
+    """Return the decompressed data of a payload and its serialization format.
+
+    Payloads without an envelope are returned as they are, as JSON.
+
+    Raises:
+        ValueError: If the envelope version, codec or format is not supported.
+    """
+    if not is_enveloped(data):
+        return data, "json"
+
+    version, codec_id = data[len(ENVELOPE_MAGIC)], data[len(ENVELOPE_MAGIC) + 1]
+    if version == 1:
+        format_id, body = FORMATS["json"], data[_V1_HEADER_SIZE:]
+    elif version == ENVELOPE_VERSION and len(data) >= HEADER_SIZE:
+        format_id, body = data[len(ENVELOPE_MAGIC) + 2], data[HEADER_SIZE:]
+    else:
+        raise ValueError(f"Unsupported envelope version {version}.")
+
+    codec = _CODEC_NAMES.get(codec_id)
+    if codec is None or not codec_available(codec):
+        raise ValueError(f"Unsupported envelope codec {codec or codec_id}.")
+    if format_id not in _FORMAT_NAMES:
+        raise ValueError(f"Unsupported envelope format {format_id}.")
+
+    if codec == "gzip":
+        body = gzip.decompress(body)
+    elif codec == "zstd":
+        body = zstandard.ZstdDecompressor().decompress(body)
+    return body, _FORMAT_NAMES[format_id]
+
+
+def open_envelope(data: bytes) -> bytes:
+    """Return the decompressed data of an enveloped payload, or the payload itself.
+
+    Raises:
+        ValueError: If the envelope version or codec is not supported.
+    """
+    return unwrap(data)[0]
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
 import os
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 
 import requests
 from pydantic import AliasPath, BaseModel, Field, field_validator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from newslaunch.dedup import ArticleDeduplicator
+from newslaunch.response_cache import ResponseCache
+from newslaunch.sync_state import SyncState
 
 
 class GuardianArticlePreview(BaseModel):
@@ -23,21 +35,69 @@ class GuardianArticlePreview(BaseModel):
     @classmethod
     def truncate_article_content(cls, content: str) -> str:
         """Truncate the article content to 1000 characters."""
-        if len(content) > 1000:
-            preview = content[:1000].strip()
-            if preview[-1].isalpha():
-                return preview + "..."
-            return preview.rstrip(",") + ("..." if preview[-1] != "." else "")
-        else:
-            return content
+        return _truncate_content(content)
+
+
+def _truncate_content(content: str) -> str:
+    """Truncate the article content to 1000 characters."""
+    if len(content) > 1000:
+        preview = content[:1000].strip()
+        if preview[-1].isalpha():
+            return preview + "..."
+        return preview.rstrip(",") + ("..." if preview[-1] != "." else "")
+    else:
+        return content
+
+
+def _extract_preview(article: dict) -> dict:
+    """Extract the GuardianArticlePreview fields of an article as a plain dict.
+
+    Equivalent to GuardianArticlePreview(**article).model_dump(by_alias=True), but
+    without building a model per article. Articles that are not well-formed take the
+    model path so that they fail with the same validation error.
+    """
+    try:
+        date = article["webPublicationDate"]
+        title = article["webTitle"]
+        url = article["webUrl"]
+        content = article["fields"]["bodyText"]
+    except (KeyError, TypeError):
+        content = None
+
+    if not (
+        type(content) is str
+        and type(date) is str
+        and type(title) is str
+        and type(url) is str
+    ):
+        return GuardianArticlePreview(**article).model_dump(by_alias=True)
+
+    return {
+        "webPublicationDate": date,
+        "webTitle": title,
+        "webUrl": url,
+        "contentPreview": _truncate_content(content),
+    }
 
 
 class GuardianAPIError(Exception):
     """Custom exception for Guardian API wrapper errors."""
 
 
-class GuardianAPI:
-    """Wrapper class for interacting with Guardian API.
+class _JitteredRetry(Retry):
+    """urllib3 Retry with jittered exponential backoff.
+
+    Each backoff is drawn uniformly from the upper half of the exponential delay so
+    that concurrent clients retrying after the same failure do not synchronise.
+    """
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return backoff / 2 + random.uniform(0, backoff / 2)  # noqa: S311
+
+
+class _BaseGuardianAPI:
+    """Shared request building and response processing for the Guardian API clients.
 
     Args:
         api_key (str, optional): API access key. Reads from env if not provided.
@@ -49,6 +109,9 @@ class GuardianAPI:
     """
 
     API_URL = "https://content.guardianapis.com"
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    # The only field GuardianArticlePreview reads from the article "fields".
+    PREVIEW_FIELD = "bodyText"
 
     def __init__(self, api_key: str | None = None, request_timeout: int = 20):
         self.api_key = api_key or os.getenv("GUARDIAN_API_KEY")
@@ -58,33 +121,19 @@ class GuardianAPI:
             )
         self.request_timeout = request_timeout
 
-    def search_articles(
+    def _build_request_params(
         self,
         search_term: str,
-        page_size: int | None = 10,
-        from_date: str | None = None,
+        page_size: int | None,
+        from_date: str | None,
+        order_by: str | None,
         filter_response: bool | None = True,
-        order_by: str | None = None,
-    ) -> list[dict] | None:
-        """Search for Guardian articles.
-
-        Args:
-            search_term (str): The search query for articles.
-            page_size (int, optional): The number of items displayed per page (up to 200). Defaults to 10.
-            from_date (str, optional): The earliest publication date (YYYY-MM-DD format). Defaults to None.
-            filter_response (bool, optional): Returns a filtered response if True, else returns the full response. Defaults to True.
-            order_by (str, optional): The order to sort the articles by. Must be one of 'newest', 'oldest', 'relevance'. Defaults to 'relevance'.
-
-        Returns:
-            (list[dict] | None): A list of articles if found, None otherwise.
+        show_fields: str | list[str] | None = None,
+    ) -> dict:
+        """Validate the search parameters and build the /search query parameters.
 
         Raises:
-            GuardianAPIError:
-                If search_term is empty or None.
-                If from_date is provided but not in 'YYYY-MM-DD' format.
-                If order_by is not in allowed values.
-                If page_size exceeds current API limit.
-                If an error occurs while fetching articles from the Guardian API.
+            GuardianAPIError: If any of the search parameters are invalid.
         """
         if not search_term:
             raise GuardianAPIError("Search term required.")
@@ -114,7 +163,7 @@ class GuardianAPI:
             "q": search_term,
             "api-key": self.api_key,
             "format": "json",
-            "show-fields": "all",
+            "show-fields": self._show_fields(filter_response, show_fields),
             "page-size": page_size,
         }
 
@@ -124,39 +173,472 @@ class GuardianAPI:
         if order_by:
             req_params["order-by"] = order_by
 
-        try:
-            response = requests.get(
-                f"{self.API_URL}/search",
-                params=req_params,
-                timeout=self.request_timeout,
-            )
-            response.raise_for_status()
-        except requests.RequestException as e:
-            raise GuardianAPIError(f"Error fetching Guardian articles: {e}")
+        return req_params
 
-        data = response.json()
-        results = data.get("response", {}).get("results")
+    def _show_fields(
+        self, filter_response: bool | None, show_fields: str | list[str] | None
+    ) -> str:
+        """Return the show-fields parameter, ensuring the preview has its content.
+
+        Raises:
+            GuardianAPIError: If show_fields is not a string or a list of strings.
+        """
+        if show_fields is None:
+            return self.PREVIEW_FIELD if filter_response else "all"
+
+        if isinstance(show_fields, str):
+            fields = [field.strip() for field in show_fields.split(",")]
+        elif isinstance(show_fields, (list, tuple)) and all(
+            isinstance(field, str) for field in show_fields
+        ):
+            fields = [field.strip() for field in show_fields]
+        else:
+            raise GuardianAPIError("Show_fields must be a string or a list of strings.")
+
+        fields = [field for field in fields if field]
+        if "all" in fields:
+            return "all"
+        if filter_response and self.PREVIEW_FIELD not in fields:
+            fields.append(self.PREVIEW_FIELD)
+        return ",".join(fields) if fields else "all"
+
+    def _validate_paging_params(
+        self, max_results: int | None, concurrency: int
+    ) -> None:
+        """Validate the pagination parameters of iter_articles.
+
+        Raises:
+            GuardianAPIError: If max_results or concurrency is not a positive integer.
+        """
+        if max_results is not None and (
+            not isinstance(max_results, int) or max_results < 1
+        ):
+            raise GuardianAPIError("Max_results must be a positive integer.")
+
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise GuardianAPIError("Concurrency must be a positive integer.")
+
+    def _last_page(self, first_page: dict, max_results: int | None) -> int:
+        """Return the last page number to fetch given the first page's metadata."""
+        last_page = first_page.get("pages", 1)
+        if max_results is not None:
+            page_size = first_page.get("pageSize") or len(first_page["results"])
+            last_page = min(last_page, -(-max_results // page_size))
+        return last_page
+
+    def _process_results(
+        self, results: list[dict], filter_response: bool | None
+    ) -> list[dict]:
+        """Return the page results, filtered down to the preview fields if requested."""
+        if filter_response:
+            return [_extract_preview(article) for article in results]
+        return results
+
+
+class GuardianAPI(_BaseGuardianAPI):
+    """Wrapper class for interacting with Guardian API.
+
+    Requests are sent through a pooled HTTP session that keeps connections alive
+    between calls and retries connection errors and 429/5xx responses with jittered
+    exponential backoff. Call close() or use the instance as a context manager to
+    release the pooled connections.
+
+    Args:
+        api_key (str, optional): API access key. Reads from env if not provided.
+        request_timeout (int, optional): HTTP request timeout. Defaults to 20s.
+        pool_size (int, optional): Maximum number of pooled keep-alive connections. Defaults to 10.
+        max_retries (int, optional): Maximum number of retries per request. Defaults to 3.
+        backoff_factor (float, optional): Base of the exponential backoff between retries in seconds. Defaults to 0.5.
+        cache (ResponseCache, optional): Cache of raw /search responses consulted before each request. Defaults to None.
+
+    Raises:
+        GuardianAPIError:
+            If GUARDIAN_API_KEY is not provided.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        request_timeout: int = 20,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        cache: ResponseCache | None = None,
+    ):
+        super().__init__(api_key, request_timeout)
+        self.session = self._create_session(pool_size, max_retries, backoff_factor)
+        self.cache = cache
+        # Counters of the HTTP requests sent (excluding cache hits) and retried.
+        # Updated by the threads of iter_articles and search_many, under the lock.
+        self.requests = 0
+        self.retries = 0
+        self._counters_lock = threading.Lock()
+
+    def __enter__(self) -> GuardianAPI:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        self.session.close()
+
+    def _create_session(
+        self, pool_size: int, max_retries: int, backoff_factor: float
+    ) -> requests.Session:
+        """Create a keep-alive HTTP session with a sized connection pool and retries."""
+        retry = _JitteredRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def search_articles(
+        self,
+        search_term: str,
+        page_size: int | None = 10,
+        from_date: str | None = None,
+        filter_response: bool | None = True,
+        order_by: str | None = None,
+        show_fields: str | list[str] | None = None,
+    ) -> list[dict] | None:
+        """Search for Guardian articles.
+
+        Args:
+            search_term (str): The search query for articles.
+            page_size (int, optional): The number of items displayed per page (up to 200). Defaults to 10.
+            from_date (str, optional): The earliest publication date (YYYY-MM-DD format). Defaults to None.
+            filter_response (bool, optional): Returns a filtered response if True, else returns the full response. Defaults to True.
+            order_by (str, optional): The order to sort the articles by. Must be one of 'newest', 'oldest', 'relevance'. Defaults to 'relevance'.
+            show_fields (str | list[str], optional): The article fields to request, e.g. ['headline', 'wordcount'] or 'all'. Defaults to only 'bodyText' (always included) if filter_response is True, else 'all'.
+
+        Returns:
+            (list[dict] | None): A list of articles if found, None otherwise.
+
+        Raises:
+            GuardianAPIError:
+                If search_term is empty or None.
+                If from_date is provided but not in 'YYYY-MM-DD' format.
+                If order_by is not in allowed values.
+                If page_size exceeds current API limit.
+                If an error occurs while fetching articles from the Guardian API.
+        """
+        req_params = self._build_request_params(
+            search_term, page_size, from_date, order_by, filter_response, show_fields
+        )
+        data = self._fetch_page(req_params)
+        results = data.get("results")
 
         if not results:
             return None
 
-        if filter_response:
-            filtered_results = [
-                article.model_dump(by_alias=True)
-                for article in self._filter_articles(results)
-            ]
-            return filtered_results
-        else:
-            return results
+        return self._process_results(results, filter_response)
+
+    def iter_articles(
+        self,
+        search_term: str,
+        page_size: int | None = 10,
+        from_date: str | None = None,
+        filter_response: bool | None = True,
+        order_by: str | None = None,
+        show_fields: str | list[str] | None = None,
+        max_results: int | None = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> Iterator[dict]:
+        """Lazily iterate over all Guardian articles matching the search, page by page.
+
+        With the default concurrency of 1, pages are requested only as the previous one
+        is consumed, so memory is bounded by a single page and the caller can stop
+        iterating at any point. With a higher concurrency, once the first page reveals
+        the number of pages the remaining ones are prefetched through a thread pool,
+        with at most `concurrency` requests (and unconsumed pages) in flight.
+
+        Args:
+            search_term (str): The search query for articles.
+            page_size (int, optional): The number of items requested per page (up to 200). Defaults to 10.
+            from_date (str, optional): The earliest publication date (YYYY-MM-DD format). Defaults to None.
+            filter_response (bool, optional): Yields filtered articles if True, else yields the full articles. Defaults to True.
+            order_by (str, optional): The order to sort the articles by. Must be one of 'newest', 'oldest', 'relevance'. Defaults to 'relevance'.
+            show_fields (str | list[str], optional): The article fields to request, e.g. ['headline', 'wordcount'] or 'all'. Defaults to only 'bodyText' (always included) if filter_response is True, else 'all'.
+            max_results (int, optional): The maximum number of articles to yield. Defaults to None (all pages).
+            concurrency (int, optional): The maximum number of pages fetched in parallel. Defaults to 1.
+            ordered (bool, optional): Yields pages in page order if True, else in the order they complete. Defaults to True.
+
+        Yields:
+            (dict): A single article.
+
+        Raises:
+            GuardianAPIError:
+                If any of the search parameters are invalid (see search_articles).
+                If max_results is not a positive integer.
+                If concurrency is not a positive integer.
+                If an error occurs while fetching articles from the Guardian API.
+        """
+        self._validate_paging_params(max_results, concurrency)
+        req_params = self._build_request_params(
+            search_term, page_size, from_date, order_by, filter_response, show_fields
+        )
+
+        yielded = 0
+        for results in self._iter_pages(req_params, max_results, concurrency, ordered):
+            for article in self._process_results(results, filter_response):
+                yield article
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+
+    def sync_articles(
+        self,
+        search_term: str,
+        state: SyncState,
+        from_date: str | None = None,
+        page_size: int | None = 200,
+        filter_response: bool | None = True,
+        show_fields: str | list[str] | None = None,
+        max_results: int | None = None,
+        concurrency: int = 1,
+    ) -> list[dict]:
+        """Fetch only the articles published since the previous sync of the query.
+
+        The newest webPublicationDate seen for the query is kept as a watermark in
+        the sync state. Each run requests articles ordered oldest first from the
+        watermark's day onwards, drops those not strictly newer than the watermark,
+        and advances and saves the watermark only once all pages have been fetched.
+
+        Args:
+            search_term (str): The search query for articles.
+            state (SyncState): The state holding the per-query watermarks.
+            from_date (str, optional): The earliest publication date (YYYY-MM-DD format) used when the query has no watermark yet. Defaults to None.
+            page_size (int, optional): The number of items requested per page (up to 200). Defaults to 200.
+            filter_response (bool, optional): Returns filtered articles if True, else returns the full articles. Defaults to True.
+            show_fields (str | list[str], optional): The article fields to request. Defaults to only 'bodyText' if filter_response is True, else 'all'.
+            max_results (int, optional): The number of articles after which this run stops. It stops after all the articles published at the same time as the last one, which can exceed max_results, so that the next run continues from the watermark without skipping any. Defaults to None (all new articles).
+            concurrency (int, optional): The maximum number of pages fetched in parallel. Defaults to 1.
+
+        Returns:
+            (list[dict]): The new articles, oldest first. Empty if there are none.
+
+        Raises:
+            GuardianAPIError:
+                If any of the search or paging parameters are invalid.
+                If an error occurs while fetching articles from the Guardian API.
+        """
+        key = state.make_key(search_term)
+        watermark = state.get_watermark(key)
+        if watermark:
+            from_date = watermark[:10]
+
+        self._validate_paging_params(max_results, concurrency)
+        articles = []
+        for article in self.iter_articles(
+            search_term,
+            page_size=page_size,
+            from_date=from_date,
+            filter_response=filter_response,
+            order_by="oldest",
+            show_fields=show_fields,
+            concurrency=concurrency,
+        ):
+            if watermark is not None and article["webPublicationDate"] <= watermark:
+                continue
+            # Stop at max_results only between publication times: the watermark
+            # would skip the rest of the articles published with the last one.
+            if (
+                max_results is not None
+                and len(articles) >= max_results
+                and article["webPublicationDate"] != articles[-1]["webPublicationDate"]
+            ):
+                break
+            articles.append(article)
+
+        if articles:
+            state.set_watermark(
+                key, max(article["webPublicationDate"] for article in articles)
+            )
+            state.save()
+        return articles
+
+    def search_many(
+        self,
+        queries: list[str | dict],
+        concurrency: int = 4,
+        **params,
+    ) -> tuple[list[dict], list[dict]]:
+        """Run several searches concurrently and merge their results without duplicates.
+
+        Each query runs search_articles, with at most `concurrency` requests in
+        flight. Articles are merged in query order and de-duplicated by their id (or
+        content for filtered previews). A query that fails does not fail the others:
+        its error is reported in its stats.
+
+        Args:
+            queries (list[str | dict]): Search terms, or dicts with a "search_term" and any search_articles parameters for that query.
+            concurrency (int, optional): The maximum number of queries run in parallel. Defaults to 4.
+            **params: Default search_articles parameters for all queries, e.g. page_size=50.
+
+        Returns:
+            (tuple[list[dict], list[dict]]): The merged articles, and the stats of each
+                query in query order: its search_term, the number of "results", the
+                number of "unique" articles it added to the merged list, its
+                "elapsed" time in seconds and its "error", if any.
+
+        Raises:
+            GuardianAPIError: If concurrency is not a positive integer.
+        """
+        self._validate_paging_params(None, concurrency)
+        query_params = [
+            (
+                {**params, "search_term": query}
+                if isinstance(query, str)
+                else {**params, "search_term": None, **query}
+            )
+            for query in queries
+        ]
+
+        def run(kwargs: dict) -> tuple[list[dict], float, str | None]:
+            start = time.perf_counter()
+            try:
+                results = self.search_articles(**kwargs) or []
+                error = None
+            except GuardianAPIError as e:
+                results, error = [], str(e)
+            return results, time.perf_counter() - start, error
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(run, query_params))
+
+        seen = set()
+        articles = []
+        stats = []
+        for kwargs, (results, elapsed, error) in zip(  # noqa: B905
+            query_params, outcomes
+        ):
+            unique = 0
+            for article in results:
+                key = ArticleDeduplicator.article_key(article)
+                if key in seen:
+                    continue
+                seen.add(key)
+                articles.append(article)
+                unique += 1
+            stats.append(
+                {
+                    "search_term": kwargs["search_term"],
+                    "results": len(results),
+                    "unique": unique,
+                    "elapsed": round(elapsed, 3),
+                    "error": error,
+                }
+            )
+        return articles, stats
 
-    def _filter_articles(self, articles: list[dict]) -> list[GuardianArticlePreview]:
-        """Parse the API response and extract a subset of fields.
+    def _iter_pages(
+        self,
+        req_params: dict,
+        max_results: int | None,
+        concurrency: int,
+        ordered: bool,
+    ) -> Iterator[list[dict]]:
+        """Yield the results of each page, prefetching pages 2..n in parallel if
+        concurrency > 1."""
+        data = self._fetch_page(req_params)
+        results = data.get("results")
+        if not results:
+            return
+        yield results
+
+        pages = range(2, self._last_page(data, max_results) + 1)
+
+        if concurrency == 1:
+            for page in pages:
+                results = self._fetch_page(req_params, page=page).get("results")
+                if not results:
+                    return
+                yield results
+            return
+
+        pages = iter(pages)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending: deque[Future] = deque()
+
+        def submit_next() -> None:
+            page = next(pages, None)
+            if page is not None:
+                pending.append(executor.submit(self._fetch_page, req_params, page))
+
+        try:
+            for _ in range(concurrency):
+                submit_next()
+
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [future for future in pending if future in finished]
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    results = future.result().get("results")
+                    submit_next()
+                    if results:
+                        yield results
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _fetch_page(self, req_params: dict, page: int | None = None) -> dict:
+        """Fetch a single page of search results, from the cache if one is set.
 
         Args:
-            articles (list[dict]): List of articles from the API response.
+            req_params (dict): The /search query parameters.
+            page (int, optional): The page number to request. Defaults to the first page.
 
         Returns:
-            list[GuardianContent]: List of GuardianContent models representing parsed search results.
+            (dict): The "response" object of the API response, including the paging
+                metadata (total, pages, currentPage) and the page results.
+
+        Raises:
+            GuardianAPIError: If an error occurs while fetching articles from the Guardian API.
         """
-        filtered_articles = [GuardianArticlePreview(**article) for article in articles]
-        return filtered_articles
+        if page is not None and page > 1:
+            req_params = {**req_params, "page": page}
+
+        if self.cache is not None:
+            cached = self.cache.get(req_params)
+            if cached is not None:
+                return cached
+
+        with self._counters_lock:
+            self.requests += 1
+        try:
+            response = self.session.get(
+                f"{self.API_URL}/search",
+                params=req_params,
+                timeout=self.request_timeout,
+            )
+            retries = getattr(response.raw, "retries", None)
+            if isinstance(retries, Retry):
+                with self._counters_lock:
+                    self.retries += len(retries.history)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise GuardianAPIError(f"Error fetching Guardian articles: {e}")
+
+        data = response.json().get("response", {})
+        if self.cache is not None:
+            self.cache.set(req_params, data)
+        return data
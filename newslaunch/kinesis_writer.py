@@ -1,42 +1,112 @@
 from __future__ import annotations
 
-import json
-import uuid
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
 
 import boto3
 
+from newslaunch.envelope import codec_available, wrap
+from newslaunch.kpl import DEFAULT_MAX_SIZE, pack_records
+from newslaunch.partitioning import Partitioner, get_partitioner
+from newslaunch.serializers import Serializer, get_serializer
+from newslaunch.shards import ShardMap, ShardThrottle
+
 
 class KinesisWriterError(Exception):
     """Custom exception class for KinesisWriter errors."""
 
 
+# Control messages for the buffered mode background thread.
+_FLUSH = object()
+_STOP = object()
+
+
 class KinesisWriter:
     """Helper class for writing data to an AWS Kinesis stream.
 
+    In buffered mode, send_to_stream only enqueues the records and returns. A
+    background thread coalesces them into put_records batches, sent whenever a batch
+    reaches the count or size limit or `linger_time` has passed since its first
+    record. The queue is bounded, so send_to_stream blocks when the thread falls
+    behind. Call flush() to wait for the queued records to be sent, and close() or
+    use the writer as a context manager to stop the thread.
+
     Args:
         stream_name (str): The name of the Kinesis stream.
         region_name (str, optional): If not provided, the default region from the boto3 session will be used.
         aws_access_key_id (str, optional): The AWS access key ID for authentication.
         aws_secret_access_key (str, optional): The AWS secret access key for authentication.
         If not provided, the default aws credential resolution chain will be used.
+        max_retries (int, optional): Maximum number of times records that failed in a put_records call are resubmitted. Defaults to 3.
+        backoff_factor (float, optional): Base of the exponential backoff between retries in seconds. Defaults to 0.1.
+        max_backoff (float, optional): Maximum backoff between retries in seconds. Defaults to 5.
+        retry_timeout (float, optional): Time budget in seconds for retrying a send_to_stream call. Defaults to None (limited by max_retries only).
+        buffered (bool, optional): Enables the buffered mode. Defaults to False.
+        linger_time (float, optional): Maximum time in seconds a buffered record waits for a batch to fill up. Defaults to 0.5.
+        max_queue_size (int, optional): Maximum number of buffered records before send_to_stream blocks. Defaults to 10000.
+        aggregate (bool, optional): Packs the records sent with put_records into KPL aggregated records. Defaults to False.
+        aggregate_max_size (int, optional): Maximum size in bytes of an aggregated record. Defaults to 51200.
+        compression (str, optional): Compresses each record in an envelope with "gzip" or "zstd" (requires zstandard). Defaults to None.
+        compression_level (int, optional): The compression level. Defaults to the codec's default.
+        rate_limit (bool, optional): Paces writes to stay within the per-shard write limits. Defaults to False.
+        shard_records_per_second (float, optional): Records per second per shard allowed by the rate limit. Defaults to 1000.
+        shard_bytes_per_second (float, optional): Bytes per second per shard allowed by the rate limit. Defaults to 1MiB.
+        partitioner (str | Callable | Partitioner, optional): The partitioning strategy used when send_to_stream
+            is called without a partition key: "random", "article_id", "round_robin", a function returning the
+            partition key of an item or a Partitioner. Defaults to "random".
+        serializer (str | Serializer, optional): Serializer of the items that are not bytes or strings: "auto"
+            (orjson if installed, else json), "json", "orjson" or "msgpack". msgpack records are tagged in a
+            payload envelope. Defaults to "auto".
 
     Raises:
-        KinesisWriterError: If stream_name parameter is not provided.
+        KinesisWriterError: If stream_name parameter is not provided, the compression codec is not available
+            or the partitioning strategy or serializer is unknown or not available.
     """
 
+    # Kinesis API limits.
+    MAX_RECORD_SIZE = 1024 * 1024
+    MAX_BATCH_RECORDS = 500
+    MAX_BATCH_SIZE = 5 * 1024 * 1024
+    THROTTLING_ERROR = "ProvisionedThroughputExceededException"
+
     def __init__(
         self,
         stream_name: str,
         region_name: str | None = None,
         aws_access_key_id: str | None = None,
         aws_secret_access_key: str | None = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.1,
+        max_backoff: float = 5.0,
+        retry_timeout: float | None = None,
+        buffered: bool = False,
+        linger_time: float = 0.5,
+        max_queue_size: int = 10_000,
+        aggregate: bool = False,
+        aggregate_max_size: int = DEFAULT_MAX_SIZE,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        rate_limit: bool = False,
+        shard_records_per_second: float = 1000,
+        shard_bytes_per_second: float = 1024 * 1024,
+        partitioner: str | Callable | Partitioner = "random",
+        serializer: str | Serializer = "auto",
     ):
         if not stream_name:
             raise KinesisWriterError("Stream_name parameter is required.")
+        if compression is not None and not codec_available(compression):
+            raise KinesisWriterError(
+                f"Compression codec '{compression}' is not available."
+            )
 
         self.stream_name = stream_name
-        self.region_name = region_name or boto3.Session().region_name
 
+        # A single session resolves both the credentials and the default region;
+        # boto3 sessions are expensive to create.
         if aws_access_key_id and aws_secret_access_key:
             self.session = boto3.Session(
                 aws_access_key_id=aws_access_key_id,
@@ -44,8 +114,99 @@ class KinesisWriter:
             )
         else:
             self.session = boto3.Session()
+        self.region_name = region_name or self.session.region_name
 
         self.client = self.session.client("kinesis", region_name=self.region_name)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_timeout = retry_timeout
+        self.aggregate = aggregate
+        # Leave room for the aggregated record's partition key (up to 256 bytes).
+        self.aggregate_max_size = min(aggregate_max_size, self.MAX_RECORD_SIZE - 256)
+        self.compression = compression
+        self.compression_level = compression_level
+        try:
+            self.partitioner = get_partitioner(partitioner, self.get_shard_map)
+            self.serializer = get_serializer(serializer)
+        except ValueError as e:
+            raise KinesisWriterError(str(e)) from e
+        self.shard_counts: Counter[str] = Counter()
+        # Counters of the API calls made and of the records and bytes written.
+        self.put_calls = 0
+        self.records_sent = 0
+        self.bytes_sent = 0
+        self.retried_records = 0
+        self._shard_map: ShardMap | None = None
+        self.throttle = (
+            ShardThrottle(
+                self.client,
+                stream_name,
+                shard_records_per_second,
+                shard_bytes_per_second,
+            )
+            if rate_limit
+            else None
+        )
+
+        self.buffered = buffered
+        self.linger_time = linger_time
+        self.failed_records: list[dict] = []
+        self._errors: list[Exception] = []
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        if buffered:
+            self._queue = queue.Queue(maxsize=max_queue_size)
+            self._thread = threading.Thread(
+                target=self._flush_loop, name="kinesis-writer-flush", daemon=True
+            )
+            self._thread.start()
+
+    def get_shard_map(self) -> ShardMap:
+        """Return the hash key ranges of the stream's open shards.
+
+        The map is fetched on first use and again whenever a put is routed to a shard
+        unknown to it, after the stream has been resharded.
+        """
+        if self.throttle is not None:
+            return self.throttle.get_shard_map()
+        if self._shard_map is None:
+            self._shard_map = ShardMap.from_stream(self.client, self.stream_name)
+        return self._shard_map
+
+    def shard_distribution(self) -> dict[str, int]:
+        """Return the number of records successfully written to each shard.
+
+        Shards of the stream that have received no records are included with a
+        count of 0.
+        """
+        distribution = dict.fromkeys(self.get_shard_map().shard_ids, 0)
+        distribution.update(self.shard_counts)
+        return distribution
+
+    @staticmethod
+    def failed_indices(response: dict) -> list[int]:
+        """Return the indices of the items of a put_records send that ultimately failed.
+
+        With aggregation enabled, the items packed into a failed aggregated record
+        all count as failed.
+
+        Args:
+            response (dict): The response of send_to_stream with record_per_entry=True.
+
+        Returns:
+            (list[int]): The indices of the failed items in the data sent, in order.
+        """
+        indices = set()
+        for failed in response.get("FailedRecords", []):
+            indices.update(failed.get("UserRecordIndices", [failed["Index"]]))
+        return sorted(indices)
+
+    def __enter__(self) -> KinesisWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def send_to_stream(
         self,
@@ -57,75 +218,408 @@ class KinesisWriter:
 
         Args:
             data: Data to send to the stream. Can be a single item or a list of items.
-            partition_key (str, optional): Partition key to use. Defaults to random UUID.
+            partition_key (str, optional): Partition key to use for all records. Defaults to a key chosen
+                per record by the partitioner.
             record_per_entry (bool, optional): Flag to determine whether to use put_record or put_records.
                 Defaults to False (use put_record) whereby the contents of data are sent as a single record.
 
         Returns:
-            (dict): The response from the Kinesis API call.
+            (dict): The response from the Kinesis API call. For put_records, the
+                merged response after retries, including the records that ultimately
+                failed under "FailedRecords". In buffered mode, the number of records
+                queued under "QueuedRecordCount".
+
+        Raises:
+            KinesisWriterError: If the data exceeds the Kinesis limits, or the writer is closed.
         """
-        # TODO: retries if response['FailedRecordCount'] > 0?
+        if self.buffered:
+            items = data if record_per_entry else [data]
+            if not isinstance(items, list):
+                raise KinesisWriterError(
+                    "Data must be a list of values when using 'put_records' mode."
+                )
+            return self._enqueue(self._build_records(items, partition_key))
+
         if record_per_entry:
             return self._send_batch_put_records(data, partition_key)
         else:
             return self._send_single_put_record(data, partition_key)
 
+    def flush(self) -> list[dict]:
+        """Send all buffered records and wait until they have been sent.
+
+        Returns:
+            (list[dict]): The records that ultimately failed since the previous flush,
+                in the FailedRecords format of send_to_stream (Index is relative to
+                the internal batch).
+
+        Raises:
+            KinesisWriterError: If a put_records call raised in the background thread.
+        """
+        if self._queue is None:
+            return []
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+
+        failed, self.failed_records = self.failed_records, []
+        errors, self._errors = self._errors, []
+        if errors:
+            raise KinesisWriterError(
+                f"Failed to send buffered records: {errors[0]}"
+            ) from errors[0]
+        return failed
+
+    def close(self) -> None:
+        """Flush the buffered records and stop the background thread."""
+        if self._thread is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _enqueue(self, records: list[dict]) -> dict:
+        """Queue the records for the background thread, blocking while the queue is full."""
+        if self._thread is None:
+            raise KinesisWriterError("Cannot send to a closed KinesisWriter.")
+        for record in records:
+            self._queue.put(record)
+        return {"QueuedRecordCount": len(records)}
+
+    def _flush_loop(self) -> None:
+        """Background thread coalescing queued records into put_records batches."""
+        carry = None
+        while True:
+            item = carry if carry is not None else self._queue.get()
+            carry = None
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            batch = [item]
+            batch_size = len(item["Data"]) + len(item["PartitionKey"].encode())
+            deadline = time.monotonic() + self.linger_time
+            while len(batch) < self.MAX_BATCH_RECORDS:
+                try:
+                    item = self._queue.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    break
+                if item is _FLUSH or item is _STOP:
+                    carry = item
+                    break
+                item_size = len(item["Data"]) + len(item["PartitionKey"].encode())
+                if batch_size + item_size > self.MAX_BATCH_SIZE:
+                    carry = item
+                    break
+                batch.append(item)
+                batch_size += item_size
+
+            try:
+                response = self._put_records(batch)
+                self.failed_records.extend(response["FailedRecords"])
+            except Exception as e:
+                self._errors.append(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
     def _send_batch_put_records(self, data, partition_key: str | None) -> dict:
         """Send a batch of data to the Kinesis stream using put_records.
 
+        The records are packed greedily into as few put_records calls as the
+        per-call limits allow (500 records and 5MiB). Records that fail within a
+        call are resubmitted with jittered exponential backoff until they succeed
+        or the retries or time budget run out, and the responses of the individual
+        calls are merged into one.
+
         Args:
             data: List of data items to send to the stream as a batch.
                 Can be a list of JSON-serializable items, a list of strings, or a list of bytes data.
-            partition_key (str, optional): Partition key to use. Defaults to random UUID.
+            partition_key (str, optional): Partition key to use. Defaults to the partitioner's.
 
         Returns:
-            (dict): The response from the Kinesis put_records API call.
+            (dict): The merged put_records response. Records lists the final result of
+                each record in input order, FailedRecordCount the number of records
+                that ultimately failed and FailedRecords those records, each with its
+                Index, Data, PartitionKey, ErrorCode and ErrorMessage.
 
         Raises:
             KinesisWriterError:
                 If data is not a list.
-                If the number of records or total size exceeds the limits.
+                If any single record exceeds the 1MiB record size limit.
         """
         if not isinstance(data, list):
             raise KinesisWriterError(
                 "Data must be a list of values when using 'put_records' mode."
             )
 
-        # TODO: split into chunks if > 500
-        if len(data) > 500:
-            raise KinesisWriterError(
-                "The number of records exceeds the 500 record limit for put_records."
-            )
+        return self._put_records(self._build_records(data, partition_key))
 
+    def _build_records(self, data: list, partition_key: str | None) -> list[dict]:
+        """Encode the items as put_records entries, checking the record size limit."""
         records = []
-        for item in data:
-            if isinstance(item, bytes):
-                record_data = item
-            elif isinstance(item, str):
-                record_data = item.encode("utf-8")
-            else:
-                record_data = json.dumps(item).encode("utf-8")
-
-            # If partition key is not provided, generate a random one for each
-            # record for equal shard distribution.
-            part_key = partition_key if partition_key is not None else str(uuid.uuid4())
-            records.append({"Data": record_data, "PartitionKey": part_key})
+        for index, item in enumerate(data):
+            record = self._build_record(item, partition_key)
 
-        if (
-            sum(len(rec["Data"]) + len(rec["PartitionKey"]) for rec in records)
-            > 5 * 1024 * 1024
-        ):
-            raise KinesisWriterError(
-                "The total size of records exceeds the 5MiB limit for a single put_records."
+            record_size = len(record["Data"]) + len(
+                record["PartitionKey"].encode("utf-8")
             )
-        return self.client.put_records(StreamName=self.stream_name, Records=records)
+            if record_size > self.MAX_RECORD_SIZE:
+                raise KinesisWriterError(
+                    f"The size of the record at index {index} ({record_size} bytes) exceeds the 1MiB limit for a single record."
+                )
+            records.append(record)
+        return records
+
+    def _build_record(self, item, partition_key: str | None) -> dict:
+        """Encode an item as a put_records entry, keyed by the partitioner if no key is given."""
+        data = self._encode(item)
+        if partition_key is not None:
+            return {"Data": data, "PartitionKey": partition_key}
+
+        partition_key, explicit_hash_key = self.partitioner(item, data)
+        record = {"Data": data, "PartitionKey": partition_key}
+        if explicit_hash_key is not None:
+            record["ExplicitHashKey"] = explicit_hash_key
+        return record
+
+    def _put_records(self, records: list[dict]) -> dict:
+        """Send the records in compliant chunks, with retries, and merge the responses.
+
+        With aggregation enabled, the records are first packed into KPL aggregated
+        records, one group per shard, so the response describes those; each entry of
+        FailedRecords then lists the indices of the records it contains under
+        "UserRecordIndices". Records aggregated with a stale shard map are resent, see
+        _resend_misrouted().
+        """
+        members = None
+        user_records = records
+        if self.aggregate:
+            shard_map = self.get_shard_map()
+            packed = pack_records(records, self.aggregate_max_size, self._shard_of)
+            records = [entry for entry, _ in packed]
+            members = [indices for _, indices in packed]
+        deadline = (
+            time.monotonic() + self.retry_timeout
+            if self.retry_timeout is not None
+            else None
+        )
+        responses = []
+        offset = 0
+        for chunk in self._chunk_records(records):
+            responses.append(self._put_records_chunk(chunk, offset, deadline))
+            offset += len(chunk)
+        merged = self._merge_responses(responses)
+        if members is not None:
+            for failed in merged["FailedRecords"]:
+                failed["UserRecordIndices"] = members[failed["Index"]]
+            if self.get_shard_map() is not shard_map:
+                self._resend_misrouted(user_records, members, merged)
+        return merged
+
+    def _resend_misrouted(
+        self, records: list[dict], members: list[list[int]], response: dict
+    ) -> None:
+        """Resend the user records of aggregated records that landed on the wrong shard.
+
+        Records packed with a stale shard map (the stream was resharded since it was
+        fetched) can be aggregated with records of another shard, which the KCL drops.
+        As the KPL does, those user records are sent again with the refreshed map and
+        the results are appended to the response; consumers that do not filter by
+        hash key range read them twice.
+        """
+        misrouted = [
+            index
+            for result, indices in zip(response["Records"], members)  # noqa: B905
+            if "ShardId" in result
+            for index in indices
+            if self._shard_of(records[index]) != result["ShardId"]
+        ]
+        if not misrouted:
+            return
+        resent = self._put_records([records[index] for index in misrouted])
+        offset = len(response["Records"])
+        for failed in resent["FailedRecords"]:
+            failed["Index"] += offset
+            failed["UserRecordIndices"] = [
+                misrouted[index] for index in failed["UserRecordIndices"]
+            ]
+        response["Records"].extend(resent["Records"])
+        response["FailedRecords"].extend(resent["FailedRecords"])
+        response["FailedRecordCount"] += resent["FailedRecordCount"]
+
+    def _shard_of(self, record: dict) -> str:
+        """Return the id of the shard a put_records entry is routed to."""
+        return self.get_shard_map().shard_for(
+            record["PartitionKey"], record.get("ExplicitHashKey")
+        )
+
+    def _put_records_chunk(
+        self, chunk: list[dict], offset: int, deadline: float | None
+    ) -> dict:
+        """Send a single chunk with put_records, resubmitting only the failed entries.
+
+        Args:
+            chunk (list[dict]): The put_records entries.
+            offset (int): The index of the first entry of the chunk in the whole batch.
+            deadline (float, optional): time.monotonic() after which no more retries are made.
+
+        Returns:
+            (dict): The put_records response for the chunk with the final result of each
+                entry and the entries that ultimately failed under "FailedRecords".
+        """
+        results: list[dict] = [{}] * len(chunk)
+        pending = list(range(len(chunk)))
+        attempt = 0
+        while True:
+            entries = [chunk[i] for i in pending]
+            self._wait_for_throughput(entries)
+            self.put_calls += 1
+            response = self.client.put_records(
+                StreamName=self.stream_name, Records=entries
+            )
+            self._observe_shards(response["Records"])
+
+            failed = []
+            throttled = False
+            for index, result in zip(pending, response["Records"]):  # noqa: B905
+                results[index] = result
+                if "ErrorCode" in result:
+                    failed.append(index)
+                    throttled |= result["ErrorCode"] == self.THROTTLING_ERROR
+            pending = failed
+
+            if not pending or attempt >= self.max_retries:
+                break
+
+            attempt += 1
+            delay = self._backoff_time(attempt, throttled)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                break
+            time.sleep(delay)
+            self.retried_records += len(pending)
+
+        self.shard_counts.update(
+            result["ShardId"] for result in results if "ShardId" in result
+        )
+        failed = set(pending)
+        sent = [chunk[i] for i in range(len(chunk)) if i not in failed]
+        self.records_sent += len(sent)
+        self.bytes_sent += sum(
+            len(r["Data"]) + len(r["PartitionKey"].encode("utf-8")) for r in sent
+        )
+        merged = {**response, "Records": results, "FailedRecordCount": len(pending)}
+        merged["FailedRecords"] = [
+            {
+                "Index": offset + index,
+                **chunk[index],
+                "ErrorCode": results[index]["ErrorCode"],
+                "ErrorMessage": results[index].get("ErrorMessage"),
+            }
+            for index in pending
+        ]
+        return merged
+
+    def _observe_shards(self, results: list[dict]) -> None:
+        """Refresh the shard map if the put results were routed to unknown shards."""
+        if self.throttle is not None:
+            self.throttle.observe(results)
+        elif self._shard_map is not None and any(
+            "ShardId" in result and result["ShardId"] not in self._shard_map
+            for result in results
+        ):
+            self._shard_map = ShardMap.from_stream(self.client, self.stream_name)
+
+    def _wait_for_throughput(self, entries: list[dict]) -> None:
+        """Sleep until the shards the entries map to have throughput for them."""
+        if self.throttle is None:
+            return
+        delay = self.throttle.acquire(entries)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _backoff_time(self, attempt: int, throttled: bool) -> float:
+        """Return the jittered exponential backoff before the given retry attempt.
+
+        Throttled shards are given twice as long to recover, as the per-shard
+        throughput limits are enforced over one-second windows.
+        """
+        exponent = attempt if throttled else attempt - 1
+        backoff = min(self.max_backoff, self.backoff_factor * 2**exponent)
+        return backoff / 2 + random.uniform(0, backoff / 2)  # noqa: S311
+
+    def _chunk_records(self, records: list[dict]) -> Iterator[list[dict]]:
+        """Greedily pack records into chunks within the put_records count and size limits."""
+        chunk: list[dict] = []
+        chunk_size = 0
+        for record in records:
+            record_size = len(record["Data"]) + len(record["PartitionKey"].encode())
+            if chunk and (
+                len(chunk) >= self.MAX_BATCH_RECORDS
+                or chunk_size + record_size > self.MAX_BATCH_SIZE
+            ):
+                yield chunk
+                chunk = []
+                chunk_size = 0
+            chunk.append(record)
+            chunk_size += record_size
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _merge_responses(responses: list[dict]) -> dict:
+        """Merge the responses of several put_records calls into a single response."""
+        merged = {
+            "FailedRecordCount": sum(r.get("FailedRecordCount", 0) for r in responses),
+            "Records": [record for r in responses for record in r["Records"]],
+            "FailedRecords": [
+                record for r in responses for record in r.get("FailedRecords", [])
+            ],
+        }
+        if responses:
+            if "EncryptionType" in responses[0]:
+                merged["EncryptionType"] = responses[0]["EncryptionType"]
+            merged["ResponseMetadata"] = responses[-1].get("ResponseMetadata", {})
+        return merged
+
+    def _encode(self, item) -> bytes:
+        """Encode a single item as record data, compressed if enabled.
+
+        A compressed record is only kept if it is smaller than the plain one, so
+        small records are sent as they are. Records in a format other than JSON
+        are always enveloped, to tag their format.
+        """
+        fmt = "json"
+        if isinstance(item, bytes):
+            data = item
+        elif isinstance(item, str):
+            data = item.encode("utf-8")
+        else:
+            data = self.serializer.dumps(item)
+            fmt = self.serializer.format
+
+        if self.compression is not None:
+            compressed = wrap(data, self.compression, fmt, self.compression_level)
+            if len(compressed) < len(data) or fmt != "json":
+                return compressed
+        if fmt != "json":
+            return wrap(data, fmt=fmt)
+        return data
 
     def _send_single_put_record(self, data, partition_key: str | None) -> dict:
         """Send a single data record to the Kinesis stream using put_record.
 
         Args:
             Data to send to the stream. Can be a JSON-serializable data or bytes data.
-            partition_key (str, optional): Partition key to use. Defaults to random UUID.
+            partition_key (str, optional): Partition key to use. Defaults to the partitioner's.
 
         Returns:
             (dict): The response from the Kinesis put_record API call.
@@ -133,23 +627,23 @@ class KinesisWriter:
         Raises:
             KinesisWriterError: If the data size exceeds the limit.
         """
-        if partition_key is None:
-            partition_key = str(uuid.uuid4())
-
-        if isinstance(data, str):
-            data = data.encode("utf-8")
-        elif isinstance(data, bytes):
-            pass
-        else:
-            data = json.dumps(data).encode("utf-8")
+        record = self._build_record(data, partition_key)
 
-        if len(data) + len(partition_key.encode("utf-8")) > 1024 * 1024:
+        if (
+            len(record["Data"]) + len(record["PartitionKey"].encode("utf-8"))
+            > self.MAX_RECORD_SIZE
+        ):
             raise KinesisWriterError(
                 "The size of the data exceeds the 1MiB limit for a single put_record call."
             )
 
-        return self.client.put_record(
-            StreamName=self.stream_name,
-            Data=data,
-            PartitionKey=partition_key,
+        self._wait_for_throughput([record])
+        self.put_calls += 1
+        response = self.client.put_record(StreamName=self.stream_name, **record)
+        self.records_sent += 1
+        self.bytes_sent += len(record["Data"]) + len(
+            record["PartitionKey"].encode("utf-8")
         )
+        self.shard_counts[response["ShardId"]] += 1
+        self._observe_shards([response])
+        return response
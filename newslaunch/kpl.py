@@ -0,0 +1,323 @@
+"""Kinesis Producer Library (KPL) compatible record aggregation.
+
+An aggregated record packs many user records into the data of a single Kinesis
+record: a 4 byte magic header, the protobuf-encoded AggregatedRecord message and
+the MD5 digest of that message. The message is encoded by hand, following the KPL
+schema:
+
+    message AggregatedRecord {
+        repeated string partition_key_table = 1;
+        repeated string explicit_hash_key_table = 2;
+        repeated Record records = 3;
+    }
+    message Record {
+        required uint64 partition_key_index = 1;
+        optional uint64 explicit_hash_key_index = 2;
+        required bytes data = 3;
+        repeated Tag tags = 4;
+    }
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable, Hashable
+
+KPL_MAGIC = b"\xf3\x89\x9a\xc2"
+DIGEST_SIZE = 16
+# KPL's default AggregationMaxSize.
+DEFAULT_MAX_SIZE = 51200
+
+_VARINT = 0
+_LENGTH_DELIMITED = 2
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _varint_size(value: int) -> int:
+    size = 1
+    while value > 0x7F:
+        value >>= 7
+        size += 1
+    return size
+
+
+def _key(field_number: int, wire_type: int) -> bytes:
+    return _varint((field_number << 3) | wire_type)
+
+
+def _length_delimited(field_number: int, payload: bytes) -> bytes:
+    return _key(field_number, _LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_fields(buf: bytes):
+    """Yield (field_number, value) pairs of a protobuf message."""
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        field_number, wire_type = key >> 3, key & 0x07
+        if wire_type == _VARINT:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == _LENGTH_DELIMITED:
+            length, pos = _read_varint(buf, pos)
+            value = buf[pos : pos + length]
+            if len(value) != length:
+                raise ValueError("Truncated protobuf field.")
+            pos += length
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}.")
+        yield field_number, value
+
+
+class RecordAggregator:
+    """Packs put_records entries into KPL aggregated records of bounded size.
+
+    The aggregated record is routed by the keys of its first entry, so only
+    entries bound for the same shard should be added to one aggregator.
+
+    Args:
+        max_size (int, optional): Maximum size in bytes of an aggregated record's data,
+            including the header and digest. Defaults to 51200, as in the KPL.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._reset()
+
+    def _reset(self) -> None:
+        self._partition_keys: dict[str, int] = {}
+        self._explicit_hash_keys: dict[str, int] = {}
+        self._records: list[tuple[int, int | None, bytes]] = []
+        self._size = len(KPL_MAGIC) + DIGEST_SIZE
+        self._first_entry: dict | None = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _added_size(
+        self, partition_key: str, data: bytes, explicit_hash_key: str | None
+    ) -> int:
+        """Return how much the aggregated record grows when the entry is added."""
+        size = 0
+        pk_index = self._partition_keys.get(partition_key)
+        if pk_index is None:
+            pk_index = len(self._partition_keys)
+            pk_length = len(partition_key.encode("utf-8"))
+            size += 1 + _varint_size(pk_length) + pk_length
+
+        record_size = 1 + _varint_size(pk_index)
+        if explicit_hash_key is not None:
+            ehk_index = self._explicit_hash_keys.get(explicit_hash_key)
+            if ehk_index is None:
+                ehk_index = len(self._explicit_hash_keys)
+                ehk_length = len(explicit_hash_key.encode("utf-8"))
+                size += 1 + _varint_size(ehk_length) + ehk_length
+            record_size += 1 + _varint_size(ehk_index)
+        record_size += 1 + _varint_size(len(data)) + len(data)
+
+        return size + 1 + _varint_size(record_size) + record_size
+
+    def add(self, entry: dict) -> dict | None:
+        """Add a put_records entry ({"Data", "PartitionKey"[, "ExplicitHashKey"]}).
+
+        Returns:
+            (dict | None): The completed aggregated entry if the new entry did not fit
+                and started a new aggregated record, None otherwise.
+        """
+        partition_key = entry["PartitionKey"]
+        explicit_hash_key = entry.get("ExplicitHashKey")
+        data = entry["Data"]
+
+        completed = None
+        added = self._added_size(partition_key, data, explicit_hash_key)
+        if self._records and self._size + added > self.max_size:
+            completed = self.flush()
+            added = self._added_size(partition_key, data, explicit_hash_key)
+
+        if self._first_entry is None:
+            self._first_entry = entry
+        pk_index = self._partition_keys.setdefault(
+            partition_key, len(self._partition_keys)
+        )
+        ehk_index = None
+        if explicit_hash_key is not None:
+            ehk_index = self._explicit_hash_keys.setdefault(
+                explicit_hash_key, len(self._explicit_hash_keys)
+            )
+        self._records.append((pk_index, ehk_index, data))
+        self._size += added
+        return completed
+
+    def flush(self) -> dict | None:
+        """Return the current aggregated entry and start a new one.
+
+        The aggregated entry is routed by the partition key (and explicit hash key)
+        of its first record. Returns None if nothing has been added.
+        """
+        if not self._records:
+            return None
+
+        body = bytearray()
+        for partition_key in self._partition_keys:
+            body += _length_delimited(1, partition_key.encode("utf-8"))
+        for explicit_hash_key in self._explicit_hash_keys:
+            body += _length_delimited(2, explicit_hash_key.encode("utf-8"))
+        for pk_index, ehk_index, data in self._records:
+            record = _key(1, _VARINT) + _varint(pk_index)
+            if ehk_index is not None:
+                record += _key(2, _VARINT) + _varint(ehk_index)
+            record += _length_delimited(3, data)
+            body += _length_delimited(3, record)
+
+        body = bytes(body)
+        aggregated = {
+            "Data": KPL_MAGIC + body + hashlib.md5(body).digest(),  # noqa: S324
+            "PartitionKey": self._first_entry["PartitionKey"],
+        }
+        if "ExplicitHashKey" in self._first_entry:
+            aggregated["ExplicitHashKey"] = self._first_entry["ExplicitHashKey"]
+        self._reset()
+        return aggregated
+
+
+def pack_records(
+    entries: list[dict],
+    max_size: int = DEFAULT_MAX_SIZE,
+    group_key: Callable[[dict], Hashable] | None = None,
+) -> list[tuple[dict, list[int]]]:
+    """Pack put_records entries into aggregated entries, keeping track of their members.
+
+    Only entries of the same group are aggregated together, since an aggregated
+    record is routed as a whole, by the keys of its first entry: the KPL only
+    aggregates records bound for the same shard, and the KCL drops the user
+    records whose hash key falls outside the range of the shard they were read
+    from. Within a group, entries are packed greedily into as few aggregated
+    entries as fit max_size, in order. Entries too large to fit an aggregated
+    record on their own are passed through unaggregated, as the KPL does.
+
+    Args:
+        entries (list[dict]): The put_records entries.
+        max_size (int, optional): Maximum size in bytes of an aggregated record. Defaults to 51200.
+        group_key (Callable[[dict], Hashable], optional): Returns the group of an entry, e.g. the id of
+            the shard it maps to. Defaults to the entry's partition key.
+
+    Returns:
+        (list[tuple[dict, list[int]]]): The entries to send, each with the indices
+            of the input entries it contains.
+    """
+    if group_key is None:
+        group_key = _partition_key
+    empty = RecordAggregator(max_size)
+    aggregators: dict[Hashable, RecordAggregator] = {}
+    members: dict[Hashable, list[int]] = {}
+    packed = []
+    for index, entry in enumerate(entries):
+        standalone_size = empty._size + empty._added_size(
+            entry["PartitionKey"], entry["Data"], entry.get("ExplicitHashKey")
+        )
+        if standalone_size > max_size:
+            packed.append((entry, [index]))
+            continue
+
+        group = group_key(entry)
+        aggregator = aggregators.get(group)
+        if aggregator is None:
+            aggregator = aggregators[group] = RecordAggregator(max_size)
+            members[group] = []
+        completed = aggregator.add(entry)
+        if completed is not None:
+            packed.append((completed, members[group]))
+            members[group] = []
+        members[group].append(index)
+
+    for group, aggregator in aggregators.items():
+        last = aggregator.flush()
+        if last is not None:
+            packed.append((last, members[group]))
+    return packed
+
+
+def aggregate_records(
+    entries: list[dict],
+    max_size: int = DEFAULT_MAX_SIZE,
+    group_key: Callable[[dict], Hashable] | None = None,
+) -> list[dict]:
+    """Pack put_records entries into as few aggregated entries as fit max_size.
+
+    Only entries of the same group (by default, with the same partition key) are
+    aggregated together. See pack_records().
+    """
+    return [entry for entry, _ in pack_records(entries, max_size, group_key)]
+
+
+def _partition_key(entry: dict) -> str:
+    return entry["PartitionKey"]
+
+
+def is_aggregated(data: bytes) -> bool:
+    """Return True if the record data is a valid KPL aggregated record."""
+    if len(data) <= len(KPL_MAGIC) + DIGEST_SIZE or not data.startswith(KPL_MAGIC):
+        return False
+    body = data[len(KPL_MAGIC) : -DIGEST_SIZE]
+    return hashlib.md5(body).digest() == data[-DIGEST_SIZE:]  # noqa: S324
+
+
+def deaggregate(data: bytes, partition_key: str | None = None) -> list[dict]:
+    """Unpack the user records of a KPL aggregated record.
+
+    Data that is not an aggregated record (no magic header or a digest mismatch) is
+    returned as a single record, as the KPL consumer libraries do.
+
+    Args:
+        data (bytes): The Kinesis record data.
+        partition_key (str, optional): The Kinesis record partition key, used for a non-aggregated record.
+
+    Returns:
+        (list[dict]): The user records, each with Data, PartitionKey and ExplicitHashKey (or None).
+    """
+    if not is_aggregated(data):
+        return [{"Data": data, "PartitionKey": partition_key, "ExplicitHashKey": None}]
+
+    partition_keys = []
+    explicit_hash_keys = []
+    raw_records = []
+    for field_number, value in _iter_fields(data[len(KPL_MAGIC) : -DIGEST_SIZE]):
+        if field_number == 1:
+            partition_keys.append(value.decode("utf-8"))
+        elif field_number == 2:
+            explicit_hash_keys.append(value.decode("utf-8"))
+        elif field_number == 3:
+            raw_records.append(dict(_iter_fields(value)))
+
+    records = []
+    for record in raw_records:
+        ehk_index = record.get(2)
+        records.append(
+            {
+                "Data": bytes(record[3]),
+                "PartitionKey": partition_keys[record[1]],
+                "ExplicitHashKey": (
+                    explicit_hash_keys[ehk_index] if ehk_index is not None else None
+                ),
+            }
+        )
+    return records
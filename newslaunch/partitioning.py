@@ -0,0 +1,114 @@
+"""Partitioning strategies assigning Kinesis partition keys to records."""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import threading
+import uuid
+from collections.abc import Callable
+
+from newslaunch.shards import ShardMap
+
+# Kinesis partition keys are at most 256 characters.
+MAX_PARTITION_KEY_LENGTH = 256
+
+
+class Partitioner:
+    """Base class of the partitioning strategies.
+
+    A partitioner returns the PartitionKey of a record and, optionally, an
+    ExplicitHashKey that overrides the hash of the partition key to pick the shard.
+    """
+
+    def __call__(self, item, data: bytes) -> tuple[str, str | None]:
+        """Return the (PartitionKey, ExplicitHashKey or None) of a record.
+
+        Args:
+            item: The item sent to the stream.
+            data (bytes): The encoded record data.
+        """
+        raise NotImplementedError
+
+
+class RandomPartitioner(Partitioner):
+    """Assigns a random UUID partition key to each record."""
+
+    def __call__(self, item, data: bytes) -> tuple[str, None]:
+        return str(uuid.uuid4()), None
+
+
+class ArticleIdPartitioner(Partitioner):
+    """Uses the Guardian article id as partition key.
+
+    The same article always lands on the same shard, so its updates are consumed in
+    order. Articles without an id (filtered previews) are keyed by their webUrl, and
+    other items by a hash of the record data.
+    """
+
+    def __call__(self, item, data: bytes) -> tuple[str, None]:
+        key = None
+        if isinstance(item, dict):
+            key = item.get("id") or item.get("webUrl")
+        if not key or len(key) > MAX_PARTITION_KEY_LENGTH:
+            source = key.encode("utf-8") if key else data
+            key = hashlib.sha256(source).hexdigest()
+        return key, None
+
+
+class RoundRobinPartitioner(Partitioner):
+    """Spreads records evenly across the open shards with explicit hash keys.
+
+    Args:
+        shard_map (Callable[[], ShardMap]): Returns the current shard map of the stream.
+    """
+
+    def __init__(self, shard_map: Callable[[], ShardMap]):
+        self.shard_map = shard_map
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __call__(self, item, data: bytes) -> tuple[str, str]:
+        ranges = self.shard_map().ranges
+        with self._lock:
+            start, _, shard_id = ranges[next(self._counter) % len(ranges)]
+        return shard_id, str(start)
+
+
+class CallablePartitioner(Partitioner):
+    """Wraps a function returning the partition key of an item."""
+
+    def __init__(self, func: Callable[[object], str]):
+        self.func = func
+
+    def __call__(self, item, data: bytes) -> tuple[str, None]:
+        return self.func(item), None
+
+
+PARTITIONERS = {
+    "random": RandomPartitioner,
+    "article_id": ArticleIdPartitioner,
+    "round_robin": RoundRobinPartitioner,
+}
+
+
+def get_partitioner(
+    strategy: str | Callable | Partitioner, shard_map: Callable[[], ShardMap]
+) -> Partitioner:
+    """Return the partitioner for a strategy name, function or Partitioner instance.
+
+    Raises:
+        ValueError: If the strategy name is unknown.
+    """
+    if isinstance(strategy, Partitioner):
+        return strategy
+    if callable(strategy):
+        return CallablePartitioner(strategy)
+    if strategy not in PARTITIONERS:
+        raise ValueError(
+            f"Unknown partitioning strategy '{strategy}'. "
+            f"Must be one of {', '.join(PARTITIONERS)} or a callable."
+        )
+    if strategy == "round_robin":
+        return RoundRobinPartitioner(shard_map)
+    return PARTITIONERS[strategy]()
@@ -0,0 +1,172 @@
+"""Fetch-and-publish pipeline streaming Guardian search results into Kinesis."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+
+from newslaunch.guardian_api import GuardianAPI
+from newslaunch.kinesis_writer import KinesisWriter
+
+# Marks the end of the fetched batches.
+_DONE = object()
+
+
+class PublishPipeline:
+    """Streams the articles of a search into a Kinesis stream.
+
+    A background thread walks the result pages and queues batches of articles,
+    while the calling thread publishes them with put_records, so fetching the next
+    page overlaps with publishing the current batch. The queue holds at most
+    `queue_size` batches: when publishing falls behind, fetching waits.
+
+    Args:
+        guardian_api (GuardianAPI): The client used to fetch the articles.
+        writer (KinesisWriter): The writer used to publish the articles.
+        batch_size (int, optional): Number of articles per put_records call. Defaults to 200.
+        queue_size (int, optional): Maximum number of fetched batches waiting to be published. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        guardian_api: GuardianAPI,
+        writer: KinesisWriter,
+        batch_size: int = 200,
+        queue_size: int = 4,
+    ):
+        if batch_size < 1 or queue_size < 1:
+            raise ValueError("Batch_size and queue_size must be positive integers.")
+        self.guardian_api = guardian_api
+        self.writer = writer
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.articles = 0
+        self.failed = 0
+        self._started_at: float | None = None
+        # The client and writer counters at the start of the run, as they can be
+        # shared with other runs and callers.
+        self._counters_at_start: dict | None = None
+
+    def _counters(self) -> dict:
+        """Return the lifetime counters of the client and writer."""
+        return {
+            "bytes": self.writer.bytes_sent,
+            "api_calls": self.guardian_api.requests,
+            "api_retries": self.guardian_api.retries,
+            "put_calls": self.writer.put_calls,
+            "put_retries": self.writer.retried_records,
+        }
+
+    def stats(self) -> dict:
+        """Return the throughput and counters of the current or last run."""
+        elapsed = (
+            time.monotonic() - self._started_at if self._started_at is not None else 0
+        )
+        rate = 1 / elapsed if elapsed > 0 else 0
+        at_start = self._counters_at_start or {}
+        counters = {
+            name: value - at_start.get(name, 0)
+            for name, value in self._counters().items()
+        }
+        return {
+            "articles": self.articles,
+            "failed": self.failed,
+            "bytes": counters["bytes"],
+            "elapsed": round(elapsed, 3),
+            "articles_per_second": round(self.articles * rate, 1),
+            "bytes_per_second": round(counters["bytes"] * rate, 1),
+            "api_calls": counters["api_calls"],
+            "api_retries": counters["api_retries"],
+            "put_calls": counters["put_calls"],
+            "put_retries": counters["put_retries"],
+        }
+
+    def run(
+        self,
+        search_term: str,
+        partition_key: str | None = None,
+        progress: Callable[[dict], None] | None = None,
+        progress_interval: float = 1.0,
+        **search_params,
+    ) -> dict:
+        """Fetch the articles of the search and publish them.
+
+        Args:
+            search_term (str): The search query for articles.
+            partition_key (str, optional): Partition key for all records. Defaults to the writer's partitioner.
+            progress (Callable[[dict], None], optional): Called with the current stats at most every `progress_interval` seconds.
+            progress_interval (float, optional): Minimum time in seconds between progress calls. Defaults to 1.
+            **search_params: Parameters of GuardianAPI.iter_articles, e.g. page_size or max_results.
+
+        Returns:
+            (dict): The final stats. "failed" counts the articles that could not be
+                published after the writer's retries.
+
+        Raises:
+            GuardianAPIError: If fetching the articles fails.
+            KinesisWriterError: If publishing a batch fails.
+        """
+        batches: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: list[Exception] = []
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch() -> None:
+            try:
+                batch = []
+                for article in self.guardian_api.iter_articles(
+                    search_term, **search_params
+                ):
+                    batch.append(article)
+                    if len(batch) >= self.batch_size:
+                        if not put(batch):
+                            return
+                        batch = []
+                if batch:
+                    put(batch)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(_DONE)
+
+        self.articles = 0
+        self.failed = 0
+        self._counters_at_start = self._counters()
+        self._started_at = time.monotonic()
+        last_progress = self._started_at
+        fetcher = threading.Thread(target=fetch, name="publish-fetch", daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is _DONE:
+                    break
+                response = self.writer.send_to_stream(
+                    batch, partition_key=partition_key, record_per_entry=True
+                )
+                # Counted per article, also when the writer aggregates records.
+                failed = len(KinesisWriter.failed_indices(response))
+                self.articles += len(batch) - failed
+                self.failed += failed
+
+                now = time.monotonic()
+                if progress is not None and now - last_progress >= progress_interval:
+                    progress(self.stats())
+                    last_progress = now
+        finally:
+            stop.set()
+            fetcher.join()
+
+        if errors:
+            raise errors[0]
+        return self.stats()
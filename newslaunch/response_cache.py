@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class ResponseCache:
+    """SQLite-backed on-disk cache of raw Guardian API /search responses.
+
+    Entries are keyed by the normalized request parameters (excluding the API key),
+    expire after `ttl` seconds and are evicted least-recently-used first once the
+    total size of the cached responses exceeds `max_bytes`. The cache is safe to
+    share between threads, e.g. when prefetching pages concurrently.
+
+    Args:
+        path (str | Path): Path of the SQLite database file. Parent directories are created if needed.
+        ttl (int, optional): Time-to-live of a cache entry in seconds. Defaults to 3600.
+        max_bytes (int, optional): Maximum total size of the cached responses in bytes. Defaults to 100 MiB.
+    """
+
+    IGNORED_PARAMS = frozenset({"api-key"})
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: int = 3600,
+        max_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def __enter__(self) -> ResponseCache:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def make_key(cls, params: dict) -> str:
+        """Return a stable cache key for a set of request parameters."""
+        normalized = {
+            k: v
+            for k, v in params.items()
+            if k not in cls.IGNORED_PARAMS and v is not None
+        }
+        payload = json.dumps(normalized, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, params: dict) -> dict | None:
+        """Return the cached response for the request parameters, or None on a miss."""
+        key = self.make_key(params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, params: dict, response: dict) -> None:
+        """Store the response for the request parameters, evicting LRU entries if
+        the cache grows beyond max_bytes."""
+        key = self.make_key(params)
+        data = json.dumps(response)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode("utf-8")), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached responses and reset the hit/miss counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters and the number and total size of entries."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "size": size,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        """Delete expired entries, then least recently used ones until the total
+        size fits max_bytes."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+        )
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
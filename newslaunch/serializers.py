@@ -0,0 +1,115 @@
+"""Record serializers: stdlib json, orjson and msgpack.
+
+orjson and msgpack are optional. The default "auto" serializer uses orjson when it
+is installed and the standard library json otherwise; both produce JSON, so the
+records stay readable by any consumer. msgpack produces a different wire format
+and is only used when requested, with records tagged in the payload envelope.
+"""
+
+from __future__ import annotations
+
+import json
+
+from newslaunch.envelope import unwrap
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+class Serializer:
+    """Base class of the serializers.
+
+    Attributes:
+        name (str): The name of the serializer.
+        format (str): The wire format written to the payload envelope ("json" or "msgpack").
+    """
+
+    name = ""
+    format = "json"
+
+    def dumps(self, obj) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes):
+        raise NotImplementedError
+
+
+class JsonSerializer(Serializer):
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    name = "orjson"
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    name = "msgpack"
+    format = "msgpack"
+
+    def dumps(self, obj) -> bytes:
+        return msgpack.packb(obj)
+
+    def loads(self, data: bytes):
+        return msgpack.unpackb(data)
+
+
+_AVAILABLE = {
+    "json": lambda: True,
+    "orjson": lambda: orjson is not None,
+    "msgpack": lambda: msgpack is not None,
+}
+_SERIALIZERS = {
+    "json": JsonSerializer,
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str | Serializer = "auto") -> Serializer:
+    """Return a serializer by name: "auto", "json", "orjson" or "msgpack".
+
+    Raises:
+        ValueError: If the serializer is unknown or its library is not installed.
+    """
+    if isinstance(name, Serializer):
+        return name
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name not in _SERIALIZERS:
+        raise ValueError(
+            f"Unknown serializer '{name}'. Must be one of auto, {', '.join(_SERIALIZERS)}."
+        )
+    if not _AVAILABLE[name]():
+        raise ValueError(f"Serializer '{name}' requires the {name} package.")
+    return _SERIALIZERS[name]()
+
+
+def deserialize(data: bytes):
+    """Decode record data written by KinesisWriter, enveloped or not.
+
+    Raises:
+        ValueError: If the record uses a format whose library is not installed.
+    """
+    payload, fmt = unwrap(data)
+    if fmt == "msgpack":
+        return get_serializer("msgpack").loads(payload)
+    return get_serializer("auto").loads(payload)
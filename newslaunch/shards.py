@@ -0,0 +1,183 @@
+"""Kinesis shard hash ranges and client-side per-shard rate limiting."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import threading
+import time
+
+
+def hash_key(partition_key: str) -> int:
+    """Return the 128-bit hash key Kinesis maps a partition key to."""
+    return int.from_bytes(
+        hashlib.md5(partition_key.encode("utf-8")).digest(),  # noqa: S324
+        "big",
+    )
+
+
+class ShardMap:
+    """The hash key ranges of the open shards of a stream.
+
+    Args:
+        shards (list[dict]): The shards, as returned by the Kinesis ListShards API.
+            Closed shards (with an EndingSequenceNumber) are ignored.
+    """
+
+    def __init__(self, shards: list[dict]):
+        open_shards = sorted(
+            (
+                int(shard["HashKeyRange"]["StartingHashKey"]),
+                int(shard["HashKeyRange"]["EndingHashKey"]),
+                shard["ShardId"],
+            )
+            for shard in shards
+            if "EndingSequenceNumber" not in shard["SequenceNumberRange"]
+        )
+        self._starts = [start for start, _, _ in open_shards]
+        self.ranges = open_shards
+        self.shard_ids = [shard_id for _, _, shard_id in open_shards]
+
+    @classmethod
+    def from_stream(cls, client, stream_name: str) -> ShardMap:
+        """Fetch the shards of the stream with ListShards."""
+        shards = []
+        response = client.list_shards(StreamName=stream_name)
+        shards.extend(response["Shards"])
+        while response.get("NextToken"):
+            response = client.list_shards(NextToken=response["NextToken"])
+            shards.extend(response["Shards"])
+        return cls(shards)
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def __contains__(self, shard_id: str) -> bool:
+        return shard_id in self.shard_ids
+
+    def shard_for(
+        self, partition_key: str, explicit_hash_key: str | None = None
+    ) -> str:
+        """Return the id of the shard a record is routed to."""
+        key = (
+            int(explicit_hash_key)
+            if explicit_hash_key is not None
+            else hash_key(partition_key)
+        )
+        index = bisect.bisect_right(self._starts, key) - 1
+        return self.ranges[max(index, 0)][2]
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity`.
+
+    Tokens are reserved rather than waited for: reserve() always succeeds, letting
+    the bucket go into debt, and returns how long the caller must wait for the
+    debt to be repaid.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float | None = None) -> float:
+        """Take `amount` tokens and return the wait in seconds before using them."""
+        now = time.monotonic() if now is None else now
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = max(now, self.updated)
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+
+class ShardThrottle:
+    """Paces writes to each shard of a stream below the per-shard write limits.
+
+    Records are mapped to shards with the stream's ShardMap, fetched on first use
+    and again whenever a shard unknown to the map shows up in a response (after the
+    stream has been resharded).
+
+    Args:
+        client: The boto3 Kinesis client.
+        stream_name (str): The name of the Kinesis stream.
+        records_per_second (float, optional): Records per second per shard. Defaults to 1000.
+        bytes_per_second (float, optional): Bytes per second per shard. Defaults to 1MiB.
+    """
+
+    def __init__(
+        self,
+        client,
+        stream_name: str,
+        records_per_second: float = 1000,
+        bytes_per_second: float = 1024 * 1024,
+    ):
+        self.client = client
+        self.stream_name = stream_name
+        self.records_per_second = records_per_second
+        self.bytes_per_second = bytes_per_second
+        self.shard_map: ShardMap | None = None
+        self._buckets: dict[str, tuple[TokenBucket, TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Fetch the shard map again, keeping the buckets of the remaining shards."""
+        shard_map = ShardMap.from_stream(self.client, self.stream_name)
+        with self._lock:
+            self.shard_map = shard_map
+            self._buckets = {
+                shard_id: buckets
+                for shard_id, buckets in self._buckets.items()
+                if shard_id in shard_map
+            }
+
+    def get_shard_map(self) -> ShardMap:
+        """Return the shard map, fetching it on first use."""
+        if self.shard_map is None:
+            self.refresh()
+        return self.shard_map
+
+    def acquire(self, records: list[dict]) -> float:
+        """Reserve throughput for the records and return how long to wait before sending them.
+
+        Args:
+            records (list[dict]): put_records entries ({"Data", "PartitionKey"[, "ExplicitHashKey"]}).
+        """
+        shard_map = self.get_shard_map()
+        usage: dict[str, list[int]] = {}
+        for record in records:
+            shard_id = shard_map.shard_for(
+                record["PartitionKey"], record.get("ExplicitHashKey")
+            )
+            size = len(record["Data"]) + len(record["PartitionKey"].encode("utf-8"))
+            shard_usage = usage.setdefault(shard_id, [0, 0])
+            shard_usage[0] += 1
+            shard_usage[1] += size
+
+        wait = 0.0
+        now = time.monotonic()
+        with self._lock:
+            for shard_id, (count, size) in usage.items():
+                buckets = self._buckets.get(shard_id)
+                if buckets is None:
+                    buckets = (
+                        TokenBucket(self.records_per_second),
+                        TokenBucket(self.bytes_per_second),
+                    )
+                    self._buckets[shard_id] = buckets
+                wait = max(
+                    wait, buckets[0].reserve(count, now), buckets[1].reserve(size, now)
+                )
+        return wait
+
+    def observe(self, results: list[dict]) -> None:
+        """Refresh the shard map if the put results were routed to unknown shards."""
+        shard_map = self.shard_map
+        if shard_map is None:
+            return
+        if any(
+            "ShardId" in result and result["ShardId"] not in shard_map
+            for result in results
+        ):
+            self.refresh()
@@ -0,0 +1,208 @@
+"""Rolling file sink landing consumed articles as JSONL.gz or Parquet files."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import os
+import posixpath
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - depends on the environment
+    pyarrow = None
+
+
+class LocalFileSystem:
+    """Minimal filesystem interface used by FileSink, backed by the local disk.
+
+    Any object with the same `makedirs` and `open` methods can be used instead,
+    e.g. an fsspec filesystem writing to an object store.
+    """
+
+    def makedirs(self, path: str, exist_ok: bool = False) -> None:
+        os.makedirs(path, exist_ok=exist_ok)
+
+    def open(self, path: str, mode: str = "rb"):
+        return open(path, mode)
+
+
+class MemoryFileSystem:
+    """In-memory filesystem stand-in, e.g. for tests. Files are kept in `files`."""
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def makedirs(self, path: str, exist_ok: bool = False) -> None:
+        pass
+
+    def open(self, path: str, mode: str = "rb"):
+        if "w" in mode:
+            return _MemoryFile(self.files, path)
+        return io.BytesIO(self.files[path])
+
+
+class _MemoryFile(io.BytesIO):
+    def __init__(self, files: dict[str, bytes], path: str):
+        super().__init__()
+        self._files = files
+        self._path = path
+
+    def close(self) -> None:
+        if not self.closed:
+            self._files[self._path] = self.getvalue()
+        super().close()
+
+
+class FileSink:
+    """Buffers articles and writes them to rolling files, one file per rotation.
+
+    Files are written whole when they rotate, which happens once the buffered
+    articles reach `max_bytes` (of uncompressed JSON) or `max_records`, or the
+    oldest buffered article is older than `max_age` seconds. Time-based rotation
+    is checked on every write and by rotate_if_due(). Files are named after the
+    prefix, the UTC time the file was started, the sink's instance id and a
+    sequence number: `{path}/{prefix}-20240101T120000Z-{instance_id}-000000.jsonl.gz`.
+    The instance id is random by default, so that concurrent or restarted sinks
+    sharing a prefix do not overwrite each other's files. With an instance id and
+    clock derived from the input instead, the names are deterministic, e.g. so that
+    a retried batch overwrites its own file.
+
+    Buffered articles are only durable once their file is written: a consumer
+    that acknowledges the records it read must call rotate() first.
+
+    Args:
+        path (str): The directory the files are written to.
+        file_format (str, optional): "jsonl.gz" or "parquet" (requires pyarrow). Defaults to "jsonl.gz".
+        prefix (str, optional): The file name prefix. Defaults to "articles".
+        max_bytes (int, optional): Uncompressed size at which a file is rotated. Defaults to 64MiB.
+        max_records (int, optional): Number of articles at which a file is rotated. Defaults to None.
+        max_age (float, optional): Age in seconds of the oldest buffered article at which a file is rotated. Defaults to 300.
+        filesystem (optional): The filesystem written to. Defaults to LocalFileSystem().
+        clock (Callable[[], float], optional): Returns the current time as a timestamp. Defaults to time.time.
+        instance_id (str, optional): Identifies the sink in the file names. Defaults to a random id.
+
+    Raises:
+        ValueError: If the file format is unknown, or Parquet is requested without pyarrow.
+    """
+
+    FORMATS = ("jsonl.gz", "parquet")
+
+    def __init__(
+        self,
+        path: str,
+        file_format: str = "jsonl.gz",
+        prefix: str = "articles",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_records: int | None = None,
+        max_age: float = 300,
+        filesystem=None,
+        clock: Callable[[], float] = time.time,
+        instance_id: str | None = None,
+    ):
+        if file_format not in self.FORMATS:
+            raise ValueError(
+                f"Unknown file format '{file_format}'. Must be one of {', '.join(self.FORMATS)}."
+            )
+        if file_format == "parquet" and pyarrow is None:
+            raise ValueError("The parquet file format requires the pyarrow package.")
+
+        self.path = path
+        self.file_format = file_format
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.max_age = max_age
+        self.filesystem = filesystem if filesystem is not None else LocalFileSystem()
+        self.clock = clock
+        self.instance_id = instance_id or uuid.uuid4().hex[:12]
+        self.files_written: list[str] = []
+
+        self._sequence = 0
+        self._records: list[dict] = []
+        self._lines: list[bytes] = []
+        self._size = 0
+        self._started_at: float | None = None
+        self.filesystem.makedirs(path, exist_ok=True)
+
+    def __enter__(self) -> FileSink:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, articles: list[dict]) -> list[str]:
+        """Buffer the articles, rotating files as needed.
+
+        Returns:
+            (list[str]): The paths of the files written by this call.
+        """
+        written = self.rotate_if_due()
+        for article in articles:
+            if self._started_at is None:
+                self._started_at = self.clock()
+            line = json.dumps(article, ensure_ascii=False).encode("utf-8") + b"\n"
+            self._lines.append(line)
+            if self.file_format == "parquet":
+                self._records.append(article)
+            self._size += len(line)
+
+            if self._size >= self.max_bytes or (
+                self.max_records is not None and len(self._lines) >= self.max_records
+            ):
+                written.append(self.rotate())
+        return written
+
+    def rotate_if_due(self) -> list[str]:
+        """Rotate the current file if its oldest article is older than max_age.
+
+        Returns:
+            (list[str]): The path of the file written, if any.
+        """
+        if (
+            self._started_at is not None
+            and self.clock() - self._started_at >= self.max_age
+        ):
+            return [self.rotate()]
+        return []
+
+    def rotate(self) -> str | None:
+        """Write the buffered articles to a new file and start the next one.
+
+        Returns:
+            (str | None): The path of the file written, or None if nothing was buffered.
+        """
+        if not self._lines:
+            return None
+
+        utc = timezone.utc  # noqa: UP017 - datetime.UTC needs Python 3.11
+        started_at = datetime.fromtimestamp(self._started_at, tz=utc)
+        file_name = (
+            f"{self.prefix}-{started_at:%Y%m%dT%H%M%SZ}-{self.instance_id}"
+            f"-{self._sequence:06d}.{self.file_format}"
+        )
+        file_path = posixpath.join(self.path, file_name)
+        with self.filesystem.open(file_path, "wb") as file:
+            if self.file_format == "parquet":
+                table = pyarrow.Table.from_pylist(self._records)
+                pyarrow.parquet.write_table(table, file)
+            else:
+                file.write(gzip.compress(b"".join(self._lines), mtime=0))
+
+        self.files_written.append(file_path)
+        self._sequence += 1
+        self._records = []
+        self._lines = []
+        self._size = 0
+        self._started_at = None
+        return file_path
+
+    def close(self) -> str | None:
+        """Write the buffered articles, if any."""
+        return self.rotate()
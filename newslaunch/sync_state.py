@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+class SyncState:
+    """Per-query publication-date watermarks persisted in a local JSON file.
+
+    Used by GuardianAPI.sync_articles to fetch only articles newer than the last
+    one seen for the same query. Changes are held in memory until save(), which
+    replaces the state file atomically so an interrupted run never leaves a
+    partially written or advanced state behind.
+
+    Args:
+        path (str | Path): Path of the JSON state file. Created on first save.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if self.path.exists():
+            with open(self.path) as file:
+                self.watermarks: dict[str, str] = json.load(file)
+        else:
+            self.watermarks = {}
+
+    @staticmethod
+    def make_key(search_term: str, **params) -> str:
+        """Return the state key for a query and any parameters that change its results."""
+        extra = ",".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
+        return f"{search_term}|{extra}" if extra else search_term
+
+    def get_watermark(self, key: str) -> str | None:
+        """Return the newest webPublicationDate seen for the query, if any."""
+        return self.watermarks.get(key)
+
+    def set_watermark(self, key: str, publication_date: str) -> None:
+        """Advance the watermark of the query. Older dates are ignored."""
+        current = self.watermarks.get(key)
+        if current is None or publication_date > current:
+            self.watermarks[key] = publication_date
+
+    def save(self) -> None:
+        """Atomically write the watermarks to the state file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(self.watermarks, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
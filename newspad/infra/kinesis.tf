@@ -21,7 +21,8 @@ resource "aws_iam_policy" "kinesis_write_policy" {
       {
         Action = [
           "kinesis:PutRecord",
-          "kinesis:PutRecords"
+          "kinesis:PutRecords",
+          "kinesis:ListShards"
         ]
         Effect   = "Allow"
         Resource = aws_kinesis_stream.guardian_stream.arn
@@ -68,4 +69,45 @@ resource "aws_lambda_event_source_mapping" "kinesis_consumer_lambda_mapping" {
   event_source_arn  = aws_kinesis_stream.guardian_stream.arn
   function_name     = aws_lambda_function.consumer_lambda.arn
   starting_position = "LATEST"
+  # Retry only the records reported in batchItemFailures.
+  function_response_types = ["ReportBatchItemFailures"]
+  # Bound the retries, so a record that can never be processed (e.g. undecodable)
+  # does not block its shard until it expires. Failing batches are split in two
+  # to isolate the failing records, which are then sent to the failure queue.
+  maximum_retry_attempts         = 3
+  bisect_batch_on_function_error = true
+
+  destination_config {
+    on_failure {
+      destination_arn = aws_sqs_queue.consumer_failures.arn
+    }
+  }
+}
+
+# Receives the metadata (shard, sequence number range) of the records the consumer
+# failed to process, to inspect and replay them from the stream.
+resource "aws_sqs_queue" "consumer_failures" {
+  name                      = "guardian_consumer_failures"
+  message_retention_seconds = 1209600
+}
+
+resource "aws_iam_policy" "consumer_failures_policy" {
+  name = "consumer_lambda_failures_policy"
+  policy = jsonencode({
+    "Version" : "2012-10-17",
+    "Statement" : [
+      {
+        "Effect" : "Allow",
+        "Action" : [
+          "sqs:SendMessage",
+        ],
+        "Resource" : aws_sqs_queue.consumer_failures.arn
+      }
+    ]
+  })
+}
+
+resource "aws_iam_role_policy_attachment" "consumer_lambda_failures_policy_attachment" {
+  role       = aws_iam_role.role_for_consumer_lambda.name
+  policy_arn = aws_iam_policy.consumer_failures_policy.arn
 }
@@ -1,24 +1,201 @@
 import base64
+import gzip
+import hashlib
+import importlib
 import json
 import logging
+import os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 log = logging.getLogger(__name__)
-log.setLevel(logging.INFO)
+# Set LOG_LEVEL=DEBUG to log every article, INFO logs one summary line per batch.
+log.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+# The consumer is deployed without the newslaunch layer, so the KPL de-aggregation
+# of newslaunch.kpl and the payload envelope of newslaunch.envelope are reproduced here.
+ENVELOPE_MAGIC = b"NLE"
+ENVELOPE_NONE = 0
+ENVELOPE_GZIP = 1
+ENVELOPE_ZSTD = 2
+ENVELOPE_JSON = 0
+ENVELOPE_MSGPACK = 1
+
+KPL_MAGIC = b"\xf3\x89\x9a\xc2"
+KPL_DIGEST_SIZE = 16
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple:
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_fields(buf: bytes):
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        field_number, wire_type = key >> 3, key & 0x07
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            value = buf[pos : pos + length]
+            pos += length
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}.")
+        yield field_number, value
+
+
+def deaggregate(data: bytes) -> list:
+    """Return the user records of a KPL aggregated record, or [data] if the record
+    is not aggregated."""
+    if (
+        len(data) <= len(KPL_MAGIC) + KPL_DIGEST_SIZE
+        or not data.startswith(KPL_MAGIC)
+        or hashlib.md5(data[4:-KPL_DIGEST_SIZE]).digest()  # noqa: S324
+        != data[-KPL_DIGEST_SIZE:]
+    ):
+        return [data]
+
+    records = []
+    for field_number, value in _iter_fields(data[4:-KPL_DIGEST_SIZE]):
+        if field_number == 3:
+            records.append(bytes(dict(_iter_fields(value))[3]))
+    return records
+
+
+def open_envelope(payload: bytes) -> tuple:
+    """Return the decompressed data of a payload and its format (ENVELOPE_JSON for
+    payloads without an envelope)."""
+    if len(payload) < 5 or not payload.startswith(ENVELOPE_MAGIC):
+        return payload, ENVELOPE_JSON
+
+    version, codec = payload[3], payload[4]
+    if version == 1:
+        fmt, body = ENVELOPE_JSON, payload[5:]
+    elif version == 2 and len(payload) >= 6:
+        fmt, body = payload[5], payload[6:]
+    else:
+        raise ValueError(f"Unsupported envelope version {version}.")
 
+    if codec == ENVELOPE_GZIP:
+        body = gzip.decompress(body)
+    elif codec == ENVELOPE_ZSTD and zstandard is not None:
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif codec != ENVELOPE_NONE:
+        raise ValueError(f"Unsupported envelope codec {codec}.")
+    return body, fmt
 
-def process_article(record: bytes) -> dict:
-    article_data = base64.b64decode(record).decode("utf-8")
-    return json.loads(article_data)
 
+def process_article(payload: bytes) -> dict:
+    data, fmt = open_envelope(payload)
+    if fmt == ENVELOPE_MSGPACK and msgpack is not None:
+        return msgpack.unpackb(data)
+    if fmt != ENVELOPE_JSON:
+        raise ValueError(f"Unsupported envelope format {fmt}.")
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
-def lambda_handler(event: dict, context) -> None:
-    log.info("Processing new batch of articles.")
 
-    for record in event["Records"]:
+def decode_batch(records: list) -> tuple:
+    """Decode the Kinesis records of a batch.
+
+    Returns:
+        (tuple): The decoded articles as (sequence number, article) pairs, and the
+            sequence numbers of the records that could not be decoded. The user
+            records of an aggregated record share its sequence number.
+    """
+    articles = []
+    failed = []
+    for record in records:
+        sequence_number = record["kinesis"]["sequenceNumber"]
         try:
-            article = process_article(record["kinesis"]["data"])
-            log.info(f"Article processed: {article}")
-        except Exception as e:
-            log.error(f"Error processing article: {record}. Exception: {e}")
-            # raise to retry?
-    log.info("Processing complete.")
+            data = base64.b64decode(record["kinesis"]["data"])
+            decoded = [process_article(payload) for payload in deaggregate(data)]
+        except Exception:
+            log.exception("Failed to decode record %s.", sequence_number)
+            failed.append(sequence_number)
+            continue
+        articles.extend((sequence_number, article) for article in decoded)
+    return articles, failed
+
+
+def log_articles(articles: list) -> list:
+    """Default article handler: log the articles at DEBUG level.
+
+    A handler takes the (sequence number, article) pairs of a batch and returns the
+    sequence numbers of the records it failed to process.
+    """
+    if log.isEnabledFor(logging.DEBUG):
+        for sequence_number, article in articles:
+            log.debug("Article processed (%s): %s", sequence_number, article)
+    return []
+
+
+_handler = None
+
+
+def get_handler():
+    """Return the article handler named by ARTICLE_HANDLER ("module:function"),
+    or log_articles."""
+    global _handler
+    if _handler is None:
+        handler_path = os.getenv("ARTICLE_HANDLER")
+        if handler_path:
+            module_name, _, function_name = handler_path.partition(":")
+            _handler = getattr(importlib.import_module(module_name), function_name)
+        else:
+            _handler = log_articles
+    return _handler
+
+
+def process_batch(event: dict, handler) -> dict:
+    """Decode a Kinesis batch, pass the articles to the handler and report the
+    records that failed, so that Lambda retries only those.
+
+    If the handler raises, every record of the batch is reported as failed.
+    """
+    records = event["Records"]
+    articles, failed = decode_batch(records)
+    if articles:
+        try:
+            failed.extend(handler(articles) or [])
+        except Exception:
+            log.exception("Failed to process a batch of %d articles.", len(articles))
+            failed.extend(sequence_number for sequence_number, _ in articles)
+
+    failed = list(dict.fromkeys(failed))
+    log.info(
+        "Processed %d records (%d articles), %d failed.",
+        len(records),
+        len(articles),
+        len(failed),
+    )
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": sequence_number} for sequence_number in failed
+        ]
+    }
+
+
+def lambda_handler(event: dict, context) -> dict:
+    return process_batch(event, get_handler())
@@ -1,13 +1,103 @@
 import json
 import logging
+import os
 
 from botocore.exceptions import ClientError
 
-from newslaunch import GuardianAPI, GuardianAPIError, KinesisWriter, KinesisWriterError
+from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+from newslaunch.kinesis_writer import KinesisWriter, KinesisWriterError
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
 
+# Clients are created lazily and kept at module level, so warm invocations reuse
+# the Guardian HTTP session (and its open connections) and the boto3 session and
+# Kinesis client instead of paying for their setup every time.
+_guardian_api = None
+_kinesis_writers: dict = {}
+
+# Maximum number of queries of a multi-query event run in parallel.
+QUERY_CONCURRENCY = int(os.getenv("QUERY_CONCURRENCY", "4"))
+
+
+def get_guardian_api() -> GuardianAPI:
+    global _guardian_api
+    if _guardian_api is None:
+        _guardian_api = GuardianAPI(cache=get_response_cache())
+    return _guardian_api
+
+
+def get_kinesis_writer(
+    stream_name: str, region_name: str | None = None
+) -> KinesisWriter:
+    key = (stream_name, region_name)
+    writer = _kinesis_writers.get(key)
+    if writer is None:
+        # Set KINESIS_RATE_LIMIT=true to pace writes against the per-shard limits.
+        writer = KinesisWriter(
+            stream_name,
+            region_name=region_name,
+            rate_limit=os.getenv("KINESIS_RATE_LIMIT", "").lower() == "true",
+        )
+        _kinesis_writers[key] = writer
+    return writer
+
+
+# Opt-in response cache in the Lambda's writable /tmp, reused while the execution
+# environment stays warm. Set GUARDIAN_CACHE_TTL (seconds) to enable.
+CACHE_PATH = "/tmp/newslaunch_cache.sqlite"  # noqa: S108
+_response_cache = None
+
+
+def get_response_cache():
+    global _response_cache
+    cache_ttl = os.getenv("GUARDIAN_CACHE_TTL")
+    if cache_ttl and _response_cache is None:
+        from newslaunch.response_cache import ResponseCache
+
+        _response_cache = ResponseCache(CACHE_PATH, ttl=int(cache_ttl))
+    return _response_cache
+
+
+# Opt-in de-duplication of published articles. The persistent set lives in /tmp, so
+# it is shared by the invocations of one warm execution environment only. Set
+# DEDUP_DB_PATH (e.g. /tmp/newslaunch_dedup.sqlite) to enable.
+_deduplicator = None
+
+
+def get_deduplicator():
+    global _deduplicator
+    db_path = os.getenv("DEDUP_DB_PATH")
+    if db_path and _deduplicator is None:
+        from newslaunch.dedup import ArticleDeduplicator
+
+        _deduplicator = ArticleDeduplicator(db_path=db_path)
+    return _deduplicator
+
+
+def _search_params(params: dict) -> dict:
+    """Return the search_articles parameters set in an event or query."""
+    search_params = {
+        "page_size": params.get("page_size"),
+        "from_date": params.get("from_date"),
+        "filter_response": params.get("filter_response"),
+        "order_by": params.get("order_by"),
+    }
+
+    if isinstance(search_params["filter_response"], str):
+        search_params["filter_response"] = (
+            search_params["filter_response"].lower() == "true"
+        )
+
+    return {k: v for k, v in search_params.items() if v is not None}
+
+
+def _query_params(query: str | dict) -> str | dict:
+    """Return a search_many query from a search term or a dict with its own params."""
+    if isinstance(query, str):
+        return query
+    return {"search_term": query.get("search_term"), **_search_params(query)}
+
 
 def lambda_handler(event: dict, context) -> dict:
     try:
@@ -16,42 +106,83 @@ def lambda_handler(event: dict, context) -> dict:
 
         search_term = body.get("search_term")
         stream_name = body.get("stream_name")
+        region_name = body.get("region_name")
+        # A list of search terms, or of dicts with a search_term and its own params.
+        queries = body.get("queries")
 
-        optional_params = {
-            "page_size": body.get("page_size"),
-            "from_date": body.get("from_date"),
-            "filter_response": body.get("filter_response"),
-            "order_by": body.get("order_by"),
-        }
+        optional_params = _search_params(body)
 
-        optional_params["filter_response"] = (
-            optional_params["filter_response"].lower() == "true"
-            if optional_params["filter_response"] is not None
-            else None
-        )
-
-        optional_params = {k: v for k, v in optional_params.items() if v is not None}
+        guardian_api = get_guardian_api()
+        kinesis = get_kinesis_writer(stream_name, region_name)
+        stats = None
+        failed_queries = []
+        if queries:
+            search_results, stats = guardian_api.search_many(
+                [_query_params(query) for query in queries],
+                concurrency=int(body.get("concurrency", QUERY_CONCURRENCY)),
+                **optional_params,
+            )
+            search_term = ", ".join(stat["search_term"] or "" for stat in stats)
+            # search_many reports the error of each query in its stats instead of
+            # raising, so an outage failing every query is an error here too.
+            failed_queries = [stat for stat in stats if stat["error"]]
+            if len(failed_queries) == len(stats):
+                log.error(f"All {len(stats)} queries failed.")
+                return {
+                    "statusCode": 500,
+                    "body": json.dumps(
+                        {"error": f"All {len(stats)} queries failed.", "stats": stats}
+                    ),
+                }
+        else:
+            search_results = guardian_api.search_articles(
+                search_term, **optional_params
+            )
 
-        guardian_api = GuardianAPI()
-        kinesis = KinesisWriter(stream_name)
-        search_results = guardian_api.search_articles(search_term, **optional_params)
+        deduplicator = get_deduplicator()
+        if search_results and deduplicator is not None:
+            search_results = deduplicator.filter_new(search_results)
 
         if search_results:
             # if there is more than 1 article in the results, send them using
             # via put_records:
             batch = len(search_results) > 1
-            kinesis.send_to_stream(search_results, record_per_entry=batch)
-            log.info(f"Data published to {stream_name}.")
-            return {
-                "statusCode": 200,
-                "body": json.dumps({"message": f"Data published to {stream_name}."}),
-            }
+            response = kinesis.send_to_stream(search_results, record_per_entry=batch)
+            # Records still failing after the writer's retries are not marked as
+            # published, so that a later invocation sends them again.
+            failed = set(KinesisWriter.failed_indices(response)) if batch else set()
+            if deduplicator is not None:
+                deduplicator.mark_published(
+                    [a for i, a in enumerate(search_results) if i not in failed]
+                )
+            if failed:
+                log.error(
+                    f"Failed to publish {len(failed)} of {len(search_results)} "
+                    f"articles to {stream_name}."
+                )
+                response_body = {
+                    "error": f"Failed to publish {len(failed)} of "
+                    f"{len(search_results)} articles to {stream_name}."
+                }
+                status_code = 500
+            else:
+                log.info(f"Data published to {stream_name}.")
+                response_body = {"message": f"Data published to {stream_name}."}
+                status_code = 200
         else:
             log.info(f"No results for '{search_term}' with provided parameters.")
-            return {
-                "statusCode": 204,
-                "body": json.dumps({"message": f"No results for '{search_term}'."}),
-            }
+            response_body = {"message": f"No results for '{search_term}'."}
+            status_code = 204
+
+        if failed_queries and status_code != 500:
+            log.error(f"{len(failed_queries)} of {len(stats)} queries failed.")
+            response_body["error"] = (
+                f"{len(failed_queries)} of {len(stats)} queries failed."
+            )
+            status_code = 207
+        if stats is not None:
+            response_body["stats"] = stats
+        return {"statusCode": status_code, "body": json.dumps(response_body)}
 
     except json.JSONDecodeError:
         log.error("Failed to decode event JSON body.")
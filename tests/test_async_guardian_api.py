@@ -0,0 +1,206 @@
+import asyncio
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from newslaunch.async_guardian_api import AsyncGuardianAPI
+from newslaunch.guardian_api import GuardianAPIError
+
+
+@pytest.fixture
+def sample_response():
+    with open(
+        os.path.join(os.path.dirname(__file__), "test_data/full_guardian_response.json")
+    ) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def filtered_sample_response():
+    with open(
+        os.path.join(
+            os.path.dirname(__file__), "test_data/filtered_guardian_response.json"
+        )
+    ) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def stub_server(sample_response):
+    """Local HTTP server serving the sample results in pages of the requested size.
+
+    Queued (status, body) replies are served first.
+    """
+    results = sample_response["response"]["results"]
+    replies = []
+    requests = []
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            requests.append(params)
+            if replies:
+                status, body = replies.pop(0)
+            else:
+                page_size = int(params.get("page-size", 10))
+                page = int(params.get("page", 1))
+                start = (page - 1) * page_size
+                status, body = 200, {
+                    "response": {
+                        "status": "ok",
+                        "pageSize": page_size,
+                        "currentPage": page,
+                        "pages": -(-len(results) // page_size),
+                        "results": results[start : start + page_size],
+                    }
+                }
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.replies = replies
+    server.requests = requests
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def async_api(monkeypatch, stub_server):
+    monkeypatch.setenv("GUARDIAN_API_KEY", "test_api_key")
+    api = AsyncGuardianAPI(backoff_factor=0)
+    api.API_URL = stub_server.url
+    return api
+
+
+async def _collect(api, *args, **kwargs):
+    async with api:
+        return [article async for article in api.iter_articles(*args, **kwargs)]
+
+
+def test_async_guardian_api_without_key(monkeypatch):
+    monkeypatch.delenv("GUARDIAN_API_KEY", raising=False)
+    with pytest.raises(GuardianAPIError):
+        AsyncGuardianAPI()
+
+
+def test_async_search_articles_validation(async_api):
+    with pytest.raises(GuardianAPIError):
+        asyncio.run(async_api.search_articles(""))
+
+    with pytest.raises(GuardianAPIError):
+        asyncio.run(async_api.search_articles("test", order_by="invalid_order"))
+
+    with pytest.raises(GuardianAPIError):
+        asyncio.run(async_api.search_articles("test", from_date="01-01-2012"))
+
+
+def test_async_search_articles_filtered_response(
+    async_api, stub_server, filtered_sample_response
+):
+    async def search():
+        async with async_api:
+            return await async_api.search_articles("test-query")
+
+    articles = asyncio.run(search())
+    assert articles == filtered_sample_response
+    assert stub_server.requests[0]["q"] == "test-query"
+    assert stub_server.requests[0]["api-key"] == "test_api_key"
+
+
+def test_async_search_articles_no_results(async_api, stub_server):
+    stub_server.replies.append((200, {"response": {"status": "ok", "results": []}}))
+
+    async def search():
+        async with async_api:
+            return await async_api.search_articles("query-no-results")
+
+    assert asyncio.run(search()) is None
+
+
+def test_async_search_articles_retries_then_fails(async_api, stub_server):
+    stub_server.replies.extend([(503, {}), (500, {}), (500, {}), (500, {})])
+
+    async def search():
+        async with async_api:
+            return await async_api.search_articles("error-search")
+
+    with pytest.raises(GuardianAPIError, match="Error fetching Guardian articles"):
+        asyncio.run(search())
+    assert len(stub_server.requests) == 4
+
+
+def test_async_search_articles_retries_server_errors(
+    async_api, stub_server, filtered_sample_response
+):
+    stub_server.replies.extend([(503, {}), (429, {})])
+
+    async def search():
+        async with async_api:
+            return await async_api.search_articles("test-query")
+
+    assert asyncio.run(search()) == filtered_sample_response
+    assert len(stub_server.requests) == 3
+
+
+def test_async_iter_articles_walks_all_pages(async_api, stub_server, sample_response):
+    results = sample_response["response"]["results"]
+    articles = asyncio.run(
+        _collect(async_api, "test-query", page_size=3, filter_response=False)
+    )
+    assert articles == results
+    assert len(stub_server.requests) == 4
+
+
+def test_async_iter_articles_concurrent(async_api, stub_server, sample_response):
+    results = sample_response["response"]["results"]
+    articles = asyncio.run(
+        _collect(
+            async_api, "test-query", page_size=2, filter_response=False, concurrency=3
+        )
+    )
+    assert articles == results
+
+    unordered = asyncio.run(
+        _collect(
+            async_api,
+            "test-query",
+            page_size=2,
+            filter_response=False,
+            concurrency=3,
+            ordered=False,
+        )
+    )
+    assert sorted(a["id"] for a in unordered) == sorted(a["id"] for a in results)
+
+
+def test_async_iter_articles_max_results(async_api, stub_server, sample_response):
+    results = sample_response["response"]["results"]
+    articles = asyncio.run(
+        _collect(
+            async_api,
+            "test-query",
+            page_size=2,
+            filter_response=False,
+            concurrency=4,
+            max_results=3,
+        )
+    )
+    assert articles == results[:3]
+    assert len(stub_server.requests) == 2
@@ -92,3 +92,146 @@ def test_guardian_search_articles_success(runner, mock_config):
         result = runner.invoke(cli, ["guardian", "test search"])
         assert result.exit_code == 0
         assert json.dumps(mock_response, indent=4) in result.output
+
+
+def test_guardian_search_articles_with_cache(runner, mock_config, tmp_path):
+    cache_file = tmp_path / "cache.sqlite"
+    with patch("newslaunch.cli.CACHE_FILE", cache_file), patch(
+        "newslaunch.guardian_api.GuardianAPI"
+    ) as mock_api:
+        mock_api.return_value.search_articles.return_value = None
+        result = runner.invoke(cli, ["guardian", "test search", "--cache"])
+        assert result.exit_code == 0
+        cache = mock_api.call_args.kwargs["cache"]
+        assert cache.path == cache_file
+        assert cache.ttl == 3600
+
+
+def test_sync_new_articles(runner, mock_config, tmp_path):
+    mock_response = [
+        {
+            "webPublicationDate": "2023-01-01T11:11:11Z",
+            "webTitle": "Test Article",
+            "webUrl": "https://www.theguardian.com/test-article",
+            "contentPreview": "This is a shortened preview of the test article.",
+        }
+    ]
+    state_file = tmp_path / "state.json"
+    with patch.object(
+        GuardianAPI, "sync_articles", return_value=mock_response
+    ) as mock_sync:
+        result = runner.invoke(
+            cli, ["sync", "test search", "--state-file", str(state_file)]
+        )
+        assert result.exit_code == 0
+        assert json.dumps(mock_response, indent=4) in result.output
+        assert mock_sync.call_args.args[1].path == state_file
+        assert mock_sync.call_args.kwargs["page_size"] == 200
+
+
+def test_sync_no_new_articles(runner, mock_config, tmp_path):
+    with patch.object(GuardianAPI, "sync_articles", return_value=[]):
+        result = runner.invoke(
+            cli, ["sync", "test search", "--state-file", str(tmp_path / "s.json")]
+        )
+        assert result.exit_code == 0
+        assert "No new articles." in result.output
+
+
+def test_guardian_search_articles_fields(runner, mock_config):
+    with patch.object(GuardianAPI, "search_articles", return_value=None) as mock_search:
+        result = runner.invoke(
+            cli, ["guardian", "test search", "-f", "--fields", "headline,wordcount"]
+        )
+        assert result.exit_code == 0
+        assert mock_search.call_args.kwargs["show_fields"] == "headline,wordcount"
+
+
+def test_guardian_search_articles_compact_format(runner, mock_config):
+    mock_response = [{"webTitle": "Café", "webUrl": "https://www.theguardian.com/a"}]
+    with patch.object(GuardianAPI, "search_articles", return_value=mock_response):
+        result = runner.invoke(cli, ["guardian", "test search", "--format", "compact"])
+        assert result.exit_code == 0
+        assert result.output.count("\n") == 1
+        assert json.loads(result.output) == mock_response
+
+
+def test_guardian_full_response_flag(runner, mock_config):
+    with patch.object(GuardianAPI, "search_articles", return_value=None) as mock_search:
+        runner.invoke(cli, ["guardian", "test search"])
+        assert mock_search.call_args.kwargs["filter_response"] is True
+        runner.invoke(cli, ["guardian", "test search", "-f"])
+        assert mock_search.call_args.kwargs["filter_response"] is False
+
+
+def test_guardian_ndjson_streams_all_pages(runner, mock_config):
+    mock_articles = [{"webTitle": f"Article {i}"} for i in range(3)]
+    with patch.object(
+        GuardianAPI, "iter_articles", return_value=iter(mock_articles)
+    ) as mock_iter:
+        result = runner.invoke(
+            cli, ["guardian", "test search", "--all-pages", "--format", "ndjson"]
+        )
+        assert result.exit_code == 0
+        assert [
+            json.loads(line) for line in result.output.splitlines()
+        ] == mock_articles
+        assert mock_iter.call_args.kwargs["max_results"] is None
+
+
+def test_guardian_ndjson_no_results_message_on_stderr(runner, mock_config):
+    # Checked on the secho call, as CliRunner only separates stderr in click 8.2+.
+    with patch.object(GuardianAPI, "iter_articles", return_value=iter([])), patch(
+        "newslaunch.cli.click.secho"
+    ) as mock_secho:
+        result = runner.invoke(
+            cli, ["guardian", "test search", "--all-pages", "--format", "ndjson"]
+        )
+    assert result.exit_code == 0
+    mock_secho.assert_called_once_with("No articles found.", fg="red", err=True)
+
+
+def test_guardian_max_results_pages_through_results(runner, mock_config):
+    with patch.object(GuardianAPI, "iter_articles", return_value=iter([])) as mock_iter:
+        result = runner.invoke(cli, ["guardian", "test search", "--max-results", "500"])
+        assert result.exit_code == 0
+        assert "No articles found." in result.output
+        assert mock_iter.call_args.kwargs["max_results"] == 500
+
+
+def test_publish_prints_stats(runner, mock_config):
+    stats = {
+        "articles": 3,
+        "failed": 0,
+        "bytes": 300,
+        "elapsed": 1.5,
+        "articles_per_second": 2.0,
+        "bytes_per_second": 200.0,
+        "api_calls": 1,
+        "api_retries": 0,
+        "put_calls": 1,
+        "put_retries": 0,
+    }
+    with patch(
+        "newslaunch.kinesis_writer.KinesisWriter.__init__", return_value=None
+    ), patch("newslaunch.pipeline.PublishPipeline.run", return_value=stats) as mock_run:
+        result = runner.invoke(
+            cli, ["publish", "test search", "--stream-name", "test-stream", "-m", "3"]
+        )
+        assert result.exit_code == 0
+        assert "Published 3 articles to test-stream" in result.output
+        assert mock_run.call_args.kwargs["max_results"] == 3
+
+
+def test_publish_api_error(runner, mock_config):
+    with patch(
+        "newslaunch.kinesis_writer.KinesisWriter.__init__", return_value=None
+    ), patch(
+        "newslaunch.pipeline.PublishPipeline.run",
+        side_effect=GuardianAPIError("API Error"),
+    ):
+        result = runner.invoke(
+            cli, ["publish", "test search", "--stream-name", "test-stream"]
+        )
+        assert result.exit_code == 1
+        assert "API Error" in result.output
@@ -0,0 +1,149 @@
+import base64
+import importlib.util
+import json
+import logging
+import os
+
+import pytest
+
+from newslaunch.envelope import compress, wrap
+from newslaunch.kpl import aggregate_records
+
+CONSUMER_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "newspad", "lambda", "consumer.py"
+)
+
+
+def _load_consumer():
+    # The consumer Lambda is a standalone module, not part of the package.
+    spec = importlib.util.spec_from_file_location("consumer", CONSUMER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def consumer():
+    return _load_consumer()
+
+
+def _kinesis_event(*payloads):
+    return {
+        "Records": [
+            {
+                "kinesis": {
+                    "data": base64.b64encode(payload).decode("ascii"),
+                    "sequenceNumber": str(i),
+                }
+            }
+            for i, payload in enumerate(payloads)
+        ]
+    }
+
+
+def test_consumer_deaggregates_kpl_records(consumer):
+    articles = [{"webTitle": f"Article {i}"} for i in range(20)]
+    entries = [
+        {"Data": json.dumps(a).encode("utf-8"), "PartitionKey": str(i)}
+        for i, a in enumerate(articles)
+    ]
+    (aggregated,) = aggregate_records(entries, group_key=lambda entry: "shard-0")
+
+    payloads = consumer.deaggregate(aggregated["Data"])
+    assert [consumer.process_article(p) for p in payloads] == articles
+
+
+def test_consumer_passes_through_plain_records(consumer):
+    data = json.dumps({"webTitle": "Article"}).encode("utf-8")
+    assert consumer.deaggregate(data) == [data]
+
+
+def test_process_batch_handles_aggregated_and_plain_records(consumer):
+    aggregated = aggregate_records(
+        [
+            {"Data": b'{"a": 1}', "PartitionKey": "1"},
+            {"Data": b'{"b": 2}', "PartitionKey": "2"},
+        ],
+        group_key=lambda entry: "shard-0",
+    )[0]["Data"]
+    handled = []
+
+    def handler(articles):
+        handled.extend(articles)
+
+    response = consumer.process_batch(_kinesis_event(aggregated, b'{"c": 3}'), handler)
+    assert response == {"batchItemFailures": []}
+    assert handled == [("0", {"a": 1}), ("0", {"b": 2}), ("1", {"c": 3})]
+
+
+def test_process_batch_reports_undecodable_records(consumer):
+    handled = []
+    response = consumer.process_batch(
+        _kinesis_event(b'{"a": 1}', b"not json", b'{"c": 3}'), handled.extend
+    )
+    assert response == {"batchItemFailures": [{"itemIdentifier": "1"}]}
+    assert [sequence_number for sequence_number, _ in handled] == ["0", "2"]
+
+
+def test_process_batch_reports_handler_failures(consumer):
+    event = _kinesis_event(b'{"a": 1}', b'{"b": 2}', b'{"c": 3}')
+
+    response = consumer.process_batch(event, lambda articles: ["2", "2"])
+    assert response == {"batchItemFailures": [{"itemIdentifier": "2"}]}
+
+    def failing_handler(articles):
+        raise RuntimeError("Downstream unavailable")
+
+    response = consumer.process_batch(event, failing_handler)
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": str(i)} for i in range(3)]
+    }
+
+
+def test_lambda_handler_logs_summary_at_info(consumer, caplog):
+    with caplog.at_level("INFO"):
+        response = consumer.lambda_handler(_kinesis_event(b'{"a": 1}'), None)
+    assert response == {"batchItemFailures": []}
+    assert [r.message for r in caplog.records] == [
+        "Processed 1 records (1 articles), 0 failed."
+    ]
+
+    caplog.clear()
+    with caplog.at_level("DEBUG", logger="consumer"):
+        consumer.lambda_handler(_kinesis_event(b'{"a": 1}'), None)
+    assert "Article processed (0): {'a': 1}" in caplog.messages
+
+
+def test_log_level_is_configurable(monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "warning")
+    assert _load_consumer().log.level == logging.WARNING
+
+
+def test_lambda_handler_uses_configured_handler(consumer, monkeypatch):
+    monkeypatch.setenv("ARTICLE_HANDLER", "json:dumps")
+    assert consumer.get_handler() is json.dumps
+
+
+def test_consumer_decodes_compressed_articles(consumer):
+    article = {"webTitle": "Title", "body": "<p>Text</p>" * 500}
+    payload = compress(json.dumps(article).encode("utf-8"))
+    assert consumer.process_article(payload) == article
+    assert consumer.process_article(json.dumps(article).encode("utf-8")) == article
+
+
+def test_consumer_rejects_unsupported_envelope(consumer):
+    with pytest.raises(ValueError, match="codec 9"):
+        consumer.process_article(b"NLE\x01\x09data")
+
+
+def test_consumer_decodes_msgpack_articles(consumer):
+    msgpack = pytest.importorskip("msgpack")
+    article = {"webTitle": "Title"}
+    assert (
+        consumer.process_article(wrap(msgpack.packb(article), fmt="msgpack")) == article
+    )
+
+
+def test_consumer_rejects_unsupported_format(consumer):
+    with pytest.raises(ValueError, match="format 9"):
+        consumer.process_article(b"NLE\x02\x00\x09data")
@@ -0,0 +1,60 @@
+import pytest
+
+from newslaunch.dedup import ArticleDeduplicator, BloomFilter
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"world/2023/jan/{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other/{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_bloom_filter_invalid_parameters():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(error_rate=1)
+
+
+def test_article_key_uses_id_or_content_hash():
+    assert ArticleDeduplicator.article_key({"id": "world/1", "webTitle": "A"}) == (
+        "world/1"
+    )
+    preview = {"webTitle": "A", "webUrl": "https://example.co.uk"}
+    key = ArticleDeduplicator.article_key(preview)
+    assert key.startswith("sha256:")
+    assert key == ArticleDeduplicator.article_key(dict(reversed(preview.items())))
+    assert key != ArticleDeduplicator.article_key({**preview, "webTitle": "B"})
+
+
+def test_filter_new_drops_published_and_batch_duplicates():
+    dedup = ArticleDeduplicator(capacity=100)
+    first = [{"id": "a"}, {"id": "b"}, {"id": "a"}]
+    assert dedup.filter_new(first) == [{"id": "a"}, {"id": "b"}]
+
+    # not marked as published until mark_published
+    assert dedup.filter_new(first) == [{"id": "a"}, {"id": "b"}]
+
+    dedup.mark_published([{"id": "a"}, {"id": "b"}])
+    assert dedup.filter_new([{"id": "b"}, {"id": "c"}]) == [{"id": "c"}]
+
+
+def test_persistent_set_survives_restarts(tmp_path):
+    db_path = tmp_path / "dedup.sqlite"
+    with ArticleDeduplicator(capacity=100, db_path=db_path) as dedup:
+        dedup.mark_published([{"id": "a"}, {"id": "b"}])
+
+    with ArticleDeduplicator(capacity=100, db_path=db_path) as dedup:
+        assert dedup.is_published("a")
+        assert dedup.filter_new([{"id": "a"}, {"id": "c"}]) == [{"id": "c"}]
+
+
+def test_persistent_set_confirms_bloom_filter_hits(tmp_path):
+    with ArticleDeduplicator(capacity=100, db_path=tmp_path / "d.sqlite") as dedup:
+        dedup.bloom.add("c")  # simulate a false positive
+        assert not dedup.is_published("c")
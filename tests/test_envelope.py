@@ -0,0 +1,87 @@
+import gzip
+import json
+
+import pytest
+
+from newslaunch import envelope
+from newslaunch.envelope import (
+    ENVELOPE_MAGIC,
+    codec_available,
+    compress,
+    is_enveloped,
+    open_envelope,
+    unwrap,
+    wrap,
+)
+
+ARTICLE = json.dumps({"webTitle": "Title", "body": "<p>Text</p>" * 500}).encode()
+
+
+def test_gzip_round_trip():
+    enveloped = compress(ARTICLE)
+    assert enveloped[:6] == ENVELOPE_MAGIC + b"\x02\x01\x00"
+    assert is_enveloped(enveloped)
+    assert len(enveloped) < len(ARTICLE) / 10
+    assert gzip.decompress(enveloped[6:]) == ARTICLE
+    assert open_envelope(enveloped) == ARTICLE
+
+
+def test_gzip_is_deterministic():
+    assert compress(ARTICLE) == compress(ARTICLE)
+
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+    enveloped = compress(ARTICLE, "zstd")
+    assert enveloped[:6] == ENVELOPE_MAGIC + b"\x02\x02\x00"
+    assert open_envelope(enveloped) == ARTICLE
+
+
+def test_zstd_unavailable(monkeypatch):
+    monkeypatch.setattr(envelope, "zstandard", None)
+    assert not codec_available("zstd")
+    with pytest.raises(ValueError, match="Unsupported compression codec 'zstd'"):
+        compress(ARTICLE, "zstd")
+
+
+def test_unknown_codec():
+    assert not codec_available("lz4")
+    with pytest.raises(ValueError, match="Unsupported compression codec 'lz4'"):
+        compress(ARTICLE, "lz4")
+
+
+def test_read_version_1_envelope():
+    enveloped = ENVELOPE_MAGIC + b"\x01\x01" + gzip.compress(ARTICLE)
+    assert unwrap(enveloped) == (ARTICLE, "json")
+
+
+def test_wrap_uncompressed_with_format():
+    enveloped = wrap(b"\x81\xa1a\x01", fmt="msgpack")
+    assert enveloped == ENVELOPE_MAGIC + b"\x02\x00\x01" + b"\x81\xa1a\x01"
+    assert unwrap(enveloped) == (b"\x81\xa1a\x01", "msgpack")
+    assert unwrap(ARTICLE) == (ARTICLE, "json")
+
+
+def test_wrap_unknown_format():
+    with pytest.raises(ValueError, match="Unsupported envelope format 'xml'"):
+        wrap(ARTICLE, fmt="xml")
+
+
+@pytest.mark.parametrize("data", [ARTICLE, b"", b"NL"])
+def test_open_envelope_passes_through_plain_data(data):
+    assert not is_enveloped(data)
+    assert open_envelope(data) == data
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        (ENVELOPE_MAGIC + b"\x09\x01data", "version 9"),
+        (ENVELOPE_MAGIC + b"\x01\x09data", "codec 9"),
+        (ENVELOPE_MAGIC + b"\x02\x00\x09data", "format 9"),
+        (ENVELOPE_MAGIC + b"\x02\x00", "version 2"),
+    ],
+)
+def test_open_envelope_unsupported(data, message):
+    with pytest.raises(ValueError, match=message):
+        open_envelope(data)
@@ -1,12 +1,23 @@
 # ruff: noqa: B905
 import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
+from pydantic import ValidationError
 
-from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+from newslaunch.guardian_api import (
+    GuardianAPI,
+    GuardianAPIError,
+    GuardianArticlePreview,
+    _extract_preview,
+    _JitteredRetry,
+)
+from newslaunch.response_cache import ResponseCache
+from newslaunch.sync_state import SyncState
 
 
 @pytest.fixture
@@ -82,7 +93,7 @@ def test_search_articles_invalid_from_date(guardian_api):
 
 def test_search_articles_no_results_returns_none(guardian_api):
     empty_response = {"response": {"status": "ok", "results": []}}
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.json.return_value = empty_response
         mock_response.status_code = 200
@@ -91,14 +102,14 @@ def test_search_articles_no_results_returns_none(guardian_api):
         assert articles is None
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_search_articles_general_requests_error(mocked_get, guardian_api):
     mocked_get.side_effect = requests.RequestException("API error")
     with pytest.raises(GuardianAPIError):
         guardian_api.search_articles("error-search")
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_search_articles_timeout_error(mocked_get, guardian_api):
     mocked_get.side_effect = requests.Timeout("Timeout error")
     with pytest.raises(GuardianAPIError) as err:
@@ -109,7 +120,7 @@ def test_search_articles_timeout_error(mocked_get, guardian_api):
 def test_search_articles_filtered_response_default(
     guardian_api, sample_response, filtered_sample_response
 ):
-    with patch("requests.get") as mocked_get:
+    with patch("requests.Session.get") as mocked_get:
         mock_response = MagicMock()
         mock_response.json.return_value = sample_response
         mock_response.status_code = 200
@@ -129,7 +140,7 @@ def test_search_articles_filtered_response_default(
 
 
 def test_search_articles_full_response(guardian_api, sample_response):
-    with patch("requests.get") as mocked_get:
+    with patch("requests.Session.get") as mocked_get:
         mock_response = MagicMock()
         mock_response.json.return_value = sample_response
         mock_response.status_code = 200
@@ -138,3 +149,494 @@ def test_search_articles_full_response(guardian_api, sample_response):
 
         assert articles is not None
         assert articles == sample_response.get("response", {}).get("results")
+
+
+def _page_response(results, current_page, pages):
+    mock_response = MagicMock()
+    mock_response.json.return_value = {
+        "response": {
+            "status": "ok",
+            "currentPage": current_page,
+            "pages": pages,
+            "results": results,
+        }
+    }
+    mock_response.status_code = 200
+    return mock_response
+
+
+def test_iter_articles_walks_all_pages(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.side_effect = [
+            _page_response(results[:5], 1, 2),
+            _page_response(results[5:], 2, 2),
+        ]
+        articles = list(
+            guardian_api.iter_articles("test-query", page_size=5, filter_response=False)
+        )
+
+    assert articles == results
+    assert mocked_get.call_count == 2
+    assert "page" not in mocked_get.call_args_list[0].kwargs["params"]
+    assert mocked_get.call_args_list[1].kwargs["params"]["page"] == 2
+
+
+def test_iter_articles_is_lazy(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.side_effect = [
+            _page_response(results[:5], 1, 2),
+            _page_response(results[5:], 2, 2),
+        ]
+        articles = guardian_api.iter_articles("test-query", page_size=5)
+        assert mocked_get.call_count == 0
+        next(articles)
+        assert mocked_get.call_count == 1
+
+
+def test_iter_articles_max_results_stops_early(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.side_effect = [
+            _page_response(results[:5], 1, 3),
+            _page_response(results[5:], 2, 3),
+        ]
+        articles = list(
+            guardian_api.iter_articles(
+                "test-query", page_size=5, filter_response=False, max_results=7
+            )
+        )
+
+    assert articles == results[:7]
+    assert mocked_get.call_count == 2
+
+
+def test_iter_articles_no_results(guardian_api):
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.return_value = _page_response([], 1, 0)
+        assert list(guardian_api.iter_articles("query-no-results")) == []
+
+
+def test_iter_articles_invalid_max_results(guardian_api):
+    with pytest.raises(GuardianAPIError):
+        list(guardian_api.iter_articles("test query", max_results=0))
+
+
+def _paged_get(results, page_size):
+    pages = -(-len(results) // page_size)
+
+    def get(url, params, timeout):
+        page = params.get("page", 1)
+        start = (page - 1) * page_size
+        return _page_response(results[start : start + page_size], page, pages)
+
+    return get
+
+
+def test_iter_articles_concurrent_prefetch_is_ordered(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.side_effect = _paged_get(results, 2)
+        articles = list(
+            guardian_api.iter_articles(
+                "test-query", page_size=2, filter_response=False, concurrency=3
+            )
+        )
+
+    assert articles == results
+    assert mocked_get.call_count == 5
+
+
+def test_iter_articles_concurrent_prefetch_unordered(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.side_effect = _paged_get(results, 2)
+        articles = list(
+            guardian_api.iter_articles(
+                "test-query",
+                page_size=2,
+                filter_response=False,
+                concurrency=3,
+                ordered=False,
+            )
+        )
+
+    assert articles[:2] == results[:2]
+    assert sorted(a["id"] for a in articles) == sorted(a["id"] for a in results)
+
+
+def test_iter_articles_concurrent_prefetch_limited_by_max_results(
+    guardian_api, sample_response
+):
+    results = sample_response["response"]["results"]
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.side_effect = _paged_get(results, 2)
+        articles = list(
+            guardian_api.iter_articles(
+                "test-query",
+                page_size=2,
+                filter_response=False,
+                concurrency=4,
+                max_results=5,
+            )
+        )
+
+    assert articles == results[:5]
+    assert mocked_get.call_count == 3
+
+
+def test_iter_articles_concurrent_prefetch_error(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    paged_get = _paged_get(results, 2)
+
+    def failing_get(url, params, timeout):
+        if params.get("page") == 3:
+            raise requests.RequestException("API error")
+        return paged_get(url, params, timeout)
+
+    with patch("requests.Session.get", side_effect=failing_get):
+        with pytest.raises(GuardianAPIError):
+            list(guardian_api.iter_articles("test-query", page_size=2, concurrency=2))
+
+
+def test_iter_articles_invalid_concurrency(guardian_api):
+    with pytest.raises(GuardianAPIError):
+        list(guardian_api.iter_articles("test query", concurrency=0))
+
+
+@pytest.fixture
+def stub_server(sample_response):
+    """Local HTTP server that replies with queued (status, body) pairs."""
+    replies = []
+    request_paths = []
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            request_paths.append(self.path)
+            status, body = replies.pop(0) if replies else (200, sample_response)
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.replies = replies
+    server.request_paths = request_paths
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_guardian_api_session_configuration(env_api_key):
+    api = GuardianAPI(api_key=env_api_key, pool_size=4, max_retries=5)
+    adapter = api.session.get_adapter("https://content.guardianapis.com")
+    assert adapter._pool_maxsize == 4
+    assert isinstance(adapter.max_retries, _JitteredRetry)
+    assert adapter.max_retries.total == 5
+    assert 503 in adapter.max_retries.status_forcelist
+    assert 429 in adapter.max_retries.status_forcelist
+
+
+def test_guardian_api_context_manager_closes_session(env_api_key):
+    with patch("requests.Session.close") as mock_close:
+        with GuardianAPI(api_key=env_api_key):
+            mock_close.assert_not_called()
+    mock_close.assert_called_once()
+
+
+def test_jittered_retry_backoff_within_bounds():
+    retry = _JitteredRetry(total=5, backoff_factor=1)
+    for _ in range(3):
+        retry = retry.increment(method="GET", url="/search")
+    # backoff_factor * 2 ** (consecutive_errors - 1), halved by the jitter at worst
+    backoff = 1 * 2 ** (3 - 1)
+    for _ in range(20):
+        assert backoff / 2 <= retry.get_backoff_time() <= backoff
+
+
+def test_search_articles_retries_server_errors(
+    env_api_key, stub_server, filtered_sample_response
+):
+    stub_server.replies.extend([(503, {}), (429, {})])
+    with GuardianAPI(api_key=env_api_key, backoff_factor=0) as api:
+        api.API_URL = stub_server.url
+        articles = api.search_articles("test-query")
+
+    assert len(stub_server.request_paths) == 3
+    assert articles == filtered_sample_response
+
+
+def test_search_articles_retries_exhausted(env_api_key, stub_server):
+    stub_server.replies.extend([(500, {})] * 3)
+    with GuardianAPI(api_key=env_api_key, max_retries=2, backoff_factor=0) as api:
+        api.API_URL = stub_server.url
+        with pytest.raises(GuardianAPIError, match="500 Server Error"):
+            api.search_articles("test-query")
+
+    assert len(stub_server.request_paths) == 3
+
+
+def test_search_articles_uses_response_cache(
+    env_api_key, tmp_path, sample_response, filtered_sample_response
+):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    api = GuardianAPI(api_key=env_api_key, cache=cache)
+    with patch("requests.Session.get") as mocked_get:
+        mock_response = MagicMock()
+        mock_response.json.return_value = sample_response
+        mock_response.status_code = 200
+        mocked_get.return_value = mock_response
+
+        first = api.search_articles("test-query")
+        second = api.search_articles("test-query")
+        api.search_articles("other-query")
+
+    assert first == second == filtered_sample_response
+    assert mocked_get.call_count == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    cache.close()
+
+
+def _articles(*dates):
+    return [
+        {"id": f"article-{i}", "webPublicationDate": date}
+        for i, date in enumerate(dates)
+    ]
+
+
+def test_sync_articles_first_run_sets_watermark(guardian_api, tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    articles = _articles("2023-01-01T10:00:00Z", "2023-01-02T10:00:00Z")
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.return_value = _page_response(articles, 1, 1)
+        synced = guardian_api.sync_articles(
+            "test-query", state, from_date="2023-01-01", filter_response=False
+        )
+
+    params = mocked_get.call_args.kwargs["params"]
+    assert params["order-by"] == "oldest"
+    assert params["from-date"] == "2023-01-01"
+    assert synced == articles
+    assert SyncState(tmp_path / "state.json").get_watermark("test-query") == (
+        "2023-01-02T10:00:00Z"
+    )
+
+
+def test_sync_articles_fetches_only_newer_articles(guardian_api, tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    state.set_watermark("test-query", "2023-01-02T10:00:00Z")
+    articles = _articles(
+        "2023-01-02T09:00:00Z", "2023-01-02T10:00:00Z", "2023-01-02T11:00:00Z"
+    )
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.return_value = _page_response(articles, 1, 1)
+        synced = guardian_api.sync_articles(
+            "test-query", state, from_date="2020-01-01", filter_response=False
+        )
+
+    assert mocked_get.call_args.kwargs["params"]["from-date"] == "2023-01-02"
+    assert synced == articles[2:]
+    assert state.get_watermark("test-query") == "2023-01-02T11:00:00Z"
+
+
+def test_sync_articles_does_not_advance_watermark_on_error(guardian_api, tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    articles = _articles("2023-01-01T10:00:00Z")
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.side_effect = [
+            _page_response(articles, 1, 2),
+            requests.RequestException("API error"),
+        ]
+        with pytest.raises(GuardianAPIError):
+            guardian_api.sync_articles("test-query", state, filter_response=False)
+
+    assert state.get_watermark("test-query") is None
+    assert not (tmp_path / "state.json").exists()
+
+
+def test_sync_articles_max_results_counts_only_new_articles(guardian_api, tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    state.set_watermark("test-query", "2023-01-01T10:00:00Z")
+    articles = _articles(
+        "2023-01-01T09:00:00Z",
+        "2023-01-01T10:00:00Z",
+        "2023-01-01T11:00:00Z",
+        "2023-01-01T12:00:00Z",
+    )
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.return_value = _page_response(articles, 1, 1)
+        synced = guardian_api.sync_articles(
+            "test-query", state, filter_response=False, max_results=1
+        )
+
+    assert synced == articles[2:3]
+    assert state.get_watermark("test-query") == "2023-01-01T11:00:00Z"
+
+
+def test_sync_articles_max_results_does_not_split_a_publication_time(
+    guardian_api, tmp_path
+):
+    state = SyncState(tmp_path / "state.json")
+    articles = _articles(
+        "2023-01-01T10:00:00Z",
+        "2023-01-01T11:00:00Z",
+        "2023-01-01T11:00:00Z",
+        "2023-01-01T12:00:00Z",
+    )
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.return_value = _page_response(articles, 1, 1)
+        first = guardian_api.sync_articles(
+            "test-query", state, filter_response=False, max_results=2
+        )
+        second = guardian_api.sync_articles(
+            "test-query", state, filter_response=False, max_results=2
+        )
+
+    assert first == articles[:3]
+    assert second == articles[3:]
+    assert state.get_watermark("test-query") == "2023-01-01T12:00:00Z"
+
+
+@pytest.mark.parametrize(
+    "filter_response, show_fields, expected",
+    [
+        (True, None, "bodyText"),
+        (False, None, "all"),
+        (False, ["headline", "wordcount"], "headline,wordcount"),
+        (False, "headline, wordcount", "headline,wordcount"),
+        (True, ["headline"], "headline,bodyText"),
+        (True, "bodyText,byline", "bodyText,byline"),
+        (False, ["headline", "all"], "all"),
+    ],
+)
+def test_search_articles_show_fields(
+    guardian_api, filter_response, show_fields, expected
+):
+    with patch("requests.Session.get") as mocked_get:
+        mocked_get.return_value = _page_response([], 1, 0)
+        guardian_api.search_articles(
+            "test-query", filter_response=filter_response, show_fields=show_fields
+        )
+    assert mocked_get.call_args.kwargs["params"]["show-fields"] == expected
+
+
+def test_search_articles_invalid_show_fields(guardian_api):
+    with pytest.raises(GuardianAPIError):
+        guardian_api.search_articles("test query", show_fields=["headline", 1])
+
+
+@pytest.mark.parametrize(
+    "body_text",
+    [
+        "",
+        "Short article.",
+        "word " * 300,
+        "x" * 999 + ",,,",
+        "x" * 998 + ". more text",
+        "x" * 995 + " 1234, more text",
+    ],
+)
+def test_extract_preview_matches_model(body_text):
+    article = {
+        "id": "test/article",
+        "webPublicationDate": "2023-01-01T11:11:11Z",
+        "webTitle": "Test Article",
+        "webUrl": "https://www.theguardian.com/test-article",
+        "fields": {"bodyText": body_text, "wordcount": "3"},
+    }
+    expected = GuardianArticlePreview(**article).model_dump(by_alias=True)
+    assert _extract_preview(article) == expected
+
+
+def test_extract_preview_matches_model_on_sample(sample_response):
+    for article in sample_response["response"]["results"]:
+        expected = GuardianArticlePreview(**article).model_dump(by_alias=True)
+        assert _extract_preview(article) == expected
+
+
+@pytest.mark.parametrize(
+    "article",
+    [
+        {"webTitle": "A", "webUrl": "u", "fields": {"bodyText": "b"}},
+        {"webPublicationDate": "d", "webTitle": "A", "webUrl": "u"},
+        {"webPublicationDate": 1, "webTitle": "A", "webUrl": "u", "fields": {}},
+        {
+            "webPublicationDate": "d",
+            "webTitle": "A",
+            "webUrl": "u",
+            "fields": {"bodyText": None},
+        },
+    ],
+)
+def test_extract_preview_invalid_article_raises_validation_error(article):
+    with pytest.raises(ValidationError):
+        _extract_preview(article)
+
+
+def test_search_many_merges_and_deduplicates(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    by_query = {"first": results[:3], "second": results[2:5], "empty": []}
+
+    def get(url, params, timeout):
+        if params["q"] == "broken":
+            raise requests.RequestException("API error")
+        return _page_response(by_query[params["q"]], 1, 1)
+
+    with patch("requests.Session.get", side_effect=get) as mocked_get:
+        articles, stats = guardian_api.search_many(
+            [
+                "first",
+                {"search_term": "second", "order_by": "newest"},
+                "empty",
+                "broken",
+            ],
+            concurrency=2,
+            filter_response=False,
+        )
+
+    assert articles == results[:5]
+    assert [(s["search_term"], s["results"], s["unique"]) for s in stats] == [
+        ("first", 3, 3),
+        ("second", 3, 2),
+        ("empty", 0, 0),
+        ("broken", 0, 0),
+    ]
+    assert [s["error"] for s in stats[:3]] == [None, None, None]
+    assert "API error" in stats[3]["error"]
+    params = {
+        call.kwargs["params"]["q"]: call.kwargs["params"]
+        for call in mocked_get.call_args_list
+    }
+    assert params["second"]["order-by"] == "newest"
+    assert "order-by" not in params["first"]
+
+
+def test_search_many_counts_requests_across_threads(guardian_api, sample_response):
+    results = sample_response["response"]["results"]
+    with patch("requests.Session.get", return_value=_page_response(results, 1, 1)):
+        guardian_api.search_many([f"query {i}" for i in range(50)], concurrency=8)
+    assert guardian_api.requests == 50
+    assert guardian_api.retries == 0
+
+
+def test_search_many_missing_search_term(guardian_api):
+    articles, stats = guardian_api.search_many([{"page_size": 5}])
+    assert articles == []
+    assert stats[0]["error"] is not None
+
+
+def test_search_many_invalid_concurrency(guardian_api):
+    with pytest.raises(GuardianAPIError):
+        guardian_api.search_many(["query"], concurrency=0)
@@ -63,7 +63,7 @@ def filtered_sample_response():
 def test_search_articles_and_send_to_kinesis(
     guardian_api, kinesis_writer, sample_response, filtered_sample_response
 ):
-    with patch("requests.get") as mocked_get:
+    with patch("requests.Session.get") as mocked_get:
         # mock get request to return a JSON sample of full API response:
         mock_response = MagicMock()
         mock_response.json.return_value = sample_response
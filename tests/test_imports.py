@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import pytest
+
+import newslaunch
+
+# Modules too heavy to import before the class needing them is used.
+HEAVY_MODULES = ["aiohttp", "boto3", "botocore", "pydantic", "requests"]
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+@pytest.mark.parametrize("module", ["newslaunch", "newslaunch.cli"])
+def test_import_does_not_load_heavy_dependencies(module):
+    loaded = run_python(
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert loaded.split() == []
+
+
+def test_lazy_attributes():
+    from newslaunch.guardian_api import GuardianAPI
+    from newslaunch.kinesis_writer import KinesisWriterError
+
+    assert newslaunch.GuardianAPI is GuardianAPI
+    assert newslaunch.KinesisWriterError is KinesisWriterError
+    assert set(newslaunch.__all__) <= set(dir(newslaunch))
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        newslaunch.Missing  # noqa: B018
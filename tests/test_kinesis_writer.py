@@ -1,12 +1,18 @@
 # ruff: noqa: S105
 import json
 import os
+import time
+from unittest.mock import patch
 
 import boto3
 import pytest
 from moto import mock_aws
 
+from newslaunch.envelope import is_enveloped, open_envelope, unwrap
 from newslaunch.kinesis_writer import KinesisWriter, KinesisWriterError
+from newslaunch.kpl import deaggregate
+from newslaunch.serializers import Serializer
+from newslaunch.shards import ShardMap, hash_key
 
 
 @pytest.fixture(scope="function")
@@ -54,15 +60,74 @@ def test_send_too_large_record_put_record(kinesis_writer):
 
 
 def test_send_too_large_record_put_records(kinesis_writer):
-    large_data = [{"key": "value" * (1024 * 3000)}, {"key2": "value2" * (1024 * 3000)}]
-    with pytest.raises(KinesisWriterError, match="exceeds the 5MiB limit"):
+    large_data = [{"key": "value"}, {"key2": "value2" * (1024 * 200)}]
+    with pytest.raises(
+        KinesisWriterError, match=r"record at index 1 .* exceeds the 1MiB limit"
+    ):
         kinesis_writer.send_to_stream(large_data, record_per_entry=True)
 
 
-def test_send_over_record_count_limit_put_record(kinesis_writer):
-    data = [b"x"] * 501
-    with pytest.raises(KinesisWriterError, match="exceeds the 500 record limit"):
-        kinesis_writer.send_to_stream(data, record_per_entry=True)
+def test_send_over_record_count_limit_put_records_is_chunked(kinesis_writer):
+    data = [b"x"] * 1001
+    with patch.object(
+        kinesis_writer.client,
+        "put_records",
+        wraps=kinesis_writer.client.put_records,
+    ) as mock_put_records:
+        response = kinesis_writer.send_to_stream(data, record_per_entry=True)
+
+    assert [len(c.kwargs["Records"]) for c in mock_put_records.call_args_list] == [
+        500,
+        500,
+        1,
+    ]
+    assert response["FailedRecordCount"] == 0
+    assert len(response["Records"]) == 1001
+    assert response["ResponseMetadata"]["HTTPStatusCode"] == 200
+
+
+def test_send_over_batch_size_limit_put_records_is_chunked(kinesis_writer):
+    data = [b"x" * (1000 * 1024)] * 12
+    with patch.object(
+        kinesis_writer.client,
+        "put_records",
+        wraps=kinesis_writer.client.put_records,
+    ) as mock_put_records:
+        response = kinesis_writer.send_to_stream(data, record_per_entry=True)
+
+    assert [len(c.kwargs["Records"]) for c in mock_put_records.call_args_list] == [
+        5,
+        5,
+        2,
+    ]
+    assert len(response["Records"]) == 12
+
+
+def test_merge_put_records_responses():
+    responses = [
+        {
+            "FailedRecordCount": 1,
+            "Records": [{"SequenceNumber": "1"}, {"ErrorCode": "InternalFailure"}],
+            "EncryptionType": "NONE",
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        },
+        {
+            "FailedRecordCount": 0,
+            "Records": [{"SequenceNumber": "3"}],
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        },
+    ]
+    assert KinesisWriter._merge_responses(responses) == {
+        "FailedRecordCount": 1,
+        "Records": [
+            {"SequenceNumber": "1"},
+            {"ErrorCode": "InternalFailure"},
+            {"SequenceNumber": "3"},
+        ],
+        "FailedRecords": [],
+        "EncryptionType": "NONE",
+        "ResponseMetadata": {"HTTPStatusCode": 200},
+    }
 
 
 def test_send_non_serializable_data(kinesis_writer):
@@ -109,3 +174,438 @@ def test_send_and_read_from_the_same_stream(kinesis_writer, mock_kinesis_stream)
     # Check without without relying on the order
     for record in data:
         assert record in get_stream_data
+
+
+def _put_records_response(*error_codes):
+    records = [
+        (
+            {"ErrorCode": code, "ErrorMessage": "error"}
+            if code
+            else {"SequenceNumber": "1", "ShardId": "shardId-000000000000"}
+        )
+        for code in error_codes
+    ]
+    return {
+        "FailedRecordCount": sum(1 for code in error_codes if code),
+        "Records": records,
+        "ResponseMetadata": {"HTTPStatusCode": 200},
+    }
+
+
+@patch("newslaunch.kinesis_writer.time.sleep")
+def test_put_records_retries_only_failed_records(mock_sleep, kinesis_writer):
+    data = [b"a", b"b", b"c"]
+    with patch.object(kinesis_writer.client, "put_records") as mock_put_records:
+        mock_put_records.side_effect = [
+            _put_records_response(None, "ProvisionedThroughputExceededException", None),
+            _put_records_response(None),
+        ]
+        response = kinesis_writer.send_to_stream(data, record_per_entry=True)
+
+    second_call = mock_put_records.call_args_list[1].kwargs["Records"]
+    assert [record["Data"] for record in second_call] == [b"b"]
+    assert response["FailedRecordCount"] == 0
+    assert response["FailedRecords"] == []
+    assert all("SequenceNumber" in record for record in response["Records"])
+    mock_sleep.assert_called_once()
+
+
+@patch("newslaunch.kinesis_writer.time.sleep")
+def test_put_records_reports_records_that_ultimately_failed(mock_sleep, kinesis_writer):
+    kinesis_writer.max_retries = 2
+    data = [b"a", b"b"]
+    with patch.object(kinesis_writer.client, "put_records") as mock_put_records:
+        mock_put_records.side_effect = [
+            _put_records_response("InternalFailure", None),
+            _put_records_response("InternalFailure"),
+            _put_records_response("InternalFailure"),
+        ]
+        response = kinesis_writer.send_to_stream(
+            data, partition_key="key", record_per_entry=True
+        )
+
+    assert mock_put_records.call_count == 3
+    assert mock_sleep.call_count == 2
+    assert response["FailedRecordCount"] == 1
+    assert response["FailedRecords"] == [
+        {
+            "Index": 0,
+            "Data": b"a",
+            "PartitionKey": "key",
+            "ErrorCode": "InternalFailure",
+            "ErrorMessage": "error",
+        }
+    ]
+    assert response["Records"][1]["SequenceNumber"] == "1"
+
+
+@patch("newslaunch.kinesis_writer.time.sleep")
+def test_put_records_failed_record_index_across_chunks(mock_sleep, kinesis_writer):
+    kinesis_writer.max_retries = 0
+    data = [b"x"] * 501
+    with patch.object(kinesis_writer.client, "put_records") as mock_put_records:
+        mock_put_records.side_effect = [
+            _put_records_response(*([None] * 500)),
+            _put_records_response("InternalFailure"),
+        ]
+        response = kinesis_writer.send_to_stream(data, record_per_entry=True)
+
+    assert response["FailedRecordCount"] == 1
+    assert response["FailedRecords"][0]["Index"] == 500
+    mock_sleep.assert_not_called()
+
+
+@patch("newslaunch.kinesis_writer.time.sleep")
+def test_put_records_retry_timeout_stops_retries(mock_sleep, kinesis_writer):
+    kinesis_writer.retry_timeout = 0
+    with patch.object(kinesis_writer.client, "put_records") as mock_put_records:
+        mock_put_records.return_value = _put_records_response("InternalFailure")
+        response = kinesis_writer.send_to_stream([b"a"], record_per_entry=True)
+
+    assert mock_put_records.call_count == 1
+    assert response["FailedRecordCount"] == 1
+    mock_sleep.assert_not_called()
+
+
+def test_backoff_time_is_jittered_and_longer_when_throttled(kinesis_writer):
+    for _ in range(20):
+        assert 0.1 <= kinesis_writer._backoff_time(2, throttled=False) <= 0.2
+        assert 0.2 <= kinesis_writer._backoff_time(2, throttled=True) <= 0.4
+        assert kinesis_writer._backoff_time(20, throttled=True) <= 5.0
+
+
+@pytest.fixture
+def buffered_writer(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(
+        stream_name=mock_kinesis_stream, buffered=True, linger_time=10
+    )
+    yield kinesis_writer
+    kinesis_writer.close()
+
+
+def test_buffered_send_coalesces_records_until_flush(buffered_writer):
+    with patch.object(
+        buffered_writer.client,
+        "put_records",
+        wraps=buffered_writer.client.put_records,
+    ) as mock_put_records:
+        for i in range(3):
+            response = buffered_writer.send_to_stream({"key": i})
+            assert response == {"QueuedRecordCount": 1}
+        assert buffered_writer.send_to_stream(
+            [{"key": 3}, {"key": 4}], record_per_entry=True
+        ) == {"QueuedRecordCount": 2}
+
+        assert buffered_writer.flush() == []
+
+    assert mock_put_records.call_count == 1
+    records = mock_put_records.call_args.kwargs["Records"]
+    assert [json.loads(record["Data"]) for record in records] == [
+        {"key": i} for i in range(5)
+    ]
+
+
+def test_buffered_send_flushes_after_linger_time(mock_kinesis_stream):
+    with KinesisWriter(
+        stream_name=mock_kinesis_stream, buffered=True, linger_time=0.01
+    ) as kinesis_writer:
+        with patch.object(kinesis_writer, "_put_records") as mock_put_records:
+            mock_put_records.return_value = {"FailedRecords": []}
+            kinesis_writer.send_to_stream([b"a", b"b"], record_per_entry=True)
+            for _ in range(100):
+                if mock_put_records.called:
+                    break
+                time.sleep(0.01)
+            assert mock_put_records.call_count == 1
+
+
+def test_buffered_send_splits_batches_at_count_limit(buffered_writer):
+    with patch.object(buffered_writer, "_put_records") as mock_put_records:
+        mock_put_records.return_value = {"FailedRecords": []}
+        buffered_writer.send_to_stream([b"x"] * 600, record_per_entry=True)
+        buffered_writer.flush()
+
+    assert [len(c.args[0]) for c in mock_put_records.call_args_list] == [500, 100]
+
+
+def test_buffered_flush_reports_failures_and_errors(buffered_writer):
+    failed = [{"Index": 0, "ErrorCode": "InternalFailure"}]
+    with patch.object(buffered_writer, "_put_records") as mock_put_records:
+        mock_put_records.return_value = {"FailedRecords": failed}
+        buffered_writer.send_to_stream(b"a")
+        assert buffered_writer.flush() == failed
+        assert buffered_writer.flush() == []
+
+        mock_put_records.side_effect = RuntimeError("boom")
+        buffered_writer.send_to_stream(b"b")
+        with pytest.raises(KinesisWriterError, match="boom"):
+            buffered_writer.flush()
+
+
+def test_buffered_records_reach_the_stream(buffered_writer, mock_kinesis_stream):
+    buffered_writer.send_to_stream(
+        [{"test1": "example1"}, {"test2": "example2"}], record_per_entry=True
+    )
+    buffered_writer.close()
+
+    client = boto3.client("kinesis", region_name="eu-west-2")
+    shards = client.describe_stream(StreamName=mock_kinesis_stream)[
+        "StreamDescription"
+    ]["Shards"]
+    stream_data = []
+    for shard in shards:
+        shard_iterator = client.get_shard_iterator(
+            StreamName=mock_kinesis_stream,
+            ShardId=shard["ShardId"],
+            ShardIteratorType="TRIM_HORIZON",
+        )["ShardIterator"]
+        records = client.get_records(ShardIterator=shard_iterator)["Records"]
+        stream_data.extend(json.loads(record["Data"]) for record in records)
+
+    assert sorted(stream_data, key=str) == [
+        {"test1": "example1"},
+        {"test2": "example2"},
+    ]
+
+
+def test_buffered_send_after_close_raises(buffered_writer):
+    buffered_writer.close()
+    with pytest.raises(KinesisWriterError, match="closed"):
+        buffered_writer.send_to_stream(b"a")
+
+
+def test_send_aggregated_records(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(stream_name=mock_kinesis_stream, aggregate=True)
+    data = [{"article": i, "body": "text " * 50} for i in range(100)]
+    response = kinesis_writer.send_to_stream(
+        data, partition_key="articles", record_per_entry=True
+    )
+    assert response["FailedRecordCount"] == 0
+    assert len(response["Records"]) == 1
+
+    client = boto3.client("kinesis", region_name="eu-west-2")
+    shard_id = response["Records"][0]["ShardId"]
+    shard_iterator = client.get_shard_iterator(
+        StreamName=mock_kinesis_stream,
+        ShardId=shard_id,
+        ShardIteratorType="TRIM_HORIZON",
+    )["ShardIterator"]
+    (record,) = client.get_records(ShardIterator=shard_iterator)["Records"]
+    assert [json.loads(r["Data"]) for r in deaggregate(record["Data"])] == data
+
+
+def test_aggregated_records_stay_on_their_shards(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(
+        stream_name=mock_kinesis_stream, aggregate=True, partitioner="article_id"
+    )
+    shard_map = kinesis_writer.get_shard_map()
+    # Two article ids whose partition keys hash to different shards.
+    ids = iter(f"article/{i}" for i in range(100))
+    first = next(ids)
+    second = next(
+        i for i in ids if shard_map.shard_for(i) != shard_map.shard_for(first)
+    )
+    data = [
+        {"id": article_id, "n": n} for n in range(5) for article_id in (first, second)
+    ]
+    response = kinesis_writer.send_to_stream(data, record_per_entry=True)
+    assert response["FailedRecordCount"] == 0
+    assert len(response["Records"]) == 2
+
+    client = boto3.client("kinesis", region_name="eu-west-2")
+    for article_id in (first, second):
+        shard_iterator = client.get_shard_iterator(
+            StreamName=mock_kinesis_stream,
+            ShardId=shard_map.shard_for(article_id),
+            ShardIteratorType="TRIM_HORIZON",
+        )["ShardIterator"]
+        (record,) = client.get_records(ShardIterator=shard_iterator)["Records"]
+        articles = [json.loads(r["Data"]) for r in deaggregate(record["Data"])]
+        assert articles == [item for item in data if item["id"] == article_id]
+    assert sorted(kinesis_writer.shard_distribution().values()) == [0, 1, 1]
+
+
+def test_aggregated_records_follow_a_shard_split(mock_kinesis_stream):
+    client = boto3.client("kinesis", region_name="eu-west-2")
+    client.create_stream(StreamName="split-stream", ShardCount=1)
+    kinesis_writer = KinesisWriter(
+        stream_name="split-stream", aggregate=True, partitioner="article_id"
+    )
+    (parent,) = kinesis_writer.get_shard_map().shard_ids
+    client.split_shard(
+        StreamName="split-stream",
+        ShardToSplit=parent,
+        NewStartingHashKey=str(2**127),
+    )
+    children = ShardMap.from_stream(client, "split-stream")
+    ranges = {shard_id: (start, end) for start, end, shard_id in children.ranges}
+
+    # moto keeps routing records to the closed parent shard: route them to the
+    # children as Kinesis does, and keep the user records the KCL would read, those
+    # within the hash key range of the shard their record landed on.
+    put_records = kinesis_writer.client.put_records
+    read = []
+
+    def put_records_after_split(**params):
+        response = put_records(**params)
+        for entry, result in zip(params["Records"], response["Records"]):  # noqa: B905
+            result["ShardId"] = children.shard_for(
+                entry["PartitionKey"], entry.get("ExplicitHashKey")
+            )
+            start, end = ranges[result["ShardId"]]
+            read.extend(
+                json.loads(user_record["Data"])
+                for user_record in deaggregate(entry["Data"])
+                if start <= hash_key(user_record["PartitionKey"]) <= end
+            )
+        return response
+
+    data = [{"id": f"article/{i}"} for i in range(20)]
+    with patch.object(
+        kinesis_writer.client, "put_records", side_effect=put_records_after_split
+    ):
+        response = kinesis_writer.send_to_stream(data, record_per_entry=True)
+    assert response["FailedRecordCount"] == 0
+    assert kinesis_writer.get_shard_map().shard_ids == children.shard_ids
+    assert sorted(read, key=lambda item: int(item["id"].split("/")[1])) == data
+
+
+def test_failed_indices_of_aggregated_records(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(
+        stream_name=mock_kinesis_stream, aggregate=True, max_retries=0
+    )
+    data = [{"article": i} for i in range(4)]
+    failure = {"ErrorCode": "InternalFailure", "ErrorMessage": "Internal failure"}
+    with patch.object(
+        kinesis_writer.client,
+        "put_records",
+        return_value={"FailedRecordCount": 1, "Records": [failure]},
+    ):
+        response = kinesis_writer.send_to_stream(
+            data, partition_key="articles", record_per_entry=True
+        )
+    assert response["FailedRecords"][0]["UserRecordIndices"] == [0, 1, 2, 3]
+    assert KinesisWriter.failed_indices(response) == [0, 1, 2, 3]
+
+
+def test_send_compressed_records(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(stream_name=mock_kinesis_stream, compression="gzip")
+    article = {"webTitle": "Title", "body": "<p>Text</p>" * 10_000}
+    small = {"key": "value"}
+    response = kinesis_writer.send_to_stream(
+        [article, small], partition_key="key", record_per_entry=True
+    )
+    assert response["FailedRecordCount"] == 0
+
+    client = boto3.client("kinesis", region_name="eu-west-2")
+    shard_iterator = client.get_shard_iterator(
+        StreamName=mock_kinesis_stream,
+        ShardId=response["Records"][0]["ShardId"],
+        ShardIteratorType="TRIM_HORIZON",
+    )["ShardIterator"]
+    compressed, plain = [
+        r["Data"] for r in client.get_records(ShardIterator=shard_iterator)["Records"]
+    ]
+    assert is_enveloped(compressed)
+    assert len(compressed) < 1000
+    assert json.loads(open_envelope(compressed)) == article
+    # Records that do not shrink are sent uncompressed.
+    assert json.loads(plain) == small
+
+
+def test_compression_allows_records_over_size_limit(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(stream_name=mock_kinesis_stream, compression="gzip")
+    response = kinesis_writer.send_to_stream({"body": "text " * (1024 * 300)})
+    assert "SequenceNumber" in response
+
+
+def test_compression_codec_unavailable():
+    with pytest.raises(KinesisWriterError, match="'lz4' is not available"):
+        KinesisWriter(stream_name="stream", compression="lz4")
+
+
+@patch("newslaunch.kinesis_writer.time.sleep")
+def test_rate_limit_paces_writes_per_shard(mock_sleep, mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(
+        stream_name=mock_kinesis_stream, rate_limit=True, shard_records_per_second=10
+    )
+    response = kinesis_writer.send_to_stream(
+        [{"key": i} for i in range(10)], partition_key="key", record_per_entry=True
+    )
+    assert response["FailedRecordCount"] == 0
+    mock_sleep.assert_not_called()
+
+    kinesis_writer.send_to_stream({"key": 10}, partition_key="key")
+    (delay,) = mock_sleep.call_args.args
+    assert delay == pytest.approx(0.1, abs=0.01)
+
+
+def test_rate_limit_disabled_by_default(kinesis_writer):
+    assert kinesis_writer.throttle is None
+
+
+def test_article_id_partitioner_routes_article_to_same_shard(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(
+        stream_name=mock_kinesis_stream, partitioner="article_id"
+    )
+    articles = [{"id": f"world/article-{i}"} for i in range(10)]
+    first = kinesis_writer.send_to_stream(articles, record_per_entry=True)
+    second = kinesis_writer.send_to_stream(articles, record_per_entry=True)
+    assert [r["ShardId"] for r in first["Records"]] == [
+        r["ShardId"] for r in second["Records"]
+    ]
+
+
+def test_round_robin_partitioner_balances_shards(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(
+        stream_name=mock_kinesis_stream, partitioner="round_robin"
+    )
+    kinesis_writer.send_to_stream([{"key": i} for i in range(9)], record_per_entry=True)
+    kinesis_writer.send_to_stream({"key": 9})
+    distribution = kinesis_writer.shard_distribution()
+    assert sorted(distribution.values()) == [3, 3, 4]
+
+
+def test_shard_distribution_includes_idle_shards(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(stream_name=mock_kinesis_stream)
+    kinesis_writer.send_to_stream({"key": "value"}, partition_key="key")
+    distribution = kinesis_writer.shard_distribution()
+    assert len(distribution) == 3
+    assert sorted(distribution.values()) == [0, 0, 1]
+
+
+def test_unknown_partitioner():
+    with pytest.raises(KinesisWriterError, match="Unknown partitioning strategy"):
+        KinesisWriter(stream_name="stream", partitioner="section")
+
+
+class _TaggedJsonSerializer(Serializer):
+    """A non-JSON wire format stand-in, to check records get tagged."""
+
+    name = "tagged"
+    format = "msgpack"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+def test_non_json_serializer_tags_records(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(
+        stream_name=mock_kinesis_stream, serializer=_TaggedJsonSerializer()
+    )
+    assert unwrap(kinesis_writer._encode({"key": "value"})) == (
+        b'{"key": "value"}',
+        "msgpack",
+    )
+    # Bytes and strings are sent as they are.
+    assert kinesis_writer._encode("text") == b"text"
+
+
+def test_json_serializer_records_are_plain_json(mock_kinesis_stream):
+    kinesis_writer = KinesisWriter(stream_name=mock_kinesis_stream, serializer="json")
+    assert kinesis_writer._encode({"key": "value"}) == b'{"key": "value"}'
+
+
+def test_unknown_serializer():
+    with pytest.raises(KinesisWriterError, match="Unknown serializer 'pickle'"):
+        KinesisWriter(stream_name="stream", serializer="pickle")
@@ -0,0 +1,112 @@
+import hashlib
+
+import pytest
+
+from newslaunch.kpl import (
+    KPL_MAGIC,
+    RecordAggregator,
+    aggregate_records,
+    deaggregate,
+    is_aggregated,
+    pack_records,
+)
+
+
+def _entries(count, size=100):
+    return [
+        {"Data": f"{i:04d}".encode() * (size // 4), "PartitionKey": f"key-{i % 3}"}
+        for i in range(count)
+    ]
+
+
+def test_aggregate_and_deaggregate_round_trip():
+    entries = _entries(50)
+    # All the entries map to the same shard.
+    aggregated = aggregate_records(entries, group_key=lambda entry: "shard-0")
+    assert len(aggregated) == 1
+    assert aggregated[0]["PartitionKey"] == "key-0"
+    assert is_aggregated(aggregated[0]["Data"])
+
+    records = deaggregate(aggregated[0]["Data"])
+    assert [r["Data"] for r in records] == [e["Data"] for e in entries]
+    assert [r["PartitionKey"] for r in records] == [e["PartitionKey"] for e in entries]
+    assert all(r["ExplicitHashKey"] is None for r in records)
+
+
+def test_aggregated_record_format():
+    data = aggregate_records([{"Data": b"abc", "PartitionKey": "pk"}])[0]["Data"]
+    body = data[4:-16]
+    assert data[:4] == KPL_MAGIC
+    assert data[-16:] == hashlib.md5(body).digest()  # noqa: S324
+    # partition_key_table: "pk", records: {partition_key_index: 0, data: "abc"}
+    assert body == b"\x0a\x02pk" + b"\x1a\x07" + b"\x08\x00" + b"\x1a\x03abc"
+
+
+def test_aggregate_respects_max_size():
+    entries = _entries(200, size=1000)
+    aggregated = aggregate_records(
+        entries, max_size=10_000, group_key=lambda entry: "shard-0"
+    )
+    assert len(aggregated) > 1
+    assert all(len(a["Data"]) <= 10_000 for a in aggregated)
+    records = [r["Data"] for a in aggregated for r in deaggregate(a["Data"])]
+    assert records == [e["Data"] for e in entries]
+
+
+def test_aggregate_passes_oversized_entries_through():
+    large = {"Data": b"x" * 2000, "PartitionKey": "large"}
+    aggregated = aggregate_records([large], max_size=1000)
+    assert aggregated == [large]
+
+
+def test_aggregate_explicit_hash_keys():
+    entries = [
+        {"Data": b"a", "PartitionKey": "pk", "ExplicitHashKey": "1"},
+        {"Data": b"b", "PartitionKey": "pk", "ExplicitHashKey": "2"},
+    ]
+    aggregated = aggregate_records(entries)
+    assert aggregated[0]["ExplicitHashKey"] == "1"
+    assert [r["ExplicitHashKey"] for r in deaggregate(aggregated[0]["Data"])] == [
+        "1",
+        "2",
+    ]
+
+
+def test_record_aggregator_incremental():
+    aggregator = RecordAggregator(max_size=300)
+    completed = [aggregator.add(entry) for entry in _entries(5)]
+    assert completed[:2] == [None, None]
+    assert any(completed)
+    assert len(aggregator) > 0
+    assert aggregator.flush() is not None
+    assert aggregator.flush() is None
+
+
+@pytest.mark.parametrize(
+    "data", [b'{"key": "value"}', KPL_MAGIC + b"not protobuf" + b"0" * 16, b""]
+)
+def test_deaggregate_non_aggregated_record(data):
+    assert deaggregate(data, partition_key="pk") == [
+        {"Data": data, "PartitionKey": "pk", "ExplicitHashKey": None}
+    ]
+
+
+def test_aggregate_groups_entries_by_partition_key():
+    entries = _entries(6)
+    aggregated = aggregate_records(entries)
+    assert [a["PartitionKey"] for a in aggregated] == ["key-0", "key-1", "key-2"]
+    for record in aggregated:
+        assert {r["PartitionKey"] for r in deaggregate(record["Data"])} == {
+            record["PartitionKey"]
+        }
+
+
+def test_pack_records_tracks_member_indices():
+    entries = _entries(6)
+    packed = pack_records(entries, group_key=lambda entry: entry["PartitionKey"])
+    assert [indices for _, indices in packed] == [[0, 3], [1, 4], [2, 5]]
+
+    large = {"Data": b"x" * 2000, "PartitionKey": "large"}
+    packed = pack_records([entries[0], large], max_size=1000)
+    assert packed[0] == (large, [1])
+    assert packed[1][1] == [0]
@@ -0,0 +1,74 @@
+import pytest
+
+from newslaunch.partitioning import (
+    ArticleIdPartitioner,
+    CallablePartitioner,
+    RandomPartitioner,
+    RoundRobinPartitioner,
+    get_partitioner,
+)
+from newslaunch.shards import ShardMap
+
+
+def _shard_map(count):
+    step = 2**128 // count
+    return ShardMap(
+        [
+            {
+                "ShardId": f"shard-{i}",
+                "HashKeyRange": {
+                    "StartingHashKey": str(i * step),
+                    "EndingHashKey": str(
+                        2**128 - 1 if i == count - 1 else (i + 1) * step - 1
+                    ),
+                },
+                "SequenceNumberRange": {"StartingSequenceNumber": "1"},
+            }
+            for i in range(count)
+        ]
+    )
+
+
+def test_random_partitioner():
+    partitioner = RandomPartitioner()
+    assert partitioner({}, b"") != partitioner({}, b"")
+
+
+def test_article_id_partitioner():
+    partitioner = ArticleIdPartitioner()
+    article = {"id": "world/2024/jan/01/article", "webUrl": "https://example.com"}
+    assert partitioner(article, b"data") == ("world/2024/jan/01/article", None)
+    assert partitioner({"webUrl": "https://example.com"}, b"data") == (
+        "https://example.com",
+        None,
+    )
+
+    key, _ = partitioner("plain text", b"plain text")
+    assert key == partitioner("plain text", b"plain text")[0]
+    assert key != partitioner("other", b"other")[0]
+
+    long_key, _ = partitioner({"id": "x" * 300}, b"data")
+    assert len(long_key) == 64
+
+
+def test_round_robin_partitioner_spreads_records_across_shards():
+    shard_map = _shard_map(4)
+    partitioner = RoundRobinPartitioner(lambda: shard_map)
+    shards = [shard_map.shard_for(*partitioner({}, b"data")) for _ in range(12)]
+    assert shards == [f"shard-{i % 4}" for i in range(12)]
+
+
+def test_callable_partitioner():
+    partitioner = get_partitioner(lambda item: item["section"], None)
+    assert isinstance(partitioner, CallablePartitioner)
+    assert partitioner({"section": "world"}, b"data") == ("world", None)
+
+
+def test_get_partitioner():
+    assert isinstance(get_partitioner("random", None), RandomPartitioner)
+    assert isinstance(get_partitioner("article_id", None), ArticleIdPartitioner)
+    assert isinstance(get_partitioner("round_robin", None), RoundRobinPartitioner)
+    partitioner = ArticleIdPartitioner()
+    assert get_partitioner(partitioner, None) is partitioner
+    with pytest.raises(ValueError, match="Unknown partitioning strategy 'section'"):
+        get_partitioner("section", None)
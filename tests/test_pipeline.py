@@ -0,0 +1,151 @@
+# ruff: noqa: S105
+import os
+import threading
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from newslaunch.guardian_api import GuardianAPI, GuardianAPIError
+from newslaunch.kinesis_writer import KinesisWriter
+from newslaunch.pipeline import PublishPipeline
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ["AWS_ACCESS_KEY_ID"] = "test"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "test"
+    os.environ["AWS_SECURITY_TOKEN"] = "test"
+    os.environ["AWS_SESSION_TOKEN"] = "test"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def kinesis_writer(aws_credentials):
+    with mock_aws():
+        conn = boto3.client("kinesis", region_name="eu-west-2")
+        conn.create_stream(StreamName="test-stream", ShardCount=1)
+        yield KinesisWriter(stream_name="test-stream")
+
+
+@pytest.fixture
+def guardian_api():
+    return GuardianAPI(api_key="test_api_key")
+
+
+def make_articles(count):
+    return [{"webTitle": f"Article {i}", "id": f"article/{i}"} for i in range(count)]
+
+
+def test_run_publishes_all_articles_in_batches(guardian_api, kinesis_writer):
+    pipeline = PublishPipeline(guardian_api, kinesis_writer, batch_size=10)
+    with patch.object(
+        GuardianAPI, "iter_articles", return_value=iter(make_articles(25))
+    ) as mock_iter:
+        stats = pipeline.run("test search", page_size=50, max_results=25)
+
+    assert mock_iter.call_args.kwargs == {"page_size": 50, "max_results": 25}
+    assert stats["articles"] == 25
+    assert stats["failed"] == 0
+    assert stats["put_calls"] == 3
+    assert stats["bytes"] == kinesis_writer.bytes_sent > 0
+    assert set(stats) >= {"articles_per_second", "bytes_per_second", "api_calls"}
+
+
+def test_stats_count_only_the_current_run(guardian_api, kinesis_writer):
+    pipeline = PublishPipeline(guardian_api, kinesis_writer, batch_size=10)
+    runs = []
+    for count in (25, 5):
+        guardian_api.requests += 2
+        with patch.object(
+            GuardianAPI, "iter_articles", return_value=iter(make_articles(count))
+        ):
+            bytes_before = kinesis_writer.bytes_sent
+            runs.append(pipeline.run("test search"))
+        assert runs[-1]["bytes"] == kinesis_writer.bytes_sent - bytes_before
+
+    assert [run["articles"] for run in runs] == [25, 5]
+    assert [run["put_calls"] for run in runs] == [3, 1]
+    # Requests made by the client outside of the runs are not counted.
+    assert [run["api_calls"] for run in runs] == [0, 0]
+
+
+def test_run_reports_progress(guardian_api, kinesis_writer):
+    updates = []
+    pipeline = PublishPipeline(guardian_api, kinesis_writer, batch_size=5)
+    with patch.object(
+        GuardianAPI, "iter_articles", return_value=iter(make_articles(15))
+    ):
+        pipeline.run("test search", progress=updates.append, progress_interval=0)
+
+    assert [update["articles"] for update in updates] == [5, 10, 15]
+
+
+def test_run_raises_fetch_errors_after_publishing_fetched_batches(
+    guardian_api, kinesis_writer
+):
+    def failing_iter(*args, **kwargs):
+        yield from make_articles(4)
+        raise GuardianAPIError("Guardian API request failed")
+
+    pipeline = PublishPipeline(guardian_api, kinesis_writer, batch_size=2)
+    with patch.object(GuardianAPI, "iter_articles", side_effect=failing_iter):
+        with pytest.raises(GuardianAPIError, match="request failed"):
+            pipeline.run("test search")
+
+    assert pipeline.articles == 4
+
+
+def test_queue_bounds_batches_fetched_ahead(guardian_api, kinesis_writer):
+    fetched = []
+    release = threading.Event()
+
+    def tracking_iter(*args, **kwargs):
+        for article in make_articles(20):
+            fetched.append(article)
+            yield article
+
+    def slow_send(batch, **kwargs):
+        # The first publish waits until the fetcher has filled the queue.
+        release.wait(timeout=0.5)
+        return {"FailedRecordCount": 0}
+
+    pipeline = PublishPipeline(guardian_api, kinesis_writer, batch_size=2, queue_size=2)
+    with patch.object(
+        GuardianAPI, "iter_articles", side_effect=tracking_iter
+    ), patch.object(kinesis_writer, "send_to_stream", side_effect=slow_send):
+        thread = threading.Thread(target=pipeline.run, args=("test search",))
+        thread.start()
+        threading.Event().wait(0.2)
+        # One batch being published, two queued, one waiting to be queued.
+        assert len(fetched) <= 8
+        release.set()
+        thread.join()
+
+    assert pipeline.articles == 20
+
+
+def test_failed_articles_are_counted_with_aggregation(guardian_api, kinesis_writer):
+    kinesis_writer.aggregate = True
+    kinesis_writer.max_retries = 0
+    failure = {"ErrorCode": "InternalFailure", "ErrorMessage": "Internal failure"}
+    pipeline = PublishPipeline(guardian_api, kinesis_writer, batch_size=10)
+    with patch.object(
+        GuardianAPI, "iter_articles", return_value=iter(make_articles(10))
+    ), patch.object(
+        kinesis_writer.client,
+        "put_records",
+        return_value={"FailedRecordCount": 1, "Records": [failure]},
+    ):
+        stats = pipeline.run("test search", partition_key="articles")
+
+    # One aggregated record holding the 10 articles failed.
+    assert stats["articles"] == 0
+    assert stats["failed"] == 10
+
+
+def test_invalid_batch_size(guardian_api, kinesis_writer):
+    with pytest.raises(ValueError, match="positive integers"):
+        PublishPipeline(guardian_api, kinesis_writer, batch_size=0)
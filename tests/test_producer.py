@@ -0,0 +1,164 @@
+# ruff: noqa: S105
+import importlib.util
+import json
+import os
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+PRODUCER_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "newspad", "lambda", "producer.py"
+)
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture
+def producer(aws_credentials, monkeypatch):
+    monkeypatch.setenv("GUARDIAN_API_KEY", "test_api_key")
+    # The producer Lambda is a standalone module, not part of the package.
+    spec = importlib.util.spec_from_file_location("producer", PRODUCER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with mock_aws():
+        boto3.client("kinesis").create_stream(StreamName="test-stream", ShardCount=1)
+        yield module
+
+
+def test_clients_are_reused_across_invocations(producer):
+    assert producer.get_guardian_api() is producer.get_guardian_api()
+    writer = producer.get_kinesis_writer("test-stream")
+    assert producer.get_kinesis_writer("test-stream") is writer
+    assert producer.get_kinesis_writer("test-stream", "eu-west-1") is not writer
+
+
+def test_lambda_handler_publishes_with_cached_clients(producer):
+    articles = [{"webTitle": "Title 1"}, {"webTitle": "Title 2"}]
+    event = {"search_term": "test", "stream_name": "test-stream"}
+    with patch.object(
+        producer.GuardianAPI, "search_articles", return_value=articles
+    ), patch.object(producer, "KinesisWriter", wraps=producer.KinesisWriter) as writer:
+        for _ in range(2):
+            response = producer.lambda_handler(event, None)
+            assert response["statusCode"] == 200
+    writer.assert_called_once()
+    assert json.loads(response["body"]) == {"message": "Data published to test-stream."}
+
+
+def test_lambda_handler_fans_out_queries(producer):
+    results = {
+        "climate": [{"id": "a", "webTitle": "A"}, {"id": "b", "webTitle": "B"}],
+        "energy": [{"id": "b", "webTitle": "B"}, {"id": "c", "webTitle": "C"}],
+    }
+
+    def search_articles(search_term, **params):
+        return results[search_term]
+
+    event = {
+        "queries": ["climate", {"search_term": "energy", "filter_response": "false"}],
+        "stream_name": "test-stream",
+        "page_size": 50,
+    }
+    with patch.object(
+        producer.GuardianAPI, "search_articles", side_effect=search_articles
+    ) as mock_search, patch.object(
+        producer.KinesisWriter, "send_to_stream"
+    ) as mock_send:
+        response = producer.lambda_handler(event, None)
+
+    assert response["statusCode"] == 200
+    stats = json.loads(response["body"])["stats"]
+    assert [(s["search_term"], s["results"], s["unique"]) for s in stats] == [
+        ("climate", 2, 2),
+        ("energy", 2, 1),
+    ]
+    mock_send.assert_called_once()
+    assert [a["id"] for a in mock_send.call_args.args[0]] == ["a", "b", "c"]
+    energy_call = next(
+        c for c in mock_search.call_args_list if c.kwargs["search_term"] == "energy"
+    )
+    assert energy_call.kwargs == {
+        "search_term": "energy",
+        "page_size": 50,
+        "filter_response": False,
+    }
+
+
+def test_lambda_handler_fails_when_all_queries_fail(producer):
+    event = {"queries": ["climate", "energy"], "stream_name": "test-stream"}
+    with patch.object(
+        producer.GuardianAPI,
+        "search_articles",
+        side_effect=producer.GuardianAPIError("503 Server Error"),
+    ), patch.object(producer.KinesisWriter, "send_to_stream") as mock_send:
+        response = producer.lambda_handler(event, None)
+
+    assert response["statusCode"] == 500
+    body = json.loads(response["body"])
+    assert body["error"] == "All 2 queries failed."
+    assert [s["error"] for s in body["stats"]] == ["503 Server Error"] * 2
+    mock_send.assert_not_called()
+
+
+def test_lambda_handler_reports_partially_failed_queries(producer):
+    def search_articles(search_term, **params):
+        if search_term == "energy":
+            raise producer.GuardianAPIError("503 Server Error")
+        return [{"id": "a", "webTitle": "A"}]
+
+    event = {"queries": ["climate", "energy"], "stream_name": "test-stream"}
+    with patch.object(
+        producer.GuardianAPI, "search_articles", side_effect=search_articles
+    ), patch.object(producer.KinesisWriter, "send_to_stream") as mock_send:
+        response = producer.lambda_handler(event, None)
+
+    assert response["statusCode"] == 207
+    body = json.loads(response["body"])
+    assert body["message"] == "Data published to test-stream."
+    assert body["error"] == "1 of 2 queries failed."
+    mock_send.assert_called_once()
+
+
+def test_lambda_handler_only_marks_published_articles(producer, monkeypatch, tmp_path):
+    monkeypatch.setenv("DEDUP_DB_PATH", str(tmp_path / "dedup.sqlite"))
+    articles = [{"id": f"article/{i}", "webTitle": f"Title {i}"} for i in range(3)]
+    event = {"search_term": "test", "stream_name": "test-stream"}
+    failure = {"ErrorCode": "InternalFailure", "ErrorMessage": "Internal failure"}
+    writer = producer.get_kinesis_writer("test-stream")
+    writer.max_retries = 0
+    put_records = writer.client.put_records
+
+    def partially_failing_put_records(**params):
+        records = params["Records"]
+        response = put_records(**{**params, "Records": records[:1] + records[2:]})
+        results = response["Records"]
+        return {"FailedRecordCount": 1, "Records": [results[0], failure, results[1]]}
+
+    with patch.object(
+        producer.GuardianAPI, "search_articles", return_value=articles
+    ), patch.object(
+        writer.client, "put_records", side_effect=partially_failing_put_records
+    ):
+        response = producer.lambda_handler(event, None)
+
+    assert response["statusCode"] == 500
+    assert json.loads(response["body"]) == {
+        "error": "Failed to publish 1 of 3 articles to test-stream."
+    }
+    deduplicator = producer.get_deduplicator()
+    assert deduplicator.filter_new(articles) == [articles[1]]
+
+    with patch.object(producer.GuardianAPI, "search_articles", return_value=articles):
+        response = producer.lambda_handler(event, None)
+    assert response["statusCode"] == 200
+    assert deduplicator.filter_new(articles) == []
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import pytest
+
+from newslaunch.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ResponseCache(tmp_path / "cache.sqlite", ttl=60) as response_cache:
+        yield response_cache
+
+
+def test_cache_miss_then_hit(cache):
+    params = {"q": "test", "page-size": 10}
+    assert cache.get(params) is None
+
+    cache.set(params, {"results": [{"id": "a"}]})
+    assert cache.get(params) == {"results": [{"id": "a"}]}
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "entries": 1,
+        "size": len('{"results": [{"id": "a"}]}'),
+    }
+
+
+def test_cache_key_ignores_api_key_none_values_and_order():
+    key = ResponseCache.make_key({"q": "test", "api-key": "one", "page": None})
+    assert key == ResponseCache.make_key({"api-key": "two", "q": "test"})
+    assert key != ResponseCache.make_key({"q": "other"})
+
+
+def test_cache_entry_expires(cache):
+    params = {"q": "test"}
+    with patch("newslaunch.response_cache.time.time", return_value=1000.0):
+        cache.set(params, {"results": []})
+
+    with patch("newslaunch.response_cache.time.time", return_value=1030.0):
+        assert cache.get(params) == {"results": []}
+
+    with patch("newslaunch.response_cache.time.time", return_value=1061.0):
+        assert cache.get(params) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    entry = {"results": ["x" * 100]}
+    with ResponseCache(tmp_path / "cache.sqlite", max_bytes=250) as cache:
+        with patch("newslaunch.response_cache.time.time", return_value=1.0):
+            cache.set({"q": "first"}, entry)
+        with patch("newslaunch.response_cache.time.time", return_value=2.0):
+            cache.set({"q": "second"}, entry)
+        with patch("newslaunch.response_cache.time.time", return_value=3.0):
+            assert cache.get({"q": "first"}) == entry
+        with patch("newslaunch.response_cache.time.time", return_value=4.0):
+            cache.set({"q": "third"}, entry)
+            assert cache.get({"q": "second"}) is None
+            assert cache.get({"q": "first"}) == entry
+            assert cache.get({"q": "third"}) == entry
+
+
+def test_cache_persists_between_instances(tmp_path):
+    with ResponseCache(tmp_path / "cache.sqlite") as cache:
+        cache.set({"q": "test"}, {"results": [1]})
+
+    with ResponseCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get({"q": "test"}) == {"results": [1]}
+
+
+def test_cache_clear(cache):
+    cache.set({"q": "test"}, {"results": []})
+    cache.get({"q": "test"})
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0, "size": 0}
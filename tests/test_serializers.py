@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from newslaunch import serializers
+from newslaunch.envelope import wrap
+from newslaunch.serializers import (
+    JsonSerializer,
+    OrjsonSerializer,
+    deserialize,
+    get_serializer,
+)
+
+ARTICLE = {"webTitle": "Café", "tags": ["world", "europe"], "wordcount": 850}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+def test_serializer_round_trip(name):
+    pytest.importorskip(name)
+    serializer = get_serializer(name)
+    assert serializer.name == name
+    assert serializer.loads(serializer.dumps(ARTICLE)) == ARTICLE
+
+
+def test_json_serializers_write_json():
+    assert json.loads(JsonSerializer().dumps(ARTICLE)) == ARTICLE
+    pytest.importorskip("orjson")
+    assert json.loads(OrjsonSerializer().dumps(ARTICLE)) == ARTICLE
+
+
+def test_auto_serializer(monkeypatch):
+    pytest.importorskip("orjson")
+    assert isinstance(get_serializer(), OrjsonSerializer)
+    monkeypatch.setattr(serializers, "orjson", None)
+    assert isinstance(get_serializer(), JsonSerializer)
+    with pytest.raises(ValueError, match="requires the orjson package"):
+        get_serializer("orjson")
+
+
+def test_unknown_serializer():
+    with pytest.raises(ValueError, match="Unknown serializer 'pickle'"):
+        get_serializer("pickle")
+
+
+def test_msgpack_unavailable(monkeypatch):
+    monkeypatch.setattr(serializers, "msgpack", None)
+    with pytest.raises(ValueError, match="requires the msgpack package"):
+        get_serializer("msgpack")
+
+
+def test_deserialize_plain_and_enveloped_json():
+    data = json.dumps(ARTICLE).encode("utf-8")
+    assert deserialize(data) == ARTICLE
+    assert deserialize(wrap(data, "gzip")) == ARTICLE
+
+
+def test_deserialize_msgpack():
+    msgpack = pytest.importorskip("msgpack")
+    assert deserialize(wrap(msgpack.packb(ARTICLE), fmt="msgpack")) == ARTICLE
@@ -0,0 +1,110 @@
+# ruff: noqa: S105
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from newslaunch.shards import ShardMap, ShardThrottle, TokenBucket, hash_key
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def kinesis_client(aws_credentials):
+    with mock_aws():
+        client = boto3.client("kinesis", region_name="eu-west-2")
+        client.create_stream(StreamName="test-stream", ShardCount=3)
+        yield client
+
+
+def _shard(shard_id, start, end, closed=False):
+    sequence_range = {"StartingSequenceNumber": "1"}
+    if closed:
+        sequence_range["EndingSequenceNumber"] = "2"
+    return {
+        "ShardId": shard_id,
+        "HashKeyRange": {"StartingHashKey": str(start), "EndingHashKey": str(end)},
+        "SequenceNumberRange": sequence_range,
+    }
+
+
+def test_shard_map_matches_kinesis_routing(kinesis_client):
+    shard_map = ShardMap.from_stream(kinesis_client, "test-stream")
+    assert len(shard_map) == 3
+    for i in range(30):
+        response = kinesis_client.put_record(
+            StreamName="test-stream", Data=b"data", PartitionKey=f"key-{i}"
+        )
+        assert shard_map.shard_for(f"key-{i}") == response["ShardId"]
+
+
+def test_shard_map_ignores_closed_shards_and_uses_explicit_hash_key():
+    shard_map = ShardMap(
+        [
+            _shard("shard-0", 0, 2**128 - 1, closed=True),
+            _shard("shard-2", 2**127, 2**128 - 1),
+            _shard("shard-1", 0, 2**127 - 1),
+        ]
+    )
+    assert shard_map.shard_ids == ["shard-1", "shard-2"]
+    assert "shard-0" not in shard_map
+    assert shard_map.shard_for("ignored", explicit_hash_key=str(2**127)) == "shard-2"
+    assert shard_map.shard_for("ignored", explicit_hash_key="5") == "shard-1"
+    expected = "shard-1" if hash_key("key") < 2**127 else "shard-2"
+    assert shard_map.shard_for("key") == expected
+
+
+def test_token_bucket_reserve():
+    bucket = TokenBucket(rate=10)
+    now = bucket.updated
+    assert bucket.reserve(10, now) == 0
+    assert bucket.reserve(5, now) == pytest.approx(0.5)
+    # Refills at the rate, up to the capacity.
+    assert bucket.reserve(5, now + 1) == 0
+    assert bucket.reserve(1, now + 100) == 0
+    assert bucket.tokens == 9
+
+
+def test_throttle_paces_each_shard(kinesis_client):
+    throttle = ShardThrottle(kinesis_client, "test-stream", records_per_second=10)
+    records = [{"Data": b"data", "PartitionKey": "key"} for _ in range(20)]
+    assert throttle.acquire(records[:10]) == pytest.approx(0, abs=0.01)
+    assert throttle.acquire(records) == pytest.approx(2, abs=0.01)
+
+    # Other shards have their own budget.
+    shard_map = throttle.shard_map
+    other_key = next(
+        f"key-{i}"
+        for i in range(100)
+        if shard_map.shard_for(f"key-{i}") != shard_map.shard_for("key")
+    )
+    other_record = {"Data": b"data", "PartitionKey": other_key}
+    assert throttle.acquire([other_record]) == 0
+
+
+def test_throttle_limits_bytes(kinesis_client):
+    throttle = ShardThrottle(kinesis_client, "test-stream", bytes_per_second=1000)
+    record = {"Data": b"x" * 1997, "PartitionKey": "key"}
+    assert throttle.acquire([record]) == pytest.approx(1, abs=0.01)
+
+
+def test_throttle_refreshes_shard_map_after_resharding(kinesis_client):
+    throttle = ShardThrottle(kinesis_client, "test-stream")
+    throttle.acquire([{"Data": b"data", "PartitionKey": "key"}])
+    shard_map = throttle.shard_map
+
+    throttle.observe([{"ShardId": shard_map.shard_ids[0]}])
+    assert throttle.shard_map is shard_map
+
+    # A record routed to a shard missing from the map means the stream was resharded.
+    throttle.observe([{"ShardId": "shardId-000000000009"}, {"ErrorCode": "Error"}])
+    assert throttle.shard_map is not shard_map
@@ -0,0 +1,134 @@
+import gzip
+import json
+
+import pytest
+
+from newslaunch import sink as sink_module
+from newslaunch.sink import FileSink, MemoryFileSystem
+
+
+class FakeClock:
+    def __init__(self, now=1_704_110_400.0):  # 2024-01-01T12:00:00Z
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _articles(count, start=0):
+    return [
+        {"id": f"article-{i}", "webTitle": f"Title {i}"}
+        for i in range(start, start + count)
+    ]
+
+
+def _read_jsonl(filesystem, path):
+    lines = gzip.decompress(filesystem.files[path]).decode("utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_rotates_by_record_count_with_deterministic_names():
+    filesystem = MemoryFileSystem()
+    sink = FileSink(
+        "out",
+        max_records=2,
+        filesystem=filesystem,
+        clock=FakeClock(),
+        instance_id="test",
+    )
+    written = sink.write(_articles(5))
+    assert written == [
+        "out/articles-20240101T120000Z-test-000000.jsonl.gz",
+        "out/articles-20240101T120000Z-test-000001.jsonl.gz",
+    ]
+    assert sink.close() == "out/articles-20240101T120000Z-test-000002.jsonl.gz"
+    assert sink.close() is None
+
+    read = [a for path in sink.files_written for a in _read_jsonl(filesystem, path)]
+    assert read == _articles(5)
+
+
+def test_rotates_by_size():
+    filesystem = MemoryFileSystem()
+    line_size = len(json.dumps(_articles(1)[0]).encode()) + 1
+    sink = FileSink("out", max_bytes=3 * line_size, filesystem=filesystem)
+    assert len(sink.write(_articles(7))) == 2
+    assert [len(_read_jsonl(filesystem, p)) for p in sink.files_written] == [3, 3]
+
+
+def test_rotates_by_age():
+    clock = FakeClock()
+    filesystem = MemoryFileSystem()
+    sink = FileSink(
+        "out", max_age=60, filesystem=filesystem, clock=clock, instance_id="test"
+    )
+    assert sink.write(_articles(2)) == []
+    clock.now += 30
+    assert sink.rotate_if_due() == []
+
+    clock.now += 30
+    # Articles written after the deadline go to the next file.
+    assert sink.write(_articles(1, start=2)) == [
+        "out/articles-20240101T120000Z-test-000000.jsonl.gz"
+    ]
+    assert sink.close() == "out/articles-20240101T120100Z-test-000001.jsonl.gz"
+    assert len(_read_jsonl(filesystem, sink.files_written[1])) == 1
+
+
+def test_local_filesystem(tmp_path):
+    with FileSink(str(tmp_path / "out"), clock=FakeClock(), instance_id="test") as sink:
+        sink.write(_articles(3))
+    (path,) = (tmp_path / "out").iterdir()
+    assert path.name == "articles-20240101T120000Z-test-000000.jsonl.gz"
+    with gzip.open(path) as file:
+        assert [json.loads(line) for line in file] == _articles(3)
+
+
+def test_concurrent_sinks_do_not_overwrite_each_other():
+    filesystem = MemoryFileSystem()
+    sinks = [
+        FileSink("out", filesystem=filesystem, clock=FakeClock()) for _ in range(2)
+    ]
+    for start, sink in enumerate(sinks):
+        sink.write(_articles(1, start=start))
+        sink.close()
+    assert len(filesystem.files) == 2
+    read = [_read_jsonl(filesystem, path) for path in sorted(filesystem.files)]
+    assert sorted(a["id"] for articles in read for a in articles) == [
+        "article-0",
+        "article-1",
+    ]
+
+
+def test_same_instance_id_and_clock_overwrite_the_same_file():
+    filesystem = MemoryFileSystem()
+    for articles in (_articles(2), _articles(3)):
+        with FileSink(
+            "out", filesystem=filesystem, clock=FakeClock(), instance_id="batch-1"
+        ) as sink:
+            sink.write(articles)
+    assert list(filesystem.files) == [
+        "out/articles-20240101T120000Z-batch-1-000000.jsonl.gz"
+    ]
+    assert _read_jsonl(filesystem, sink.files_written[0]) == _articles(3)
+
+
+def test_parquet():
+    pq = pytest.importorskip("pyarrow.parquet")
+    filesystem = MemoryFileSystem()
+    sink = FileSink("out", file_format="parquet", filesystem=filesystem)
+    sink.write(_articles(3))
+    path = sink.close()
+    assert path.endswith(".parquet")
+    assert pq.read_table(filesystem.open(path)).to_pylist() == _articles(3)
+
+
+def test_parquet_requires_pyarrow(monkeypatch):
+    monkeypatch.setattr(sink_module, "pyarrow", None)
+    with pytest.raises(ValueError, match="requires the pyarrow package"):
+        FileSink("out", file_format="parquet", filesystem=MemoryFileSystem())
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError, match="Unknown file format 'csv'"):
+        FileSink("out", file_format="csv", filesystem=MemoryFileSystem())
@@ -0,0 +1,40 @@
+import json
+
+from newslaunch.sync_state import SyncState
+
+
+def test_sync_state_starts_empty(tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    assert state.get_watermark("query") is None
+
+
+def test_sync_state_save_and_reload(tmp_path):
+    path = tmp_path / "nested" / "state.json"
+    state = SyncState(path)
+    state.set_watermark("query", "2023-01-01T10:00:00Z")
+    state.save()
+
+    assert json.loads(path.read_text()) == {"query": "2023-01-01T10:00:00Z"}
+    assert SyncState(path).get_watermark("query") == "2023-01-01T10:00:00Z"
+    assert [p.name for p in path.parent.iterdir()] == ["state.json"]
+
+
+def test_sync_state_watermark_only_advances(tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    state.set_watermark("query", "2023-01-02T00:00:00Z")
+    state.set_watermark("query", "2023-01-01T00:00:00Z")
+    assert state.get_watermark("query") == "2023-01-02T00:00:00Z"
+
+
+def test_sync_state_not_written_until_saved(tmp_path):
+    path = tmp_path / "state.json"
+    state = SyncState(path)
+    state.set_watermark("query", "2023-01-01T00:00:00Z")
+    assert not path.exists()
+
+
+def test_sync_state_make_key():
+    assert SyncState.make_key("query") == "query"
+    assert SyncState.make_key("query", section="world", tag=None) == (
+        "query|section=world"
+    )